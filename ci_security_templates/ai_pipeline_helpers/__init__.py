@@ -1,6 +1,18 @@
 """AI-based helpers to generate CI pipeline drafts."""
 
 from .base import AIProvider
+from .caching import CacheStats, CachingProvider, MemoryCache, SQLiteCache
+from .cassette import CassetteMissError, CassetteProvider
 from .pipeline_generator import generate_github_pipeline, generate_gitlab_pipeline
 
-__all__ = ["AIProvider", "generate_github_pipeline", "generate_gitlab_pipeline"]
+__all__ = [
+    "AIProvider",
+    "CacheStats",
+    "CachingProvider",
+    "CassetteMissError",
+    "CassetteProvider",
+    "MemoryCache",
+    "SQLiteCache",
+    "generate_github_pipeline",
+    "generate_gitlab_pipeline",
+]
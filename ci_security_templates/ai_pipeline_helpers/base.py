@@ -1,11 +1,33 @@
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, List
+from typing import Awaitable, Callable, Dict, Iterable, List, Sequence, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_CONCURRENCY = 8
+
+
+async def gather_bounded(
+    calls: Iterable[Callable[[], Awaitable[T]]],
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> List[T]:
+    """Run coroutine factories with at most `concurrency` in flight; results keep the input order."""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(call: Callable[[], Awaitable[T]]) -> T:
+        async with semaphore:
+            return await call()
+
+    return await asyncio.gather(*(run(call) for call in calls))
 
 
 class AIProvider(ABC):
-    """Interface for pluggable AI providers. No secrets stored in code."""
+    """Interface for pluggable AI providers. No secrets stored in code.
+
+    Async methods run the sync ones in worker threads unless overridden.
+    """
 
     @abstractmethod
     def complete(self, prompt: str, *, temperature: float = 0.3, max_tokens: int = 512) -> str:
@@ -15,6 +37,42 @@ class AIProvider(ABC):
     def chat(self, messages: List[Dict[str, str]], *, temperature: float = 0.3, max_tokens: int = 512) -> str:
         raise NotImplementedError
 
+    async def acomplete(self, prompt: str, *, temperature: float = 0.3, max_tokens: int = 512) -> str:
+        return await asyncio.to_thread(self.complete, prompt, temperature=temperature, max_tokens=max_tokens)
+
+    async def achat(self, messages: List[Dict[str, str]], *, temperature: float = 0.3, max_tokens: int = 512) -> str:
+        return await asyncio.to_thread(self.chat, messages, temperature=temperature, max_tokens=max_tokens)
+
+    async def acomplete_batch(
+        self,
+        prompts: Sequence[str],
+        *,
+        temperature: float = 0.3,
+        max_tokens: int = 512,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> List[str]:
+        """Complete many prompts concurrently with a bounded number of requests in flight."""
+        return await gather_bounded(
+            (
+                lambda prompt=prompt: self.acomplete(prompt, temperature=temperature, max_tokens=max_tokens)
+                for prompt in prompts
+            ),
+            concurrency,
+        )
+
+    def complete_batch(
+        self,
+        prompts: Sequence[str],
+        *,
+        temperature: float = 0.3,
+        max_tokens: int = 512,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> List[str]:
+        """Sync wrapper of acomplete_batch for callers outside an event loop."""
+        return asyncio.run(
+            self.acomplete_batch(prompts, temperature=temperature, max_tokens=max_tokens, concurrency=concurrency)
+        )
+
 
 class MockProvider(AIProvider):
     def complete(self, prompt: str, *, temperature: float = 0.3, max_tokens: int = 512) -> str:
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .base import AIProvider
+
+DEFAULT_MAX_ENTRIES = 256
+
+
+def compute_prompt_key(provider_name: str, payload: object, temperature: float, max_tokens: int) -> str:
+    """Cache key from provider name, model params and a hash of the prompt (or messages incl. system prompt)."""
+    body = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+    encoded = json.dumps(
+        {
+            "provider": provider_name,
+            "prompt_sha256": hashlib.sha256(body.encode("utf-8")).hexdigest(),
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters of a CachingProvider."""
+
+    memory_hits: int = 0
+    store_hits: int = 0
+    misses: int = 0
+
+    @property
+    def hits(self) -> int:
+        """Total hits across both tiers."""
+        return self.memory_hits + self.store_hits
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class MemoryCache:
+    """Thread-safe in-memory LRU with an optional TTL in seconds."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: Optional[float] = None) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self.ttl is not None and time.time() - entry[0] > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: str, response: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> int:
+        with self._lock:
+            removed = len(self._entries)
+            self._entries.clear()
+            return removed
+
+
+class SQLiteCache:
+    """On-disk response store in a single SQLite file, shared between CI runs."""
+
+    def __init__(self, path: str, ttl: Optional[float] = None) -> None:
+        self.path = Path(path)
+        self.ttl = ttl
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, response TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self.conn.execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if self.ttl is not None and time.time() - row[1] > self.ttl:
+                with self.conn:
+                    self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            return row[0]
+
+    def put(self, key: str, response: str) -> None:
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created) VALUES (?, ?, ?)",
+                (key, response, time.time()),
+            )
+
+    def clear(self) -> int:
+        with self._lock, self.conn:
+            return self.conn.execute("DELETE FROM responses").rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class CachingProvider(AIProvider):
+    """Wraps any provider and serves repeated identical requests from a cache.
+
+    The in-memory LRU is checked first, then the optional SQLite store.
+    Only successful responses are cached; hit/miss counters live in `stats`.
+    """
+
+    def __init__(
+        self,
+        provider: AIProvider,
+        memory: Optional[MemoryCache] = None,
+        store: Optional[SQLiteCache] = None,
+    ) -> None:
+        self.provider = provider
+        self.memory = memory if memory is not None else MemoryCache()
+        self.store = store
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+    @property
+    def provider_name(self) -> str:
+        """Provider class and model (if any), part of the cache key."""
+        model = getattr(self.provider, "model", None)
+        return f"{type(self.provider).__name__}:{model}" if model else type(self.provider).__name__
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self.stats, counter, getattr(self.stats, counter) + 1)
+
+    def _cached(self, key: str, call) -> str:
+        response = self.memory.get(key)
+        if response is not None:
+            self._count("memory_hits")
+            return response
+        if self.store is not None:
+            response = self.store.get(key)
+            if response is not None:
+                self.memory.put(key, response)
+                self._count("store_hits")
+                return response
+
+        self._count("misses")
+        response = call()
+        self.memory.put(key, response)
+        if self.store is not None:
+            self.store.put(key, response)
+        return response
+
+    def complete(self, prompt: str, *, temperature: float = 0.3, max_tokens: int = 512) -> str:
+        key = compute_prompt_key(self.provider_name, prompt, temperature, max_tokens)
+        return self._cached(
+            key, lambda: self.provider.complete(prompt, temperature=temperature, max_tokens=max_tokens)
+        )
+
+    def chat(self, messages: List[Dict[str, str]], *, temperature: float = 0.3, max_tokens: int = 512) -> str:
+        key = compute_prompt_key(self.provider_name, messages, temperature, max_tokens)
+        return self._cached(key, lambda: self.provider.chat(messages, temperature=temperature, max_tokens=max_tokens))
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .base import AIProvider
+
+CASSETTE_VERSION = 1
+PREVIEW_CHARS = 120
+
+
+class CassetteMissError(LookupError):
+    """A replay-only cassette has no response for the request."""
+
+
+def normalize_prompt(text: str) -> str:
+    """Collapse whitespace so formatting-only prompt changes still match."""
+    return " ".join(text.split())
+
+
+def compute_cassette_key(payload: object) -> str:
+    """Cassette key: SHA-256 of the normalized prompt or of the messages (role + content)."""
+    if isinstance(payload, str):
+        body = normalize_prompt(payload)
+    else:
+        body = "\0".join(f"{m.get('role', '')}:{normalize_prompt(m.get('content', ''))}" for m in payload)
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+class CassetteProvider(AIProvider):
+    """Record/replay provider backed by a JSON cassette file.
+
+    Without `provider` it only replays and raises CassetteMissError on unknown prompts.
+    With `provider`, misses are forwarded to it and recorded into the cassette.
+    Lookups hit a dict keyed by hash, so they are O(1) regardless of cassette size.
+    """
+
+    def __init__(self, path: str, provider: Optional[AIProvider] = None) -> None:
+        self.path = Path(path)
+        self.provider = provider
+        self.recorded = 0
+        self._interactions: Optional[Dict[str, Dict[str, str]]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def interactions(self) -> Dict[str, Dict[str, str]]:
+        if self._interactions is None:
+            if self.path.exists():
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+                if data.get("version") != CASSETTE_VERSION:
+                    raise ValueError(f"Unsupported cassette version in {self.path}: {data.get('version')}")
+                self._interactions = data["interactions"]
+            elif self.provider is not None:
+                self._interactions = {}
+            else:
+                raise FileNotFoundError(f"Cassette not found: {self.path} (record it with a real provider first)")
+        return self._interactions
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": CASSETTE_VERSION, "interactions": dict(sorted(self.interactions.items()))}
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=1)
+                f.write("\n")
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _replay(self, payload: object, preview: str, call) -> str:
+        key = compute_cassette_key(payload)
+        with self._lock:
+            interaction = self.interactions.get(key)
+        if interaction is not None:
+            return interaction["response"]
+        if self.provider is None:
+            raise CassetteMissError(f"No recorded response in {self.path} for prompt: {preview!r}")
+
+        response = call()
+        with self._lock:
+            self.interactions[key] = {"prompt": preview, "response": response}
+            self.recorded += 1
+            self.save()
+        return response
+
+    def complete(self, prompt: str, *, temperature: float = 0.3, max_tokens: int = 512) -> str:
+        return self._replay(
+            prompt,
+            normalize_prompt(prompt)[:PREVIEW_CHARS],
+            lambda: self.provider.complete(prompt, temperature=temperature, max_tokens=max_tokens),
+        )
+
+    def chat(self, messages: List[Dict[str, str]], *, temperature: float = 0.3, max_tokens: int = 512) -> str:
+        preview = normalize_prompt(messages[-1].get("content", "") if messages else "")[:PREVIEW_CHARS]
+        return self._replay(
+            messages,
+            preview,
+            lambda: self.provider.chat(messages, temperature=temperature, max_tokens=max_tokens),
+        )
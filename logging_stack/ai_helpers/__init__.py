@@ -1,7 +1,19 @@
 """AI helper interfaces for logging stack."""
 
 from .base import AIProvider
+from .caching import CacheStats, CachingProvider, MemoryCache, SQLiteCache
+from .cassette import CassetteMissError, CassetteProvider
 from .incident_description import build_incident_description
 from .log_parser_suggestions import propose_parser_pipeline
 
-__all__ = ["AIProvider", "build_incident_description", "propose_parser_pipeline"]
+__all__ = [
+    "AIProvider",
+    "CacheStats",
+    "CachingProvider",
+    "CassetteMissError",
+    "CassetteProvider",
+    "MemoryCache",
+    "SQLiteCache",
+    "build_incident_description",
+    "propose_parser_pipeline",
+]
@@ -1,13 +1,33 @@
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_CONCURRENCY = 8
+
+
+async def gather_bounded(
+    calls: Iterable[Callable[[], Awaitable[T]]],
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> List[T]:
+    """Выполняет вызовы параллельно, не более `concurrency` одновременно; порядок результатов сохраняется."""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(call: Callable[[], Awaitable[T]]) -> T:
+        async with semaphore:
+            return await call()
+
+    return await asyncio.gather(*(run(call) for call in calls))
 
 
 class AIProvider(ABC):
     """Абстрактный интерфейс для подключения стороннего ИИ-провайдера.
 
     Реализация должна инкапсулировать сетевые вызовы и не хранить секреты в коде.
+    Асинхронные методы по умолчанию выполняют синхронные в пуле потоков.
     """
 
     @abstractmethod
@@ -18,6 +38,42 @@ class AIProvider(ABC):
     def chat(self, messages: List[Dict[str, str]], *, temperature: float = 0.2, max_tokens: int = 512) -> str:
         raise NotImplementedError
 
+    async def acomplete(self, prompt: str, *, temperature: float = 0.2, max_tokens: int = 512) -> str:
+        return await asyncio.to_thread(self.complete, prompt, temperature=temperature, max_tokens=max_tokens)
+
+    async def achat(self, messages: List[Dict[str, str]], *, temperature: float = 0.2, max_tokens: int = 512) -> str:
+        return await asyncio.to_thread(self.chat, messages, temperature=temperature, max_tokens=max_tokens)
+
+    async def acomplete_batch(
+        self,
+        prompts: Sequence[str],
+        *,
+        temperature: float = 0.2,
+        max_tokens: int = 512,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> List[str]:
+        """Параллельно обрабатывает пачку промптов с ограничением числа одновременных запросов."""
+        return await gather_bounded(
+            (
+                lambda prompt=prompt: self.acomplete(prompt, temperature=temperature, max_tokens=max_tokens)
+                for prompt in prompts
+            ),
+            concurrency,
+        )
+
+    def complete_batch(
+        self,
+        prompts: Sequence[str],
+        *,
+        temperature: float = 0.2,
+        max_tokens: int = 512,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> List[str]:
+        """Синхронная обёртка над acomplete_batch для кода вне event loop."""
+        return asyncio.run(
+            self.acomplete_batch(prompts, temperature=temperature, max_tokens=max_tokens, concurrency=concurrency)
+        )
+
     def name(self) -> str:
         return self.__class__.__name__
 
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .base import AIProvider
+
+CASSETTE_VERSION = 1
+PREVIEW_CHARS = 120
+
+
+class CassetteMissError(LookupError):
+    """В кассете только для воспроизведения нет ответа на запрос."""
+
+
+def normalize_prompt(text: str) -> str:
+    """Схлопывает пробелы, чтобы изменения только форматирования промпта не ломали сопоставление."""
+    return " ".join(text.split())
+
+
+def compute_cassette_key(payload: object) -> str:
+    """Ключ кассеты — SHA-256 нормализованного промпта или списка сообщений (роль + текст)."""
+    if isinstance(payload, str):
+        body = normalize_prompt(payload)
+    else:
+        body = "\0".join(f"{m.get('role', '')}:{normalize_prompt(m.get('content', ''))}" for m in payload)
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+class CassetteProvider(AIProvider):
+    """Провайдер записи/воспроизведения ответов ИИ из файла-кассеты (JSON).
+
+    Без `provider` работает только на воспроизведение: неизвестный промпт вызывает CassetteMissError.
+    С `provider` промахи отправляются в реальный провайдер и записываются в кассету.
+    Поиск — по словарю с ключом-хэшем, O(1) независимо от размера кассеты.
+    """
+
+    def __init__(self, path: str, provider: Optional[AIProvider] = None) -> None:
+        self.path = Path(path)
+        self.provider = provider
+        self.recorded = 0
+        self._interactions: Optional[Dict[str, Dict[str, str]]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def interactions(self) -> Dict[str, Dict[str, str]]:
+        if self._interactions is None:
+            if self.path.exists():
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+                if data.get("version") != CASSETTE_VERSION:
+                    raise ValueError(f"Неподдерживаемая версия кассеты {self.path}: {data.get('version')}")
+                self._interactions = data["interactions"]
+            elif self.provider is not None:
+                self._interactions = {}
+            else:
+                raise FileNotFoundError(f"Кассета не найдена: {self.path} (сначала запишите её с реальным провайдером)")
+        return self._interactions
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": CASSETTE_VERSION, "interactions": dict(sorted(self.interactions.items()))}
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=1)
+                f.write("\n")
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _replay(self, payload: object, preview: str, call) -> str:
+        key = compute_cassette_key(payload)
+        with self._lock:
+            interaction = self.interactions.get(key)
+        if interaction is not None:
+            return interaction["response"]
+        if self.provider is None:
+            raise CassetteMissError(f"В кассете {self.path} нет ответа на промпт: {preview!r}")
+
+        response = call()
+        with self._lock:
+            self.interactions[key] = {"prompt": preview, "response": response}
+            self.recorded += 1
+            self.save()
+        return response
+
+    def complete(self, prompt: str, *, temperature: float = 0.2, max_tokens: int = 512) -> str:
+        return self._replay(
+            prompt,
+            normalize_prompt(prompt)[:PREVIEW_CHARS],
+            lambda: self.provider.complete(prompt, temperature=temperature, max_tokens=max_tokens),
+        )
+
+    def chat(self, messages: List[Dict[str, str]], *, temperature: float = 0.2, max_tokens: int = 512) -> str:
+        preview = normalize_prompt(messages[-1].get("content", "") if messages else "")[:PREVIEW_CHARS]
+        return self._replay(
+            messages,
+            preview,
+            lambda: self.provider.chat(messages, temperature=temperature, max_tokens=max_tokens),
+        )
@@ -9,23 +9,6 @@ __version__ = "0.1.0"
 __author__ = "run-as-daemon"
 __license__ = "Apache-2.0"
 
-from router_policy_to_config.model import (
-    DHCPConfig,
-    DNSConfig,
-    Firewall,
-    FirewallRule,
-    LANConfig,
-    Meta,
-    NATConfig,
-    Policy,
-    PortForward,
-    SecurityConfig,
-    Target,
-    VPNConfig,
-    WANConfig,
-    WiFiConfig,
-)
-
 __all__ = [
     "Policy",
     "Meta",
@@ -41,4 +24,15 @@ __all__ = [
     "DNSConfig",
     "NATConfig",
     "PortForward",
+    "PerformanceConfig",
+    "compact_policy",
 ]
+
+
+def __getattr__(name):
+    """Import model classes and helpers on first access to keep CLI startup fast."""
+    if name in __all__:
+        from router_policy_to_config import model
+
+        return getattr(model, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,6 +1,7 @@
 """AI helpers for policy generation and test case suggestions."""
 
+from router_policy_to_config.ai.intent_matcher import IntentMatcher
 from router_policy_to_config.ai.policy_nl_to_yaml import PolicyGenerator
 from router_policy_to_config.ai.test_case_generator import TestCaseGenerator
 
-__all__ = ["PolicyGenerator", "TestCaseGenerator"]
+__all__ = ["IntentMatcher", "PolicyGenerator", "TestCaseGenerator"]
@@ -0,0 +1,476 @@
+"""
+Rule-based fast path for natural language policy requests.
+
+Recognizes common building blocks in Russian and English descriptions
+(PPPoE/DHCP WAN, LAN subnet, Wi-Fi, isolated guest network, WireGuard
+road-warrior access, port forwards) and assembles the policy locally.
+
+The matcher is conservative: the description is split into clauses and
+every word of every clause must be recognized (or be a filler word),
+otherwise (or when a feature it cannot express or a negation is mentioned)
+the request is left to the AI provider.
+"""
+
+import ipaddress
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from router_policy_to_config import yaml_utils
+
+# Clause separators: punctuation and conjunctions ("и", "and", "with", "с", "+")
+_CLAUSE_SPLIT = re.compile(r"[,;\n]|\.(?:\s|$)|\s(?:и|а также|плюс|с|со|and|with|plus|\+)\s", re.IGNORECASE)
+
+# Features the fast path cannot express; any of them sends the request to the AI provider
+_UNSUPPORTED = re.compile(
+    r"static|статич|vlan|ipsec|openvpn|l2tp|pptp|sstp|site-to-site|между офис|bgp|ospf|route\b|маршрут(?!изатор)|"
+    r"captive|radius|enterprise|wpa3|qos|shaping|limit|лимит|огранич|скорост|speed|bandwidth|mbit|мбит|"
+    r"ipv6|ddns|failover|резерв|dual.?wan|два провайдер|lte|[45]g\b|mesh|hotspot|schedule|расписан|"
+    r"block|заблокир|запрет|deny|"
+    # Negations ("without VPN", "без изоляции") would otherwise add the very feature they exclude
+    r"\b(?:without|no|not|except|нет|без|не|кроме)\b",
+    re.IGNORECASE,
+)
+
+_VENDOR_ROUTEROS = re.compile(r"mikrotik|routeros|микротик", re.IGNORECASE)
+_VENDOR_OPENWRT = re.compile(r"openwrt|open-wrt", re.IGNORECASE)
+_ROUTEROS_VERSION = re.compile(r"(?:routeros|mikrotik|микротик)\s*v?([67])\b", re.IGNORECASE)
+_PPPOE = re.compile(r"\bpppoe\b", re.IGNORECASE)
+_DHCP = re.compile(r"\bdhcp\b", re.IGNORECASE)
+_DYNAMIC_IP = re.compile(r"динамическ\w*\s+ip|dynamic\s+ip", re.IGNORECASE)
+_WAN_CONTEXT = re.compile(r"\bwan\b|\bisp\b|провайдер|интернет|internet|uplink|аплинк", re.IGNORECASE)
+_LAN = re.compile(r"\blan\b|локальн\w*\s+сет\w*|\bлвс\b", re.IGNORECASE)
+_WAN_INTERFACE = re.compile(r"\b(ether\d+|eth\d+|sfp\d+)\b", re.IGNORECASE)
+_SUBNET = re.compile(r"\b(\d{1,3}(?:\.\d{1,3}){3}/\d{1,2})\b")
+_GUEST = re.compile(r"guest|гост", re.IGNORECASE)
+_WIFI = re.compile(r"wi-?fi|вай-?фай|wlan|wireless|беспроводн", re.IGNORECASE)
+_WIREGUARD = re.compile(r"wire\s?guard|\bwg\b|\bvpn\b|впн|remote\s+access|удал[её]нн\w*\s+доступ", re.IGNORECASE)
+_USER_COUNT = re.compile(
+    r"(\d+)\s*(?:сотрудник\w*|пользовател\w*|человек\w*|удал[её]нщик\w*|users?|employees?|people|peers?|clients?)",
+    re.IGNORECASE,
+)
+_PORT_FORWARD = re.compile(
+    r"(?:port\s*forward(?:ing)?|forward\s+(?:port\s*)?|проброс\w*\s+(?:порт\w*\s*)?|перенаправ\w*\s+(?:порт\w*\s*)?)"
+    r"(?:(tcp|udp)\s*)?(\d{1,5})\s*(?:to|на|->|→)\s*(\d{1,3}(?:\.\d{1,3}){3})(?::(\d{1,5}))?(?:\s*(tcp|udp))?",
+    re.IGNORECASE,
+)
+# Words that carry no configuration but are common in requests
+_FILLER = re.compile(
+    r"office|офис|home|дом|квартир|small\s+business|малого\s+бизнеса|shop|store|магазин|cafe|кафе|"
+    r"router|роутер|маршрутизатор|" + _USER_COUNT.pattern,
+    re.IGNORECASE,
+)
+# Connectives and generic nouns that may remain in a clause once its building blocks are removed
+_STOPWORDS = frozenset({
+    "a", "an", "the", "for", "to", "of", "on", "in", "at", "via", "from", "by", "over", "using", "our", "my", "all",
+    "network", "net", "access", "port",
+    "для", "на", "по", "в", "во", "к", "от", "через", "из", "у", "наш", "наша", "мой", "все", "всех",
+    "сеть", "сети", "сетью", "доступ", "порт", "порта",
+})
+_WORD = re.compile(r"[^\s()]+")
+
+DEFAULT_LAN_SUBNET = "192.168.10.0/24"
+GUEST_LAN_SUBNETS = ("192.168.20.0/24", "192.168.30.0/24")  # First one not overlapping the LAN is used
+GUEST_VLAN_ID = 20
+WIREGUARD_PORT = 51820
+WIREGUARD_SUBNETS = ("10.10.0.0/24", "10.20.0.0/24")
+MAX_VPN_PEERS = 250
+
+
+@dataclass
+class IntentMatch:
+    """Result of matching a description against the known building blocks."""
+
+    intents: List[str] = field(default_factory=list)  # Recognized building blocks
+    unmatched: List[str] = field(default_factory=list)  # Clauses the fast path does not understand
+    policy: Optional[Dict[str, Any]] = None  # Assembled policy when the description is fully covered
+
+    @property
+    def covered(self) -> bool:
+        """Whether the policy was assembled locally."""
+        return self.policy is not None
+
+    def to_yaml(self) -> str:
+        """Render the assembled policy as YAML."""
+        return yaml_utils.safe_dump(self.policy)
+
+
+@dataclass
+class IntentStats:
+    """Fast path hit counters."""
+
+    hits: int = 0
+    misses: int = 0
+    intents: Counter = field(default_factory=Counter)  # Building block -> descriptions assembled with it
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of descriptions served by the fast path."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get_summary(self) -> str:
+        """
+        Get human-readable fast path report.
+
+        Returns:
+            One-line summary of hits, misses and the most used building blocks
+        """
+        total = self.hits + self.misses
+        summary = f"Fast path: {self.hits}/{total} descriptions ({self.hit_rate:.0%}), {self.misses} sent to AI"
+        if self.intents:
+            summary += " [" + ", ".join(f"{name}: {count}" for name, count in self.intents.most_common()) + "]"
+        return summary
+
+
+class IntentMatcher:
+    """Assemble policies for formulaic descriptions without calling the AI provider."""
+
+    def __init__(self):
+        """Initialize intent matcher."""
+        self.stats = IntentStats()
+
+    def analyze(self, description: str) -> IntentMatch:
+        """
+        Recognize building blocks in a description.
+
+        Args:
+            description: Natural language description of network setup (Russian or English)
+
+        Returns:
+            IntentMatch with the assembled policy, or without it when the description is not fully covered
+        """
+        result = IntentMatch()
+        text = description.strip()
+        if not text:
+            return result
+
+        unsupported = _UNSUPPORTED.search(text)
+        if unsupported:
+            result.unmatched.append(unsupported.group(0))
+
+        spec: Dict[str, Any] = {"port_forwards": []}
+        for clause in _clauses(text):
+            if not self._match_clause(clause, spec, result.intents):
+                result.unmatched.append(clause)
+
+        if result.unmatched or not result.intents:
+            return result
+
+        # "PPPoE" together with a DHCP WAN is ambiguous
+        if "wan-pppoe" in result.intents and "wan-dhcp" in result.intents:
+            result.unmatched.append("pppoe/dhcp")
+            return result
+
+        if "vpn_peers" not in spec:
+            count = _USER_COUNT.search(text)
+            spec["vpn_peers"] = int(count.group(1)) if count else 1
+        if not 1 <= spec["vpn_peers"] <= MAX_VPN_PEERS:
+            result.unmatched.append(f"{spec['vpn_peers']} VPN users")
+            return result
+
+        lan = ipaddress.IPv4Network(spec.get("lan_subnet", DEFAULT_LAN_SUBNET))
+        outside = [ip for _, _, ip, _ in spec["port_forwards"] if not _is_lan_host(ipaddress.IPv4Address(ip), lan)]
+        if outside:
+            result.unmatched.extend(f"forward to {ip} outside {lan}" for ip in outside)
+            return result
+
+        # The same external port forwarded twice: only the first rule would ever match
+        forwarded = Counter((protocol, port) for protocol, port, _, _ in spec["port_forwards"])
+        conflicts = [f"{protocol}/{port} forwarded {count} times" for (protocol, port), count in forwarded.items()
+                     if count > 1]
+        if conflicts:
+            result.unmatched.extend(conflicts)
+            return result
+
+        taken = [lan]
+        for intent, key, candidates in (
+            ("guest-isolation", "guest_subnet", GUEST_LAN_SUBNETS),
+            ("wireguard-road-warrior", "vpn_subnet", WIREGUARD_SUBNETS),
+        ):
+            if intent not in result.intents:
+                continue
+            if key in spec:
+                subnet = ipaddress.IPv4Network(spec[key])
+                if any(subnet.overlaps(other) for other in taken):
+                    result.unmatched.append(f"{intent} subnet {subnet} overlaps another network")
+                    return result
+            else:
+                subnet = _free_subnet(candidates, taken)
+            if subnet is None:
+                result.unmatched.append(f"{intent} subnet overlaps {lan}")
+                return result
+            spec[key] = str(subnet)
+            taken.append(subnet)
+
+        spec["vendor"] = "openwrt" if _VENDOR_OPENWRT.search(text) else "routeros"
+        version = _ROUTEROS_VERSION.search(text)
+        spec["version"] = f"v{version.group(1)}" if version else "v7"
+        spec["office"] = bool(re.search(r"office|офис|business|бизнес|сотрудник|employee", text, re.IGNORECASE))
+        spec["description"] = " ".join(text.split())[:200]
+
+        result.intents = list(dict.fromkeys(result.intents))
+        result.policy = _assemble(spec, result.intents)
+        return result
+
+    def match(self, description: str) -> Optional[IntentMatch]:
+        """
+        Try the fast path and count the outcome.
+
+        Args:
+            description: Natural language description of network setup
+
+        Returns:
+            IntentMatch with the assembled policy, or None if the AI provider is needed
+        """
+        result = self.analyze(description)
+        if not result.covered:
+            self.stats.misses += 1
+            return None
+
+        self.stats.hits += 1
+        self.stats.intents.update(result.intents)
+        return result
+
+    @staticmethod
+    def _match_clause(clause: str, spec: Dict[str, Any], intents: List[str]) -> bool:
+        """Record building blocks found in one clause; False unless every word of it was recognized."""
+        used: List[re.Match] = list(_FILLER.finditer(clause))
+
+        forwards = list(_PORT_FORWARD.finditer(clause))
+        for forward in forwards:
+            protocol = (forward.group(1) or forward.group(5) or "tcp").lower()
+            external_port = int(forward.group(2))
+            internal_port = int(forward.group(4) or external_port)
+            try:
+                ipaddress.IPv4Address(forward.group(3))
+            except ValueError:
+                return False
+            if not (1 <= external_port <= 65535 and 1 <= internal_port <= 65535):
+                return False
+            spec["port_forwards"].append((protocol, external_port, forward.group(3), internal_port))
+            intents.append("port-forward")
+            used.append(forward)
+        if forwards:
+            # The rest of the clause is the forward itself
+            return _fully_used(clause, used)
+
+        wan_context = _WAN_CONTEXT.search(clause)
+        pppoe = _PPPOE.search(clause)
+        dhcp = _DYNAMIC_IP.search(clause) or _DHCP.search(clause)
+        if pppoe:
+            intents.append("wan-pppoe")
+            used.append(pppoe)
+        elif dhcp and (wan_context or _DYNAMIC_IP.search(clause)):
+            intents.append("wan-dhcp")
+        # DHCP on the LAN is the default
+        if dhcp:
+            used.append(dhcp)
+        interface = _WAN_INTERFACE.search(clause)
+        if interface and (wan_context or pppoe):
+            spec["wan_interface"] = interface.group(1).lower()
+            used.append(interface)
+        if wan_context and (pppoe or dhcp or interface):
+            used.append(wan_context)
+
+        guest = _GUEST.search(clause)
+        wireguard = _WIREGUARD.search(clause)
+        lan = _LAN.search(clause)
+        subnet = _SUBNET.search(clause)
+        if subnet:
+            try:
+                network = ipaddress.IPv4Network(subnet.group(1), strict=False)
+            except ValueError:
+                return False
+            if not network.is_private or not 16 <= network.prefixlen <= 24:
+                return False
+            # The subnet belongs to the network the clause is about
+            if guest:
+                spec["guest_subnet"] = str(network)
+            elif wireguard:
+                spec["vpn_subnet"] = str(network)
+            elif lan or not (pppoe or dhcp or interface):
+                spec["lan_subnet"] = str(network)
+                intents.append("lan")
+            else:
+                return False
+            used.append(subnet)
+        elif lan and not guest:
+            intents.append("lan")
+        if lan:
+            used.append(lan)
+
+        wifi = _WIFI.search(clause)
+        if guest:
+            intents.append("guest-isolation")
+            if wifi:
+                intents.append("wifi")
+                spec["guest_wifi"] = True
+            used.append(guest)
+        elif wifi:
+            intents.append("wifi")
+        if wifi:
+            used.append(wifi)
+
+        if wireguard:
+            count = _USER_COUNT.search(clause)
+            if count:
+                spec["vpn_peers"] = int(count.group(1))
+            intents.append("wireguard-road-warrior")
+            used.extend(_WIREGUARD.finditer(clause))
+
+        used.extend(_VENDOR_ROUTEROS.finditer(clause))
+        used.extend(_VENDOR_OPENWRT.finditer(clause))
+        used.extend(_ROUTEROS_VERSION.finditer(clause))
+
+        return _fully_used(clause, used)
+
+
+def _fully_used(clause: str, used: List[re.Match]) -> bool:
+    """Whether every word of a clause overlaps a recognized match or is a stopword."""
+    if not used:
+        return False
+    for word in _WORD.finditer(clause):
+        if any(match.start() < word.end() and word.start() < match.end() for match in used):
+            continue
+        if word.group(0).strip(".,:;!?-–—\"'«»").lower() not in _STOPWORDS | {""}:
+            return False
+    return True
+
+
+def _clauses(text: str) -> List[str]:
+    """Split a description into non-empty clauses."""
+    return [clause.strip(" .:-") for clause in _CLAUSE_SPLIT.split(text) if clause and clause.strip(" .:-")]
+
+
+def _is_lan_host(address: ipaddress.IPv4Address, network: ipaddress.IPv4Network) -> bool:
+    """Whether an address is a host in the network other than the gateway (first host)."""
+    return address in network and address not in (
+        network.network_address, network.network_address + 1, network.broadcast_address
+    )
+
+
+def _free_subnet(
+    candidates: Tuple[str, ...], taken: List[ipaddress.IPv4Network]
+) -> Optional[ipaddress.IPv4Network]:
+    """Return the first candidate subnet that overlaps none of the taken ones."""
+    for candidate in candidates:
+        network = ipaddress.IPv4Network(candidate)
+        if not any(network.overlaps(other) for other in taken):
+            return network
+    return None
+
+
+def _lan(name: str, subnet: str, dhcp_lease: Optional[str] = None) -> Dict[str, Any]:
+    """Build a LAN with the first host as gateway and a DHCP pool in the upper part of the subnet."""
+    network = ipaddress.IPv4Network(subnet)
+    hosts = network.num_addresses - 2
+    start = network.network_address + min(100, hosts // 2)
+    end = network.network_address + min(200, hosts)
+    dhcp: Dict[str, Any] = {"enabled": True, "range": f"{start}-{end}"}
+    if dhcp_lease:
+        dhcp["lease_time"] = dhcp_lease
+    return {"name": name, "subnet": str(network), "gateway": str(network.network_address + 1), "dhcp": dhcp}
+
+
+def _assemble(spec: Dict[str, Any], intents: List[str]) -> Dict[str, Any]:
+    """Assemble policy data from recognized building blocks."""
+    vendor = spec["vendor"]
+    site = "office" if spec["office"] else "home"
+    ssid = "Office" if spec["office"] else "Home"
+
+    policy: Dict[str, Any] = {
+        "meta": {
+            "name": f"{site}-router",
+            "description": spec["description"],
+            "target": {"vendor": vendor, "version": spec["version"] if vendor == "routeros" else "23.05"},
+        },
+    }
+
+    wan: Dict[str, Any] = {
+        "type": "pppoe" if "wan-pppoe" in intents else "dhcp",
+        "interface": spec.get("wan_interface") or ("ether1" if vendor == "routeros" else "wan"),
+    }
+    if wan["type"] == "pppoe":
+        wan["username"] = "ISP_USERNAME"
+        wan["password_ref"] = "secret:pppoe_password"
+    policy["wan"] = wan
+
+    lans = [_lan("main", spec.get("lan_subnet", DEFAULT_LAN_SUBNET))]
+    rules = [{"name": "allow_lan_to_internet", "from": ["main"], "to": ["wan"], "action": "accept"}]
+
+    guest = "guest-isolation" in intents
+    if guest:
+        guest_lan = _lan("guest", spec["guest_subnet"], dhcp_lease="2h")
+        guest_lan["isolated_from"] = ["main"]
+        if vendor == "routeros":
+            guest_lan["vlan_id"] = GUEST_VLAN_ID  # Isolation needs a separate interface on RouterOS
+        lans.append(guest_lan)
+        rules.append({"name": "allow_guest_to_internet", "from": ["guest"], "to": ["wan"], "action": "accept"})
+        rules.append({
+            "name": "block_guest_to_main",
+            "from": ["guest"],
+            "to": ["main"],
+            "action": "drop",
+            "comment": "Isolate guest from main LAN",
+        })
+    policy["lans"] = lans
+
+    if "wifi" in intents:
+        wifi = [{
+            "name": "main-wifi",
+            "lan": "main",
+            "ssid": ssid,
+            "mode": "ap",
+            "security": {"encryption": "wpa2-psk", "password_ref": "secret:wifi_main_password"},
+        }]
+        if guest and spec.get("guest_wifi"):
+            wifi.append({
+                "name": "guest-wifi",
+                "lan": "guest",
+                "ssid": f"{ssid}-Guest",
+                "mode": "ap",
+                "guest": True,
+                "security": {"encryption": "wpa2-psk", "password_ref": "secret:wifi_guest_password"},
+            })
+        policy["wifi"] = wifi
+
+    if "wireguard-road-warrior" in intents:
+        network = ipaddress.IPv4Network(spec["vpn_subnet"])
+        policy["vpn"] = [{
+            "type": "wireguard",
+            "role": "server",
+            "listen_port": WIREGUARD_PORT,
+            "interface": "wireguard1" if vendor == "routeros" else "wg0",
+            "allowed_ips": [f"{network.network_address + 1}/{network.prefixlen}"],
+            "private_key_ref": "secret:wireguard_private_key",
+            "peers": [
+                {
+                    "name": f"user{i}",
+                    "public_key_ref": f"secret:wireguard_user{i}_public_key",
+                    "allowed_ips": [f"{network.network_address + 1 + i}/32"],
+                }
+                for i in range(1, spec["vpn_peers"] + 1)
+            ],
+        }]
+        rules.append({"name": "allow_vpn_to_main", "from": ["vpn"], "to": ["main"], "action": "accept"})
+        rules.append({"name": "allow_vpn_to_internet", "from": ["vpn"], "to": ["wan"], "action": "accept"})
+
+    policy["firewall"] = {"default_policy": "drop", "rules": rules}
+
+    nat: Dict[str, Any] = {"masquerade": True}
+    if spec["port_forwards"]:
+        nat["port_forwards"] = [
+            {
+                "name": f"forward_{protocol}_{external_port}",
+                "protocol": protocol,
+                "external_port": external_port,
+                "internal_ip": internal_ip,
+                "internal_port": internal_port,
+            }
+            for protocol, external_port, internal_ip, internal_port in spec["port_forwards"]
+        ]
+    policy["nat"] = nat
+
+    return policy
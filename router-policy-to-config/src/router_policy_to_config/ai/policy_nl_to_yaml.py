@@ -1,28 +1,46 @@
 """
 Natural language to policy YAML converter.
 
-Uses AI to convert text descriptions into policy YAML.
+Uses AI to convert text descriptions into policy YAML. Formulaic
+descriptions are assembled locally by the IntentMatcher fast path, and
+generate_validated() repairs schema and semantic errors in a bounded loop.
 """
 
-from typing import Optional
-
-import yaml
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+from router_policy_to_config import yaml_utils
+from router_policy_to_config.ai.intent_matcher import IntentMatch, IntentMatcher
+from router_policy_to_config.ai.repair import GenerationReport, TokenMeter, error_sections
+from router_policy_to_config.ai.streaming import YAMLStreamError, stream_checked_yaml
 from router_policy_to_config.ai_providers.base import AIProvider
 from router_policy_to_config.ai_providers.mock_provider import MockProvider
+from router_policy_to_config.model import Policy
+from router_policy_to_config.policy_loader import PolicyLoader
+from router_policy_to_config.policy_validator import PolicyValidator, ValidationError
+
+DEFAULT_MAX_ATTEMPTS = 3
 
 
 class PolicyGenerator:
     """Generate policy YAML from natural language descriptions."""
 
-    def __init__(self, ai_provider: Optional[AIProvider] = None):
+    def __init__(self, ai_provider: Optional[AIProvider] = None, fast_path: bool = True):
         """
         Initialize policy generator.
 
         Args:
             ai_provider: AI provider to use. If None, uses MockProvider.
+            fast_path: Assemble formulaic descriptions locally before asking the AI provider
         """
         self.ai_provider = ai_provider or MockProvider()
+        self.intent_matcher = IntentMatcher() if fast_path else None
+        self.last_match: Optional[IntentMatch] = None  # Fast path result of the last generation
+
+    def _fast_path(self, description: str) -> Optional[str]:
+        """Policy YAML assembled by the intent matcher, or None to use the AI provider."""
+        self.last_match = self.intent_matcher.match(description) if self.intent_matcher else None
+        return self.last_match.to_yaml() if self.last_match else None
 
     def generate_from_text(self, description: str) -> str:
         """
@@ -34,6 +52,10 @@ class PolicyGenerator:
         Returns:
             Generated YAML policy as string
         """
+        local_yaml = self._fast_path(description)
+        if local_yaml is not None:
+            return local_yaml
+
         if not self.ai_provider.is_available():
             raise RuntimeError("AI provider is not available")
 
@@ -41,12 +63,42 @@ class PolicyGenerator:
 
         # Basic validation - try to parse as YAML
         try:
-            yaml.safe_load(yaml_content)
-        except yaml.YAMLError as e:
+            yaml_utils.safe_load(yaml_content)
+        except yaml_utils.YAMLError as e:
             raise ValueError(f"Generated content is not valid YAML: {e}")
 
         return yaml_content
 
+    def stream_from_text(self, description: str) -> Iterator[str]:
+        """
+        Stream policy YAML generated from a text description.
+
+        Chunks are yielded as the provider produces them and checked for
+        YAML well-formedness on the way; generation is cancelled as soon as
+        the output can no longer become valid YAML.
+
+        Args:
+            description: Natural language description of network setup
+
+        Yields:
+            Chunks of the generated YAML policy
+
+        Raises:
+            ValueError: If the streamed content is not valid YAML
+        """
+        local_yaml = self._fast_path(description)
+        if local_yaml is not None:
+            yield local_yaml
+            return
+
+        if not self.ai_provider.is_available():
+            raise RuntimeError("AI provider is not available")
+
+        try:
+            yield from stream_checked_yaml(self.ai_provider.stream_policy_yaml(description))
+        except YAMLStreamError as e:
+            raise ValueError(f"Generated content is not valid YAML: {e}") from e
+
     def refine_policy(self, current_yaml: str, refinement_request: str) -> str:
         """
         Refine existing policy based on additional requirements.
@@ -58,6 +110,10 @@ class PolicyGenerator:
         Returns:
             Refined policy YAML
         """
+        return self._refine(self.ai_provider, current_yaml, refinement_request)
+
+    def _refine(self, provider: AIProvider, current_yaml: str, refinement_request: str) -> str:
+        """Ask a provider to apply a refinement request to policy YAML."""
         prompt = f"""Current policy:
 ```yaml
 {current_yaml}
@@ -71,12 +127,127 @@ Return only the YAML, no explanations.
 
         system_prompt = "You are a network configuration expert. Refine the router policy based on the user's request."
 
-        refined = self.ai_provider.generate_completion(prompt, system_prompt=system_prompt, temperature=0.3)
+        refined = provider.generate_completion(prompt, system_prompt=system_prompt, temperature=0.3)
 
         # Validate
         try:
-            yaml.safe_load(refined)
-        except yaml.YAMLError as e:
+            yaml_utils.safe_load(refined)
+        except yaml_utils.YAMLError as e:
             raise ValueError(f"Refined content is not valid YAML: {e}")
 
         return refined
+
+    def generate_validated(
+        self,
+        description: str,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        latency_budget: Optional[float] = None,
+        loader: Optional[PolicyLoader] = None,
+    ) -> GenerationReport:
+        """
+        Generate a policy and repair it until it passes schema and semantic validation.
+
+        Each repair sends refine_policy only the error list and the top-level
+        sections the errors point at; the corrected sections are merged back
+        into the document.
+
+        Args:
+            description: Natural language description of network setup
+            max_attempts: Maximum validated documents (initial generation plus repairs)
+            latency_budget: Seconds after which no further repair is started. If None, unlimited.
+                The budget is checked between calls, not enforced during one: a slow provider call
+                can overrun it by up to the provider's own request timeout.
+            loader: Policy loader used for schema validation. If None, uses the default schema.
+
+        Returns:
+            GenerationReport with the final YAML, the validated policy (if any) and per-run accounting
+        """
+        start = time.monotonic()
+        loader = loader or PolicyLoader(collect_all_errors=True)
+        meter = TokenMeter(self.ai_provider)
+        report = GenerationReport()
+
+        policy_yaml = self._fast_path(description)
+        report.fast_path = policy_yaml is not None
+        if policy_yaml is None:
+            if not self.ai_provider.is_available():
+                raise RuntimeError("AI provider is not available")
+            policy_yaml = meter.generate_policy_yaml(description)
+
+        while True:
+            report.attempts += 1
+            data, policy, report.errors, report.warnings = self._check(policy_yaml, loader)
+            if policy is not None:
+                report.policy = policy
+                report.stop_reason = "valid"
+                break
+            if report.attempts >= max_attempts:
+                report.stop_reason = "max_attempts"
+                break
+            if latency_budget is not None and time.monotonic() - start >= latency_budget:
+                report.stop_reason = "latency_budget"
+                break
+
+            policy_yaml = self._repair(meter, policy_yaml, data, report)
+
+        report.yaml = policy_yaml
+        report.elapsed = time.monotonic() - start
+        report.calls = meter.calls
+        report.prompt_tokens = meter.prompt_tokens
+        report.completion_tokens = meter.completion_tokens
+        return report
+
+    @staticmethod
+    def _check(
+        policy_yaml: str, loader: PolicyLoader
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Policy], List[str], List[str]]:
+        """Validate policy YAML; returns (data, policy, errors, warnings) with policy None on errors."""
+        try:
+            data = yaml_utils.safe_load(policy_yaml)
+        except yaml_utils.YAMLError as e:
+            return None, None, [f"Invalid YAML: {e}"], []
+        if not isinstance(data, dict):
+            return None, None, ["Policy must be a YAML mapping"], []
+
+        errors = loader.schema_errors(data)
+        if errors:
+            return data, None, errors, []
+
+        try:
+            validator = PolicyValidator(loader.to_model(data))
+        except (KeyError, TypeError, ValueError) as e:
+            return data, None, [f"Invalid policy structure: {e}"], []
+        try:
+            validator.validate()
+        except ValidationError:
+            return data, None, validator.errors, validator.warnings
+        return data, validator.policy, [], validator.get_warnings()
+
+    def _repair(
+        self, meter: TokenMeter, policy_yaml: str, data: Optional[Dict[str, Any]], report: GenerationReport
+    ) -> str:
+        """Send the errors and offending sections to refine_policy and merge the fix into the document."""
+        sections = error_sections(report.errors, data) if data is not None else []
+        report.repaired_sections.append(sections)
+        errors = "\n".join(f"- {error}" for error in report.errors)
+
+        if sections:
+            fragment = yaml_utils.safe_dump({name: data[name] for name in sections if name in data})
+            request = (
+                f"Fix these validation errors:\n{errors}\n"
+                f"Return only the corrected top-level sections ({', '.join(sections)}) as YAML."
+            )
+        else:
+            fragment = policy_yaml
+            request = f"Fix these validation errors:\n{errors}\nReturn the complete corrected policy."
+
+        try:
+            fixed = yaml_utils.safe_load(self._refine(meter, fragment, request))
+        except ValueError:
+            return policy_yaml  # Unparseable fix: the next attempt repairs the same errors again
+
+        if data is None or not sections:
+            return yaml_utils.safe_dump(fixed)
+        if isinstance(fixed, dict):
+            data.update({name: value for name, value in fixed.items() if name in sections or name not in data})
+        return yaml_utils.safe_dump(data)
@@ -0,0 +1,140 @@
+"""
+Helpers for the generate-validate-repair loop.
+
+PolicyGenerator.generate_validated() checks generated policies with the
+schema and the semantic validator. Repairs send only the error list and
+the top-level sections the errors point at, so a fix costs a fraction of
+a full regeneration. This module holds the per-run token meter, the run
+report and the mapping from errors to policy sections.
+"""
+
+import math
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from router_policy_to_config.ai_providers.base import AIProvider
+from router_policy_to_config.model import Policy
+
+# Validator messages -> top-level policy section, first match wins
+_SECTION_HINTS = [
+    ("performance", ("performance.",)),
+    ("wifi", ("wifi '",)),
+    ("firewall", ("firewall rule",)),
+    ("nat", ("port forward",)),
+    ("vpn", ("vpn",)),
+    ("wan", ("wan ",)),
+    ("lans", ("lan '", "subnets overlap", "dhcp range")),
+]
+
+CHARS_PER_TOKEN = 4  # Rough average for English/YAML text, used when the provider reports no usage
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a text."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+
+def error_sections(errors: List[str], data: Dict[str, Any]) -> List[str]:
+    """
+    Map error messages to the top-level sections they refer to.
+
+    Schema errors are prefixed with the field path ("lans.0.subnet: ..."),
+    validator errors are matched by wording.
+
+    Args:
+        errors: Schema and validator error messages
+        data: Policy data the errors were found in
+
+    Returns:
+        Section names in document order; all sections if an error cannot be attributed
+    """
+    sections = set()
+    for error in errors:
+        head = error.split(":", 1)[0].split(".", 1)[0]
+        if head in data:
+            sections.add(head)
+            continue
+
+        lowered = error.lower()
+        section = next((name for name, hints in _SECTION_HINTS if any(hint in lowered for hint in hints)), None)
+        if section is None:
+            return list(data)
+        sections.add(section)
+
+    return [name for name in data if name in sections] + sorted(sections - set(data))
+
+
+class TokenMeter(AIProvider):
+    """Provider wrapper counting calls and (estimated) tokens of one run."""
+
+    def __init__(self, provider: AIProvider):
+        """
+        Initialize token meter.
+
+        Args:
+            provider: Provider to forward calls to
+        """
+        self.provider = provider
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._lock = threading.Lock()
+
+    def generate_completion(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000
+    ) -> str:
+        """Forward a completion request and count its tokens."""
+        response = self.provider.generate_completion(prompt, system_prompt, temperature, max_tokens)
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += estimate_tokens(prompt) + estimate_tokens(system_prompt or "")
+            self.completion_tokens += estimate_tokens(response)
+        return response
+
+    def is_available(self) -> bool:
+        """Available when the wrapped provider is."""
+        return self.provider.is_available()
+
+
+@dataclass
+class GenerationReport:
+    """Outcome of a generate-validate-repair run."""
+
+    yaml: str = ""
+    policy: Optional[Policy] = None  # Validated model, None if the run did not converge
+    errors: List[str] = field(default_factory=list)  # Errors of the last attempt
+    warnings: List[str] = field(default_factory=list)
+    attempts: int = 0  # Validated documents (initial generation plus repairs)
+    repaired_sections: List[List[str]] = field(default_factory=list)  # Sections sent in each repair
+    stop_reason: str = ""  # valid, max_attempts or latency_budget
+    fast_path: bool = False
+    elapsed: float = 0.0  # Seconds
+    calls: int = 0  # AI provider calls
+    prompt_tokens: int = 0  # Estimated
+    completion_tokens: int = 0  # Estimated
+
+    @property
+    def valid(self) -> bool:
+        """Whether the final policy passed schema and semantic validation."""
+        return self.policy is not None
+
+    @property
+    def total_tokens(self) -> int:
+        """Estimated prompt plus completion tokens."""
+        return self.prompt_tokens + self.completion_tokens
+
+    def get_summary(self) -> str:
+        """
+        Get human-readable run summary.
+
+        Returns:
+            One-line summary of outcome, attempts, time and tokens
+        """
+        outcome = "valid" if self.valid else f"invalid ({len(self.errors)} error(s), stopped: {self.stop_reason})"
+        source = "fast path" if self.fast_path else f"{self.calls} AI call(s), ~{self.total_tokens} tokens"
+        return f"Policy {outcome} after {self.attempts} attempt(s) in {self.elapsed:.2f}s, {source}"
@@ -0,0 +1,119 @@
+"""
+Incremental YAML checking for streamed AI output.
+
+Streamed policy YAML is checked as it arrives, so a response that can no
+longer become a valid document is detected after the first broken
+top-level block instead of after the whole completion.
+
+Only complete lines are checked. Each top-level block (a line at column 0
+and its indented continuation) is parsed once, when the next top-level
+line arrives, so checking stays linear in the document size. If a block
+does not parse as a mapping on its own, the whole prefix is parsed to
+confirm: errors at the end of the text are recoverable (more tokens may
+close a quote or a bracket), errors before it are not.
+"""
+
+from typing import Any, Iterable, Iterator, List
+
+from router_policy_to_config import yaml_utils
+
+
+class YAMLStreamError(ValueError):
+    """Raised when streamed text can no longer become valid YAML."""
+
+
+class IncrementalYAMLChecker:
+    """Check YAML well-formedness of a document fed in chunks."""
+
+    def __init__(self):
+        """Initialize checker."""
+        self._chunks: List[str] = []
+        self._pending = ""  # Incomplete last line
+        self._lines: List[str] = []  # Complete lines
+        self._block_start = 0  # Index in _lines of the current top-level block
+
+    @property
+    def text(self) -> str:
+        """Text received so far."""
+        return "".join(self._chunks)
+
+    def feed(self, chunk: str) -> None:
+        """
+        Add a chunk of streamed text and check the completed top-level blocks.
+
+        Args:
+            chunk: Next piece of the document
+
+        Raises:
+            YAMLStreamError: If the text received so far cannot be completed into valid YAML
+        """
+        self._chunks.append(chunk)
+        *complete, self._pending = (self._pending + chunk).split("\n")
+
+        for line in complete:
+            if line[:1] not in ("", " ", "\t", "#") and len(self._lines) > self._block_start:
+                self._check_block(line)
+                self._block_start = len(self._lines)
+            self._lines.append(line)
+
+    def _check_block(self, next_line: str) -> None:
+        """Check the completed block before a new top-level line."""
+        block = "\n".join(self._lines[self._block_start:]) + "\n"
+        try:
+            if isinstance(yaml_utils.safe_load(block), (dict, type(None))):
+                return
+        except yaml_utils.YAMLError:
+            pass
+
+        # The block alone is not a mapping (or spans blocks): confirm on the whole prefix
+        prefix = "\n".join(self._lines + [next_line]) + "\n"
+        try:
+            yaml_utils.safe_load(prefix)
+        except yaml_utils.YAMLError as e:
+            mark = getattr(e, "problem_mark", None)
+            if mark is not None and mark.index < len(prefix.rstrip()):
+                raise YAMLStreamError(f"line {mark.line + 1}: {getattr(e, 'problem', None) or e}") from e
+
+    def finish(self) -> Any:
+        """
+        Parse the complete document.
+
+        Returns:
+            Parsed YAML document
+
+        Raises:
+            YAMLStreamError: If the document is not valid YAML
+        """
+        try:
+            return yaml_utils.safe_load(self.text)
+        except yaml_utils.YAMLError as e:
+            raise YAMLStreamError(str(e)) from e
+
+
+def stream_checked_yaml(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Pass chunks through while checking that they form valid YAML.
+
+    The source iterator is closed on the first unrecoverable error, which
+    stops a streaming provider from generating (and billing) more tokens.
+
+    Args:
+        chunks: Streamed text chunks
+
+    Yields:
+        The same chunks
+
+    Raises:
+        YAMLStreamError: As soon as the stream is unrecoverably invalid, or at the end
+    """
+    checker = IncrementalYAMLChecker()
+    iterator = iter(chunks)
+    try:
+        for chunk in iterator:
+            checker.feed(chunk)
+            yield chunk
+        checker.finish()
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
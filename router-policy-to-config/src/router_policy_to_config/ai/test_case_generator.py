@@ -4,10 +4,11 @@ Test case generator using AI.
 Generates test scenarios based on policy configuration.
 """
 
+import asyncio
 import json
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
-from router_policy_to_config.ai_providers.base import AIProvider
+from router_policy_to_config.ai_providers.base import DEFAULT_CONCURRENCY, AIProvider, gather_bounded
 from router_policy_to_config.ai_providers.mock_provider import MockProvider
 from router_policy_to_config.model import Policy
 
@@ -76,6 +77,61 @@ class TestCaseGenerator:
 
         return test_cases
 
+    async def agenerate_test_cases(self, policy: Policy) -> List[Dict[str, Any]]:
+        """
+        Async variant of generate_test_cases().
+
+        Args:
+            policy: Policy instance
+
+        Returns:
+            List of test case dictionaries
+        """
+        if not self.ai_provider.is_available():
+            return self._generate_basic_test_cases(policy)
+
+        summary = self._policy_to_summary(policy)
+        test_cases = await self.ai_provider.agenerate_test_cases(summary, policy.meta.target.vendor)
+        test_cases.extend(self._generate_basic_test_cases(policy))
+        return test_cases
+
+    async def agenerate_fleet_test_cases(
+        self,
+        policies: Sequence[Policy],
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Generate test cases for many policies with bounded concurrent AI requests.
+
+        Args:
+            policies: Policy instances
+            concurrency: Maximum number of AI requests in flight
+
+        Returns:
+            Test case lists in the order of policies
+        """
+        return await gather_bounded(
+            (lambda policy=policy: self.agenerate_test_cases(policy) for policy in policies),
+            concurrency,
+        )
+
+    def generate_fleet_test_cases(
+        self,
+        policies: Sequence[Policy],
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Synchronous wrapper of agenerate_fleet_test_cases().
+
+        Args:
+            policies: Policy instances
+            concurrency: Maximum number of AI requests in flight
+
+        Returns:
+            Test case lists in the order of policies
+        """
+        return asyncio.run(self.agenerate_fleet_test_cases(policies, concurrency))
+
     def _generate_basic_test_cases(self, policy: Policy) -> List[Dict[str, Any]]:
         """Generate basic test cases without AI."""
         test_cases = []
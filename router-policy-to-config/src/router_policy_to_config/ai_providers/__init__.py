@@ -1,6 +1,18 @@
 """AI providers infrastructure."""
 
 from router_policy_to_config.ai_providers.base import AIProvider
+from router_policy_to_config.ai_providers.caching import CachingProvider, MemoryCache, SQLiteCache
+from router_policy_to_config.ai_providers.cassette import CassetteMissError, CassetteProvider
 from router_policy_to_config.ai_providers.mock_provider import MockProvider
+from router_policy_to_config.ai_providers.openai_compatible import OpenAICompatibleProvider
 
-__all__ = ["AIProvider", "MockProvider"]
+__all__ = [
+    "AIProvider",
+    "CachingProvider",
+    "CassetteMissError",
+    "CassetteProvider",
+    "MemoryCache",
+    "MockProvider",
+    "OpenAICompatibleProvider",
+    "SQLiteCache",
+]
@@ -3,10 +3,46 @@ Base AI provider interface.
 
 Abstract base class for AI providers used in policy generation
 and test case suggestions.
+
+Providers implement the synchronous generate_completion(). The async
+API (agenerate_completion, agenerate_batch) runs it in worker threads
+by default; providers with pooled connections can serve several calls
+at once, bounded by a semaphore. stream_completion() yields the text
+in chunks; providers without native streaming return it as one chunk.
 """
 
+import asyncio
+import json
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Default number of concurrent requests in batch calls
+DEFAULT_CONCURRENCY = 8
+
+
+async def gather_bounded(
+    calls: Iterable[Callable[[], Awaitable[T]]],
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> List[T]:
+    """
+    Run coroutine factories concurrently, at most `concurrency` at a time.
+
+    Args:
+        calls: Callables returning awaitables (called only when a slot is free)
+        concurrency: Maximum number of calls in flight
+
+    Returns:
+        Results in the order of calls
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(call: Callable[[], Awaitable[T]]) -> T:
+        async with semaphore:
+            return await call()
+
+    return await asyncio.gather(*(run(call) for call in calls))
 
 
 class AIProvider(ABC):
@@ -34,6 +70,103 @@ class AIProvider(ABC):
         """
         pass
 
+    def stream_completion(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000
+    ) -> Iterator[str]:
+        """
+        Generate a completion as a stream of text chunks.
+
+        Closing the iterator early cancels the rest of the generation for
+        providers that stream natively. The default implementation yields
+        the result of generate_completion() as a single chunk.
+
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            temperature: Sampling temperature (0.0-1.0)
+            max_tokens: Maximum tokens in response
+
+        Yields:
+            Text chunks in order
+        """
+        yield self.generate_completion(prompt, system_prompt, temperature, max_tokens)
+
+    async def agenerate_completion(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000
+    ) -> str:
+        """
+        Generate a completion without blocking the event loop.
+
+        Runs generate_completion() in a worker thread; override for
+        natively async clients.
+
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            temperature: Sampling temperature (0.0-1.0)
+            max_tokens: Maximum tokens in response
+
+        Returns:
+            Generated text completion
+        """
+        return await asyncio.to_thread(self.generate_completion, prompt, system_prompt, temperature, max_tokens)
+
+    async def agenerate_batch(
+        self,
+        prompts: Sequence[str],
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> List[str]:
+        """
+        Generate completions for many prompts concurrently.
+
+        Args:
+            prompts: User prompts
+            system_prompt: Optional system prompt shared by all prompts
+            temperature: Sampling temperature (0.0-1.0)
+            max_tokens: Maximum tokens in each response
+            concurrency: Maximum number of requests in flight
+
+        Returns:
+            Completions in the order of prompts
+        """
+        return await gather_bounded(
+            (
+                lambda prompt=prompt: self.agenerate_completion(prompt, system_prompt, temperature, max_tokens)
+                for prompt in prompts
+            ),
+            concurrency,
+        )
+
+    def generate_batch(
+        self,
+        prompts: Sequence[str],
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> List[str]:
+        """
+        Synchronous wrapper of agenerate_batch() for code outside an event loop.
+
+        Returns:
+            Completions in the order of prompts
+        """
+        return asyncio.run(self.agenerate_batch(prompts, system_prompt, temperature, max_tokens, concurrency))
+
+    def close(self) -> None:
+        """Release pooled connections. No-op for providers without them."""
+
     @abstractmethod
     def is_available(self) -> bool:
         """
@@ -54,6 +187,24 @@ class AIProvider(ABC):
         Returns:
             Generated YAML policy as string
         """
+        prompt, system_prompt = self._policy_yaml_prompt(description)
+        return self.generate_completion(prompt, system_prompt=system_prompt, temperature=0.5)
+
+    def stream_policy_yaml(self, description: str) -> Iterator[str]:
+        """
+        Stream policy YAML generated from natural language description.
+
+        Args:
+            description: Natural language description of network setup
+
+        Returns:
+            Iterator over chunks of the generated YAML policy
+        """
+        prompt, system_prompt = self._policy_yaml_prompt(description)
+        return self.stream_completion(prompt, system_prompt=system_prompt, temperature=0.5)
+
+    def _policy_yaml_prompt(self, description: str) -> Tuple[str, str]:
+        """Build the (prompt, system prompt) pair for policy generation."""
         system_prompt = """You are a network configuration expert. 
 Generate a valid YAML policy for a router configuration based on the user's description.
 Use the router-policy-to-config schema. Always use secret references (secret:key_name) for passwords.
@@ -88,8 +239,7 @@ lans:
 
 # Add more sections as needed (wifi, vpn, firewall, etc.)
 """
-
-        return self.generate_completion(prompt, system_prompt=system_prompt, temperature=0.5)
+        return prompt, system_prompt
 
     def generate_test_cases(self, policy_summary: str, vendor: str) -> List[Dict[str, Any]]:
         """
@@ -102,6 +252,27 @@ lans:
         Returns:
             List of test case specifications
         """
+        prompt, system_prompt = self._test_cases_prompt(policy_summary, vendor)
+        response = self.generate_completion(prompt, system_prompt=system_prompt, temperature=0.3)
+        return self._parse_test_cases(response)
+
+    async def agenerate_test_cases(self, policy_summary: str, vendor: str) -> List[Dict[str, Any]]:
+        """
+        Async variant of generate_test_cases().
+
+        Args:
+            policy_summary: Summary of the policy configuration
+            vendor: Target vendor (routeros or openwrt)
+
+        Returns:
+            List of test case specifications
+        """
+        prompt, system_prompt = self._test_cases_prompt(policy_summary, vendor)
+        response = await self.agenerate_completion(prompt, system_prompt=system_prompt, temperature=0.3)
+        return self._parse_test_cases(response)
+
+    def _test_cases_prompt(self, policy_summary: str, vendor: str) -> Tuple[str, str]:
+        """Build the (prompt, system prompt) pair for test case generation."""
         system_prompt = """You are a network testing expert.
 Generate test case specifications for validating router configurations.
 Focus on connectivity, firewall rules, isolation, and security."""
@@ -123,12 +294,13 @@ Return a JSON array of test cases with this structure:
 
 Include tests for: connectivity, firewall rules, guest isolation, VPN access.
 """
+        return prompt, system_prompt
 
-        response = self.generate_completion(prompt, system_prompt=system_prompt, temperature=0.3)
-        
-        # Parse JSON response (basic implementation)
+    @staticmethod
+    def _parse_test_cases(response: str) -> List[Dict[str, Any]]:
+        """Parse a JSON array of test cases (basic implementation)."""
         try:
-            import json
-            return json.loads(response)
-        except:
+            test_cases = json.loads(response)
+        except ValueError:
             return []
+        return test_cases if isinstance(test_cases, list) else []
@@ -0,0 +1,333 @@
+"""
+Caching AI provider.
+
+Wraps any AIProvider and reuses responses for identical requests. Entries
+are keyed by provider name, model, temperature, max_tokens, system prompt
+and a hash of the prompt. Lookups go to an in-memory LRU first and then
+to an optional on-disk SQLite store shared between runs.
+
+Only successful completions are cached; provider errors propagate and are
+retried on the next call.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+from router_policy_to_config.ai_providers.base import AIProvider
+
+DEFAULT_MAX_ENTRIES = 256
+SQLITE_FILENAME = "ai-responses.sqlite3"
+
+
+def compute_prompt_key(
+    provider_name: str,
+    prompt: str,
+    system_prompt: Optional[str],
+    temperature: float,
+    max_tokens: int,
+) -> str:
+    """
+    Compute the cache key of a completion request.
+
+    Args:
+        provider_name: Provider identity (class and model)
+        prompt: User prompt
+        system_prompt: Optional system prompt
+        temperature: Sampling temperature
+        max_tokens: Maximum tokens in response
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    payload = {
+        "provider": provider_name,
+        "system_prompt": system_prompt or "",
+        "prompt_sha256": hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters of a CachingProvider."""
+
+    memory_hits: int = 0
+    store_hits: int = 0
+    misses: int = 0
+
+    @property
+    def hits(self) -> int:
+        """Total hits across both tiers."""
+        return self.memory_hits + self.store_hits
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ResponseCache(ABC):
+    """Storage backend for cached completions."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached response, or None on a miss or expired entry."""
+
+    @abstractmethod
+    def put(self, key: str, response: str) -> None:
+        """Store a response."""
+
+    @abstractmethod
+    def clear(self) -> int:
+        """Remove all entries and return how many were removed."""
+
+
+class MemoryCache(ResponseCache):
+    """Thread-safe in-memory LRU cache with optional TTL."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: Optional[float] = None):
+        """
+        Initialize memory cache.
+
+        Args:
+            max_entries: Maximum number of entries kept
+            ttl: Entry lifetime in seconds. If None, entries never expire.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            created, response = entry
+            if self.ttl is not None and time.time() - created > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return response
+
+    def put(self, key: str, response: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> int:
+        with self._lock:
+            removed = len(self._entries)
+            self._entries.clear()
+            return removed
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache(ResponseCache):
+    """On-disk response store in a single SQLite file, with optional TTL."""
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None):
+        """
+        Initialize SQLite store.
+
+        Args:
+            path: Database file. If None, uses ai-responses.sqlite3 in the render cache directory.
+            ttl: Entry lifetime in seconds. If None, entries never expire.
+        """
+        if path is None:
+            from router_policy_to_config.render_cache import default_cache_dir
+
+            path = str(default_cache_dir() / SQLITE_FILENAME)
+        self.path = Path(path)
+        self.ttl = ttl
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Database connection, created on first use."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, response TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self.conn.execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            response, created = row
+            if self.ttl is not None and time.time() - created > self.ttl:
+                with self.conn:
+                    self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            return response
+
+    def put(self, key: str, response: str) -> None:
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created) VALUES (?, ?, ?)",
+                (key, response, time.time()),
+            )
+
+    def clear(self) -> int:
+        with self._lock, self.conn:
+            return self.conn.execute("DELETE FROM responses").rowcount
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class CachingProvider(AIProvider):
+    """AI provider that serves repeated requests from a cache."""
+
+    def __init__(
+        self,
+        provider: AIProvider,
+        memory: Optional[MemoryCache] = None,
+        store: Optional[ResponseCache] = None,
+    ):
+        """
+        Initialize caching provider.
+
+        Args:
+            provider: Provider answering cache misses
+            memory: In-memory LRU. If None, a MemoryCache with default size is used.
+            store: Optional persistent store (e.g. SQLiteCache) consulted after the LRU
+        """
+        self.provider = provider
+        self.memory = memory if memory is not None else MemoryCache()
+        self.store = store
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+    @property
+    def provider_name(self) -> str:
+        """Identity of the wrapped provider used in cache keys."""
+        name = type(self.provider).__name__
+        model = getattr(self.provider, "model", None)
+        return f"{name}:{model}" if model else name
+
+    def _lookup(self, key: str) -> Optional[str]:
+        """Look up a key in the LRU, then in the store, and count the result."""
+        response = self.memory.get(key)
+        if response is not None:
+            with self._lock:
+                self.stats.memory_hits += 1
+            return response
+
+        if self.store is not None:
+            response = self.store.get(key)
+            if response is not None:
+                self.memory.put(key, response)
+                with self._lock:
+                    self.stats.store_hits += 1
+                return response
+
+        with self._lock:
+            self.stats.misses += 1
+        return None
+
+    def _save(self, key: str, response: str) -> None:
+        """Store a fresh response in both tiers."""
+        self.memory.put(key, response)
+        if self.store is not None:
+            self.store.put(key, response)
+
+    def generate_completion(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000
+    ) -> str:
+        """
+        Return a cached completion or ask the wrapped provider.
+
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            temperature: Sampling temperature (0.0-1.0)
+            max_tokens: Maximum tokens in response
+
+        Returns:
+            Generated text completion
+        """
+        key = compute_prompt_key(self.provider_name, prompt, system_prompt, temperature, max_tokens)
+        response = self._lookup(key)
+        if response is None:
+            response = self.provider.generate_completion(prompt, system_prompt, temperature, max_tokens)
+            self._save(key, response)
+        return response
+
+    def stream_completion(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000
+    ) -> Iterator[str]:
+        """Stream a cached completion at once, or stream from the wrapped provider and cache the full text."""
+        key = compute_prompt_key(self.provider_name, prompt, system_prompt, temperature, max_tokens)
+        response = self._lookup(key)
+        if response is not None:
+            yield response
+            return
+
+        chunks = []
+        for chunk in self.provider.stream_completion(prompt, system_prompt, temperature, max_tokens):
+            chunks.append(chunk)
+            yield chunk
+        # Only reached when the stream was consumed to the end
+        self._save(key, "".join(chunks))
+
+    async def agenerate_completion(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000
+    ) -> str:
+        """Async variant of generate_completion() using the wrapped provider's async API."""
+        key = compute_prompt_key(self.provider_name, prompt, system_prompt, temperature, max_tokens)
+        response = self._lookup(key)
+        if response is None:
+            response = await self.provider.agenerate_completion(prompt, system_prompt, temperature, max_tokens)
+            self._save(key, response)
+        return response
+
+    def is_available(self) -> bool:
+        """Available when the wrapped provider is."""
+        return self.provider.is_available()
+
+    def close(self) -> None:
+        """Close the wrapped provider and the persistent store."""
+        self.provider.close()
+        if isinstance(self.store, SQLiteCache):
+            self.store.close()
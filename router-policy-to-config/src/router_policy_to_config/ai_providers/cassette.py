@@ -0,0 +1,156 @@
+"""
+Record/replay AI provider.
+
+Replays AI responses from a cassette file so tests get realistic output
+without network access. Requests are looked up in a dict keyed by a hash
+of the normalized system prompt and prompt (whitespace collapsed), so a
+lookup is O(1) regardless of cassette size.
+
+Without a wrapped provider the cassette is replay-only and an unmatched
+prompt raises CassetteMissError. With a provider, misses are forwarded to
+it and the exchange is recorded.
+
+Cassette format (JSON)::
+
+    {"version": 1, "interactions": {"<sha256>": {"prompt": "<preview>", "response": "..."}}}
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from router_policy_to_config.ai_providers.base import AIProvider
+
+CASSETTE_VERSION = 1
+PREVIEW_CHARS = 120  # Prompt prefix kept in the cassette for readability and error messages
+
+
+class CassetteMissError(LookupError):
+    """Raised when a replay-only cassette has no response for a prompt."""
+
+
+def normalize_prompt(text: Optional[str]) -> str:
+    """Collapse whitespace so formatting-only prompt changes still match."""
+    return " ".join((text or "").split())
+
+
+def compute_cassette_key(prompt: str, system_prompt: Optional[str] = None) -> str:
+    """
+    Compute the cassette key of a request.
+
+    Args:
+        prompt: User prompt
+        system_prompt: Optional system prompt
+
+    Returns:
+        Hex SHA-256 digest of the normalized prompts
+    """
+    payload = normalize_prompt(system_prompt) + "\0" + normalize_prompt(prompt)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CassetteProvider(AIProvider):
+    """AI provider replaying (and optionally recording) responses from a cassette file."""
+
+    def __init__(self, path: str, provider: Optional[AIProvider] = None):
+        """
+        Initialize cassette provider.
+
+        Args:
+            path: Cassette file. Created on the first recording if missing.
+            provider: Provider to record from on misses. If None, replay only.
+        """
+        self.path = Path(path)
+        self.provider = provider
+        self.recorded = 0
+        self._interactions: Optional[Dict[str, Dict[str, str]]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def recording(self) -> bool:
+        """Whether misses are recorded from a real provider."""
+        return self.provider is not None
+
+    @property
+    def interactions(self) -> Dict[str, Dict[str, str]]:
+        """Recorded interactions by key, loaded on first use."""
+        if self._interactions is None:
+            if self.path.exists():
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") != CASSETTE_VERSION:
+                    raise ValueError(f"Unsupported cassette version in {self.path}: {data.get('version')}")
+                self._interactions = data["interactions"]
+            elif self.recording:
+                self._interactions = {}
+            else:
+                raise FileNotFoundError(f"Cassette not found: {self.path} (record it with a real provider first)")
+        return self._interactions
+
+    def save(self) -> None:
+        """Atomically write the cassette file."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": CASSETTE_VERSION, "interactions": dict(sorted(self.interactions.items()))}
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=1)
+                f.write("\n")
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def generate_completion(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000
+    ) -> str:
+        """
+        Replay the recorded response for a prompt, recording it first if needed.
+
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            temperature: Sampling temperature (passed to the provider when recording)
+            max_tokens: Maximum tokens (passed to the provider when recording)
+
+        Returns:
+            Recorded text completion
+
+        Raises:
+            CassetteMissError: If the prompt is not in a replay-only cassette
+        """
+        key = compute_cassette_key(prompt, system_prompt)
+        with self._lock:
+            interaction = self.interactions.get(key)
+        if interaction is not None:
+            return interaction["response"]
+
+        if not self.recording:
+            raise CassetteMissError(
+                f"No recorded response in {self.path} for prompt: {normalize_prompt(prompt)[:PREVIEW_CHARS]!r}"
+            )
+
+        response = self.provider.generate_completion(prompt, system_prompt, temperature, max_tokens)
+        with self._lock:
+            self.interactions[key] = {"prompt": normalize_prompt(prompt)[:PREVIEW_CHARS], "response": response}
+            self.recorded += 1
+            self.save()
+        return response
+
+    def is_available(self) -> bool:
+        """Replay is always available; recording needs an available provider."""
+        return self.provider.is_available() if self.recording else True
+
+    def close(self) -> None:
+        """Close the recording provider."""
+        if self.provider is not None:
+            self.provider.close()
@@ -4,7 +4,7 @@ Mock AI provider for testing.
 Returns deterministic responses for testing without actual AI API calls.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 from router_policy_to_config.ai_providers.base import AIProvider
 
@@ -45,6 +45,16 @@ class MockProvider(AIProvider):
         else:
             return "Mock AI response for testing purposes."
 
+    def stream_completion(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000
+    ) -> Iterator[str]:
+        """Stream the mock completion line by line."""
+        yield from self.generate_completion(prompt, system_prompt, temperature, max_tokens).splitlines(keepends=True)
+
     def is_available(self) -> bool:
         """Mock provider is always available."""
         return True
@@ -0,0 +1,194 @@
+"""
+OpenAI-compatible HTTP provider.
+
+Talks to any ``/chat/completions`` endpoint (OpenAI, self-hosted vLLM or
+Ollama, API gateways). All calls share one requests.Session with a
+bounded connection pool, so batch and fleet runs reuse TCP/TLS
+connections instead of opening one per request. Streaming uses the
+server-sent events variant of the same endpoint.
+"""
+
+import json
+import os
+import threading
+from typing import Any, Dict, Iterator, List, Optional
+
+from router_policy_to_config.ai_providers.base import DEFAULT_CONCURRENCY, AIProvider
+
+DEFAULT_BASE_URL = "https://api.openai.com/v1"
+DEFAULT_MODEL = "gpt-4o-mini"
+
+
+class OpenAICompatibleProvider(AIProvider):
+    """AI provider for OpenAI-compatible chat completion APIs."""
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        model: Optional[str] = None,
+        api_key: Optional[str] = None,
+        timeout: float = 60.0,
+        pool_size: int = DEFAULT_CONCURRENCY,
+    ):
+        """
+        Initialize provider.
+
+        Settings not passed explicitly are read from ROUTER_POLICY_AI_BASE_URL,
+        ROUTER_POLICY_AI_MODEL and ROUTER_POLICY_AI_API_KEY.
+
+        Args:
+            base_url: API base URL (e.g. http://localhost:8000/v1)
+            model: Model name
+            api_key: API key. Never hard-code it; use the environment variable.
+            timeout: Request timeout in seconds
+            pool_size: Maximum pooled connections (calls beyond it wait for a free connection)
+        """
+        self.base_url = (base_url or os.environ.get("ROUTER_POLICY_AI_BASE_URL") or DEFAULT_BASE_URL).rstrip("/")
+        self.model = model or os.environ.get("ROUTER_POLICY_AI_MODEL") or DEFAULT_MODEL
+        self.api_key = api_key if api_key is not None else os.environ.get("ROUTER_POLICY_AI_API_KEY")
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        """Shared HTTP session, created on first use."""
+        with self._lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, pool_block=True)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                if self.api_key:
+                    session.headers["Authorization"] = f"Bearer {self.api_key}"
+                self._session = session
+            return self._session
+
+    def _payload(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: float,
+        max_tokens: int,
+    ) -> Dict[str, Any]:
+        """Build the chat completion request body."""
+        messages: List[Dict[str, str]] = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+
+        return {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+
+    def generate_completion(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000
+    ) -> str:
+        """
+        Generate a completion via the chat completions endpoint.
+
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            temperature: Sampling temperature (0.0-1.0)
+            max_tokens: Maximum tokens in response
+
+        Returns:
+            Generated text completion
+
+        Raises:
+            RuntimeError: If the request fails or the response has an unexpected shape
+        """
+        url = f"{self.base_url}/chat/completions"
+        payload = self._payload(prompt, system_prompt, temperature, max_tokens)
+
+        try:
+            response = self.session.post(url, json=payload, timeout=self.timeout)
+            response.raise_for_status()
+            data = response.json()
+        except Exception as e:
+            raise RuntimeError(f"AI request to {url} failed: {e}") from e
+
+        try:
+            return data["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError) as e:
+            raise RuntimeError(f"Unexpected AI response from {url}: missing {e}") from e
+
+    def stream_completion(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000
+    ) -> Iterator[str]:
+        """
+        Stream a completion via server-sent events.
+
+        Closing the iterator early closes the HTTP response, which stops the
+        server from generating the remaining tokens.
+
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            temperature: Sampling temperature (0.0-1.0)
+            max_tokens: Maximum tokens in response
+
+        Yields:
+            Text chunks as they arrive
+
+        Raises:
+            RuntimeError: If the request fails or an event has an unexpected shape
+        """
+        url = f"{self.base_url}/chat/completions"
+        payload = self._payload(prompt, system_prompt, temperature, max_tokens)
+        payload["stream"] = True
+
+        try:
+            response = self.session.post(url, json=payload, timeout=self.timeout, stream=True)
+            response.raise_for_status()
+        except Exception as e:
+            raise RuntimeError(f"AI request to {url} failed: {e}") from e
+
+        with response:
+            # Decode explicitly: text/event-stream without a charset would default to ISO-8859-1
+            for raw_line in response.iter_lines():
+                line = raw_line.decode("utf-8")
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                try:
+                    content = json.loads(data)["choices"][0].get("delta", {}).get("content")
+                except (ValueError, KeyError, IndexError, TypeError, AttributeError) as e:
+                    raise RuntimeError(f"Unexpected AI stream event from {url}: {data[:200]}") from e
+                if content:
+                    yield content
+
+    def is_available(self) -> bool:
+        """Available with an API key, or when pointed at a custom (e.g. local) endpoint."""
+        return bool(self.api_key) or self.base_url != DEFAULT_BASE_URL
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def __enter__(self) -> "OpenAICompatibleProvider":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -1,6 +1,145 @@
 """Vendor-specific configuration backends."""
 
-from router_policy_to_config.backends.routeros_backend import RouterOSBackend
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+from router_policy_to_config.backends.firewall_compaction import CompactionResult
 from router_policy_to_config.backends.openwrt_backend import OpenWrtBackend
+from router_policy_to_config.backends.routeros_backend import RouterOSBackend
+from router_policy_to_config.model import Policy
+from router_policy_to_config.render_cache import RenderCache, compute_cache_key
+
+SUPPORTED_VENDORS = ("routeros", "openwrt")
+
+
+def _backend_options(vendor: str, optimize: bool) -> Optional[Dict[str, bool]]:
+    """Backend options that change the output, for the render cache key."""
+    return {"optimize": True} if optimize and vendor == "routeros" else None
+
+
+def _report_compaction(
+    backend: RouterOSBackend, on_compaction: Optional[Callable[[CompactionResult], None]]
+) -> None:
+    """Pass the compaction done while rendering to the caller."""
+    if on_compaction is not None and backend.compaction is not None:
+        on_compaction(backend.compaction)
+
+
+def render_policy(
+    policy: Policy,
+    vendor: Optional[str] = None,
+    cache: Optional[RenderCache] = None,
+    optimize: bool = False,
+    on_compaction: Optional[Callable[[CompactionResult], None]] = None,
+) -> Union[str, Dict[str, str]]:
+    """
+    Render a policy with the backend matching its target vendor.
+
+    Args:
+        policy: Policy instance to render
+        vendor: Optional vendor override (routeros/openwrt)
+        cache: Optional render cache; on a hit the backend is not run
+        optimize: Compact RouterOS firewall rules (see RouterOSBackend)
+        on_compaction: Called with the compaction result when the RouterOS backend ran with optimize
+
+    Returns:
+        RouterOS script as string, or dict of OpenWrt config name -> content
+
+    Raises:
+        ValueError: If the vendor is not supported
+    """
+    vendor = vendor or policy.meta.target.vendor
+
+    if vendor not in SUPPORTED_VENDORS:
+        raise ValueError(f"Unknown vendor: {vendor}")
+
+    key = None
+    if cache is not None:
+        key = compute_cache_key(policy, vendor, _backend_options(vendor, optimize))
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    if vendor == "routeros":
+        backend = RouterOSBackend(policy, optimize=optimize)
+        output = backend.generate()
+        _report_compaction(backend, on_compaction)
+    else:
+        output = OpenWrtBackend(policy).generate()
+
+    if cache is not None:
+        cache.put(key, output)
+
+    return output
+
+
+def render_to_path(
+    policy: Policy,
+    output: Union[str, Path],
+    vendor: Optional[str] = None,
+    cache: Optional[RenderCache] = None,
+    optimize: bool = False,
+    on_compaction: Optional[Callable[[CompactionResult], None]] = None,
+) -> List[str]:
+    """
+    Render a policy straight to disk.
+
+    RouterOS scripts are streamed line by line into a temporary file next
+    to the output (and copied file-to-file from/to the cache), so the full
+    script is never held in memory; the file is renamed into place only
+    once rendering succeeded. OpenWrt configs are written into the output directory.
+
+    Args:
+        policy: Policy instance to render
+        output: Output file (RouterOS) or directory (OpenWrt)
+        vendor: Optional vendor override (routeros/openwrt)
+        cache: Optional render cache
+        optimize: Compact RouterOS firewall rules (see RouterOSBackend)
+        on_compaction: Called with the compaction result when the RouterOS backend ran with optimize
+
+    Returns:
+        List of written file paths
+
+    Raises:
+        ValueError: If the vendor is not supported
+    """
+    vendor = vendor or policy.meta.target.vendor
+    output = Path(output)
+
+    if vendor == "routeros":
+        output.parent.mkdir(parents=True, exist_ok=True)
+        key = compute_cache_key(policy, vendor, _backend_options(vendor, optimize)) if cache is not None else None
+
+        # Streamed to a temporary file and renamed, so a failed render never leaves a partial script
+        fd, tmp_path = tempfile.mkstemp(dir=output.parent, prefix=f".{output.name}.", suffix=".tmp")
+        os.close(fd)
+        try:
+            if cache is None or not cache.copy_to(key, Path(tmp_path)):
+                backend = RouterOSBackend(policy, optimize=optimize)
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    backend.write(f)
+                _report_compaction(backend, on_compaction)
+                if cache is not None:
+                    cache.put_file(key, Path(tmp_path))
+            os.replace(tmp_path, output)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        return [str(output)]
+
+    configs = render_policy(policy, vendor, cache, optimize=optimize, on_compaction=on_compaction)
+    output.mkdir(parents=True, exist_ok=True)
+
+    written = []
+    for filename, content in configs.items():
+        file_path = output / filename
+        file_path.write_text(content, encoding="utf-8")
+        written.append(str(file_path))
+
+    return written
+
 
-__all__ = ["RouterOSBackend", "OpenWrtBackend"]
+__all__ = ["RouterOSBackend", "OpenWrtBackend", "SUPPORTED_VENDORS", "render_policy", "render_to_path"]
@@ -0,0 +1,209 @@
+"""
+Firewall rule compaction.
+
+Policies with many near-identical rules (same action and zones, different
+ports or hosts) render to long filter chains that the router walks for
+every new connection. This module merges compatible rules into port lists
+and named address sets: ``/ip firewall address-list`` entries on RouterOS
+and ``config ipset`` (nftables named sets) on OpenWrt firewall4.
+
+Only rules with the same action inside one contiguous run of that action
+are merged. Reordering rules that share an action never changes which
+action a packet gets, so first-match semantics are preserved.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# RouterOS accepts at most 15 ports (or ranges) in one dst-port list
+MAX_PORTS = 15
+
+# Property merged by each pass, and the set property replacing it (None: join values in place)
+MergePasses = Tuple[Tuple[str, Optional[str]], ...]
+
+ROUTEROS_PASSES: MergePasses = (
+    ("dst-port", None),
+    ("dst-address", "dst-address-list"),
+    ("src-address", "src-address-list"),
+)
+
+# firewall4 rules take one ipset each; the src_ip pass skips rules that already have one
+FIREWALL4_PASSES: MergePasses = (
+    ("dest_port", None),
+    ("dest_ip", "ipset"),
+    ("src_ip", "ipset"),
+)
+
+
+@dataclass
+class FilterRule:
+    """One /ip firewall filter entry generated from one or more policy rules."""
+
+    props: Dict[str, str]  # Matchers in output order (chain, interfaces, protocol, addresses, ports)
+    action: str
+    comment: str
+    names: List[str] = field(default_factory=list)  # Policy rules merged into this entry
+
+    def command(self) -> str:
+        """Render the rule as a RouterOS command."""
+        parts = ["/ip firewall filter add"]
+        parts.extend(f"{key}={value}" for key, value in self.props.items())
+        parts.append(f"action={self.action}")
+        parts.append(f"comment=\"{self.comment}\"")
+        return " ".join(parts)
+
+
+@dataclass
+class CompactionResult:
+    """Compacted filter rules and the address-lists they reference."""
+
+    rules: List[FilterRule]
+    address_lists: Dict[str, List[str]]  # List/set name -> addresses
+    before: int
+    after: int
+    list_sources: Dict[str, str] = field(default_factory=dict)  # List/set name -> property it replaced
+
+    def get_summary(self) -> str:
+        """
+        Get human-readable summary of the compaction.
+
+        Returns:
+            One-line summary with before/after rule counts
+        """
+        return (
+            f"Firewall rules: {self.before} -> {self.after} "
+            f"({len(self.address_lists)} address set(s))"
+        )
+
+
+def _values(value: str) -> List[str]:
+    """Split a merged value ("22,80" or "22 80") into its entries."""
+    return value.replace(",", " ").split()
+
+
+def _merge_key(rule: FilterRule, prop: str) -> Tuple:
+    """Everything except the merged property must be equal for rules to merge."""
+    return tuple((key, value) for key, value in rule.props.items() if key != prop)
+
+
+def _merged_comment(rules: List[FilterRule]) -> str:
+    """Comment of a merged rule: the first comment plus the number of merged rules."""
+    if len(rules) == 1:
+        return rules[0].comment
+    return f"{rules[0].comment} (+{len(rules) - 1} merged)"
+
+
+class _Compactor:
+    """Runs the merge passes and allocates address-list names."""
+
+    def __init__(self, max_ports: Optional[int], separator: str):
+        self.max_ports = max_ports
+        self.separator = separator
+        self.address_lists: Dict[str, List[str]] = {}
+        self.list_sources: Dict[str, str] = {}
+
+    def _list_name(self, rules: List[FilterRule], prop: str) -> str:
+        """Unique address-list name derived from the first merged policy rule."""
+        base = f"{rules[0].names[0]}-{prop.replace('_', '-').split('-')[0]}"
+        name, suffix = base, 2
+        while name in self.address_lists:
+            name = f"{base}-{suffix}"
+            suffix += 1
+        return name
+
+    def _chunks(self, group: List[FilterRule], prop: str, list_prop: Optional[str]) -> List[List[FilterRule]]:
+        """Split a group so port lists stay within max_ports."""
+        if list_prop or self.max_ports is None or len(group) == 1:
+            return [group]
+
+        chunks: List[List[FilterRule]] = []
+        ports = 0
+        for rule in group:
+            count = len(_values(rule.props[prop]))
+            if not chunks or ports + count > self.max_ports:
+                chunks.append([])
+                ports = 0
+            chunks[-1].append(rule)
+            ports += count
+        return chunks
+
+    def _merge(self, rules: List[FilterRule], prop: str, list_prop: Optional[str]) -> FilterRule:
+        """Merge rules that differ only in prop into one rule."""
+        first = rules[0]
+        if len(rules) == 1:
+            return first
+
+        values = list(dict.fromkeys(value for rule in rules for value in _values(rule.props[prop])))
+        if list_prop:
+            name = self._list_name(rules, prop)
+            self.address_lists[name] = values
+            self.list_sources[name] = prop
+            props = {(list_prop if key == prop else key): (name if key == prop else value)
+                     for key, value in first.props.items()}
+        else:
+            props = {key: (self.separator.join(values) if key == prop else value) for key, value in first.props.items()}
+
+        names = [name for rule in rules for name in rule.names]
+        return FilterRule(props=props, action=first.action, comment=_merged_comment(rules), names=names)
+
+    def run_pass(self, rules: List[FilterRule], prop: str, list_prop: Optional[str]) -> List[FilterRule]:
+        """Merge rules on one property within each run of equal actions."""
+        result: List[FilterRule] = []
+        start = 0
+
+        while start < len(rules):
+            end = start
+            while end < len(rules) and rules[end].action == rules[start].action:
+                end += 1
+
+            # Group by everything but prop; a group sits at its first rule's position
+            groups: Dict[Tuple, List[FilterRule]] = {}
+            for index, rule in enumerate(rules[start:end]):
+                mergeable = prop in rule.props and list_prop not in rule.props
+                key = _merge_key(rule, prop) if mergeable else ("#", index)
+                groups.setdefault(key, []).append(rule)
+
+            for group in groups.values():
+                for chunk in self._chunks(group, prop, list_prop):
+                    result.append(self._merge(chunk, prop, list_prop))
+
+            start = end
+
+        return result
+
+
+def compact_filter_rules(
+    rules: List[FilterRule],
+    max_ports: Optional[int] = MAX_PORTS,
+    passes: MergePasses = ROUTEROS_PASSES,
+    separator: str = ",",
+) -> CompactionResult:
+    """
+    Merge compatible filter rules.
+
+    Rules are first merged on the destination port, then on destination
+    and source addresses (into address-lists/sets), so a block of
+    host x port rules collapses into a single rule.
+
+    Args:
+        rules: Filter rules in policy order
+        max_ports: Maximum ports per port list (None for no limit)
+        passes: Properties to merge, in order (ROUTEROS_PASSES or FIREWALL4_PASSES)
+        separator: Separator of merged port lists
+
+    Returns:
+        CompactionResult with the rules to emit and their address-lists
+    """
+    compactor = _Compactor(max_ports, separator)
+    compacted = list(rules)
+
+    for prop, list_prop in passes:
+        compacted = compactor.run_pass(compacted, prop, list_prop)
+
+    return CompactionResult(
+        rules=compacted,
+        address_lists=compactor.address_lists,
+        before=len(rules),
+        after=len(compacted),
+        list_sources=compactor.list_sources,
+    )
@@ -5,22 +5,35 @@ Generates UCI configuration files for /etc/config/.
 """
 
 import ipaddress
-from typing import Dict, List
+from typing import Dict, List, Optional
 
-from router_policy_to_config.model import Policy
+from router_policy_to_config.backends.firewall_compaction import (
+    FIREWALL4_PASSES,
+    CompactionResult,
+    FilterRule,
+    compact_filter_rules,
+)
+from router_policy_to_config.model import FirewallRule, Policy
+from router_policy_to_config.network_index import NetworkIndex
+
+# First OpenWrt release using firewall4 (nftables)
+FIREWALL4_MIN_VERSION = 22
 
 
 class OpenWrtBackend:
     """Generate OpenWrt UCI configuration from policy."""
 
-    def __init__(self, policy: Policy):
+    def __init__(self, policy: Policy, firewall4: Optional[bool] = None):
         """
         Initialize OpenWrt backend.
 
         Args:
             policy: Policy instance to convert
+            firewall4: Emit firewall4 named sets. If None, enabled for target version 22.03 and later.
         """
         self.policy = policy
+        self.firewall4 = self._uses_firewall4(policy) if firewall4 is None else firewall4
+        self.compaction: Optional[CompactionResult] = None  # Set by firewall generation in firewall4 mode
         self.configs: Dict[str, List[str]] = {
             "network": [],
             "wireless": [],
@@ -36,6 +49,56 @@ class OpenWrtBackend:
         """Add a blank line."""
         self.configs[config].append("")
 
+    @staticmethod
+    def _uses_firewall4(policy: Policy) -> bool:
+        """Whether the target OpenWrt release uses firewall4 (22.03+)."""
+        version = policy.meta.target.version
+        if not version:
+            return False
+        try:
+            return int(version.lstrip("v").split(".")[0]) >= FIREWALL4_MIN_VERSION
+        except ValueError:
+            return False
+
+    def _rule_options(self, rule: FirewallRule) -> FilterRule:
+        """Build the UCI options of a firewall rule (without name and target)."""
+        options = {}
+
+        if rule.from_zones:
+            options["src"] = rule.from_zones[0].replace("main", "lan")
+
+        if rule.to_zones:
+            options["dest"] = rule.to_zones[0].replace("main", "lan")
+
+        if rule.protocol:
+            options["proto"] = rule.protocol
+
+        if rule.src_ip:
+            options["src_ip"] = rule.src_ip
+
+        if rule.dest_ip:
+            options["dest_ip"] = rule.dest_ip
+
+        if rule.port:
+            options["dest_port"] = str(rule.port)
+
+        return FilterRule(props=options, action=rule.action.upper(), comment=rule.name, names=[rule.name])
+
+    def _generate_ipsets(self, config: str, compaction: CompactionResult) -> None:
+        """Generate firewall4 'config ipset' sections (nftables named sets)."""
+        for name, entries in compaction.address_lists.items():
+            direction = compaction.list_sources[name].split("_")[0]  # src_ip -> src, dest_ip -> dest
+            # Networks need an interval set; plain hosts use a hash set
+            kind = "net" if any("/" in entry for entry in entries) else "ip"
+
+            self._add_line(config, "config ipset")
+            self._add_line(config, f"\toption name '{name}'")
+            self._add_line(config, "\toption family 'ipv4'")
+            self._add_line(config, f"\tlist match '{direction}_{kind}'")
+            for entry in entries:
+                self._add_line(config, f"\tlist entry '{entry}'")
+            self._add_blank(config)
+
     def _generate_network(self) -> None:
         """Generate /etc/config/network."""
         config = "network"
@@ -214,6 +277,12 @@ class OpenWrtBackend:
         self._add_line(config, "\toption output 'ACCEPT'")
         self._add_line(config, f"\toption forward '{default_policy}'")
         self._add_line(config, "\toption synflood_protect '1'")
+
+        performance = self.policy.performance
+        if performance and performance.fasttrack:
+            self._add_line(config, "\toption flow_offloading '1'")
+            if performance.hw_offload:
+                self._add_line(config, "\toption flow_offloading_hw '1'")
         self._add_blank(config)
 
         # WAN zone
@@ -269,39 +338,44 @@ class OpenWrtBackend:
             self._add_blank(config)
 
         # Custom firewall rules
-        if self.policy.firewall:
-            for rule in self.policy.firewall.rules:
-                self._add_line(config, "config rule")
-                self._add_line(config, f"\toption name '{rule.name}'")
+        rules = [self._rule_options(rule) for rule in self.policy.firewall.rules] if self.policy.firewall else []
 
-                if rule.from_zones:
-                    src = rule.from_zones[0].replace("main", "lan")
-                    self._add_line(config, f"\toption src '{src}'")
+        if self.firewall4 and rules:
+            # Merge ports into nft anonymous sets and addresses into named sets
+            self.compaction = compact_filter_rules(rules, max_ports=None, passes=FIREWALL4_PASSES, separator=" ")
+            rules = self.compaction.rules
+            self._add_line(config, f"# firewall4: {self.compaction.get_summary()}")
+            self._generate_ipsets(config, self.compaction)
 
-                if rule.to_zones:
-                    dest = rule.to_zones[0].replace("main", "lan")
-                    self._add_line(config, f"\toption dest '{dest}'")
+        for rule in rules:
+            self._add_line(config, "config rule")
+            self._add_line(config, f"\toption name '{rule.comment}'")
 
-                if rule.protocol:
-                    self._add_line(config, f"\toption proto '{rule.protocol}'")
+            for key, value in rule.props.items():
+                self._add_line(config, f"\toption {key} '{value}'")
 
-                if rule.port:
-                    self._add_line(config, f"\toption dest_port '{rule.port}'")
+            self._add_line(config, f"\toption target '{rule.action}'")
 
-                target = rule.action.upper()
-                self._add_line(config, f"\toption target '{target}'")
-
-                self._add_blank(config)
+            self._add_blank(config)
 
         # Port forwards
         if self.policy.nat and self.policy.nat.port_forwards:
+            lan_index = NetworkIndex.from_lans(self.policy.lans)
+
             for pf in self.policy.nat.port_forwards:
                 name = pf.name or f"forward_{pf.external_port}"
 
+                # Destination zone is the LAN that contains the internal host (zones are named after LANs)
+                try:
+                    dest = lan_index.lookup(pf.internal_ip)
+                except ValueError:
+                    dest = None
+                dest = dest or self.policy.lans[0].name
+
                 self._add_line(config, "config redirect")
                 self._add_line(config, f"\toption name '{name}'")
                 self._add_line(config, "\toption src 'wan'")
-                self._add_line(config, "\toption dest 'lan'")
+                self._add_line(config, f"\toption dest '{dest}'")
 
                 protocol = pf.protocol
                 if protocol == "both":
@@ -404,13 +478,26 @@ class OpenWrtBackend:
 
         return result
 
-    def generate_commands(self) -> List[str]:
+    def generate_commands(self, current_configs: Optional[Dict[str, str]] = None) -> List[str]:
         """
         Generate UCI commands to apply configuration.
 
+        Without current configs every file is rewritten and all services are
+        reloaded. With the device's current /etc/config contents, only a
+        uci batch of the changed sections, options and lists is produced,
+        and only the services of changed packages are reloaded.
+
+        Args:
+            current_configs: Optional dict of package name -> current config content
+
         Returns:
             List of UCI commands
         """
+        if current_configs is not None:
+            from router_policy_to_config.diff.openwrt_plan import OpenWrtPlanner
+
+            return OpenWrtPlanner(current_configs, self.generate()).plan().to_commands()
+
         commands = []
         configs = self.generate()
 
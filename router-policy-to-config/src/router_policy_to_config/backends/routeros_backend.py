@@ -5,24 +5,29 @@ Generates .rsc scripts compatible with RouterOS v6 and v7.
 """
 
 import ipaddress
-from typing import List
+from typing import Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
 
-from router_policy_to_config.model import Policy
+from router_policy_to_config.backends.firewall_compaction import CompactionResult, FilterRule, compact_filter_rules
+from router_policy_to_config.model import FirewallRule, Policy
 
 
 class RouterOSBackend:
     """Generate RouterOS configuration from policy."""
 
-    def __init__(self, policy: Policy):
+    def __init__(self, policy: Policy, optimize: bool = False):
         """
         Initialize RouterOS backend.
 
         Args:
             policy: Policy instance to convert
+            optimize: Merge compatible firewall rules into port lists and address-lists
         """
         self.policy = policy
-        self.commands: List[str] = []
+        self.optimize = optimize
+        self.compaction: Optional[CompactionResult] = None  # Set by firewall generation when optimizing
+        self.commands: List[str] = []  # Lines of the section being generated
         self.version = policy.meta.target.version or "v7"
+        self._flushed = 0  # Lines already yielded by iter_lines()
 
     def _add_comment(self, text: str) -> None:
         """Add a comment to the configuration."""
@@ -36,6 +41,22 @@ class RouterOSBackend:
         """Add a blank line for readability."""
         self.commands.append("")
 
+    def _line_count(self) -> int:
+        """Number of lines generated so far, including already streamed ones."""
+        return self._flushed + len(self.commands)
+
+    def _generate_header(self) -> None:
+        """Generate script header."""
+        self._add_comment("=" * 60)
+        self._add_comment(f"RouterOS Configuration for: {self.policy.meta.name}")
+        self._add_comment(f"Generated by router-policy-to-config")
+        self._add_comment(f"Target: RouterOS {self.version}")
+        self._add_comment("=" * 60)
+        self._add_blank()
+        self._add_comment("WARNING: Review this configuration before applying!")
+        self._add_comment("Make sure to back up your current configuration first.")
+        self._add_blank()
+
     def _generate_wan(self) -> None:
         """Generate WAN configuration."""
         self._add_comment(f"WAN Configuration ({self.policy.wan.type})")
@@ -189,11 +210,96 @@ class RouterOSBackend:
 
         self._add_blank()
 
+    @staticmethod
+    def _zone_list(zones: Sequence[str]) -> str:
+        """Name of the interface list matching any of the given zones."""
+        return "zone-" + "+".join(sorted(set(zones)))
+
+    def _zone_lists(self) -> Dict[str, Tuple[str, ...]]:
+        """
+        Get the interface lists used by firewall rules.
+
+        Every zone gets its own list, and every multi-zone match in a rule
+        gets a combined list, so each policy rule maps to one filter rule.
+
+        Returns:
+            Dict of list name -> zones whose interfaces are members
+        """
+        zones = ["wan"] + [lan.name for lan in self.policy.lans]
+        if self.policy.vpn:
+            zones.append("vpn")
+
+        lists = {self._zone_list([zone]): (zone,) for zone in zones}
+        if self.policy.firewall:
+            for rule in self.policy.firewall.rules:
+                for rule_zones in (rule.from_zones, rule.to_zones):
+                    if len(set(rule_zones)) > 1:
+                        lists.setdefault(self._zone_list(rule_zones), tuple(sorted(set(rule_zones))))
+        return lists
+
+    def _zone_interfaces(self, zone: str) -> List[str]:
+        """
+        Get the interfaces of a zone that exist before the firewall section.
+
+        VPN interfaces are created later and join their lists in the VPN section.
+        """
+        if zone == "wan":
+            return ["pppoe-out1" if self.policy.wan.type == "pppoe" else self.policy.wan.interface]
+        for lan in self.policy.lans:
+            if lan.name == zone:
+                return [f"vlan-{lan.name}" if lan.vlan_id else "bridge-lan"]
+        return []
+
+    def _generate_interface_lists(self) -> None:
+        """Generate /interface list entries for firewall zones."""
+        self._add_comment("Interface lists (firewall zones)")
+
+        for name, zones in self._zone_lists().items():
+            self._add_command(f"/interface list add name={name}")
+            for zone in zones:
+                for interface in self._zone_interfaces(zone):
+                    self._add_command(f"/interface list member add list={name} interface={interface}")
+
+        self._add_blank()
+
+    def _filter_rule(self, rule: FirewallRule) -> FilterRule:
+        """Build the forward-chain filter entry for a policy rule."""
+        props = {"chain": "forward"}
+
+        if rule.from_zones:
+            props["in-interface-list"] = self._zone_list(rule.from_zones)
+
+        if rule.to_zones:
+            props["out-interface-list"] = self._zone_list(rule.to_zones)
+
+        if rule.protocol:
+            props["protocol"] = rule.protocol
+
+        if rule.src_ip:
+            props["src-address"] = rule.src_ip
+
+        if rule.dest_ip:
+            props["dst-address"] = rule.dest_ip
+
+        if rule.port:
+            props["dst-port"] = str(rule.port)
+
+        return FilterRule(props=props, action=rule.action, comment=rule.comment or rule.name, names=[rule.name])
+
     def _generate_firewall(self) -> None:
         """Generate firewall configuration."""
         self._add_comment("Firewall Configuration")
 
-        wan_interface = "pppoe-out1" if self.policy.wan.type == "pppoe" else self.policy.wan.interface
+        rules = [self._filter_rule(rule) for rule in self.policy.firewall.rules] if self.policy.firewall else []
+
+        if self.optimize and rules:
+            self.compaction = compact_filter_rules(rules)
+            rules = self.compaction.rules
+            self._add_comment(f"Compacted: {self.compaction.get_summary()}")
+
+            for name, addresses in self.compaction.address_lists.items():
+                for address in addresses:
+                    self._add_command(f"/ip firewall address-list add list={name} address={address}")
 
         # Basic protection rules (RouterOS best practices)
         self._add_command(
@@ -229,6 +335,18 @@ class RouterOSBackend:
             "comment=\"Drop all other input\""
         )
 
+        # FastTrack established connections before the forward accept rule
+        performance = self.policy.performance
+        if performance and performance.fasttrack:
+            hw_offload = " hw-offload=yes" if performance.hw_offload and self.version != "v6" else ""
+            self._add_command(
+                "/ip firewall filter add "
+                "chain=forward "
+                "connection-state=established,related "
+                f"action=fasttrack-connection{hw_offload} "
+                "comment=\"FastTrack established/related\""
+            )
+
         # Forward chain - established/related
         self._add_command(
             "/ip firewall filter add "
@@ -247,52 +365,22 @@ class RouterOSBackend:
         )
 
         # Custom firewall rules
-        if self.policy.firewall:
-            for rule in self.policy.firewall.rules:
-                # Map zones to interfaces
-                from_intf = []
-                to_intf = []
-
-                for zone in rule.from_zones:
-                    if zone == "wan":
-                        from_intf.append(wan_interface)
-                    elif zone == "vpn":
-                        from_intf.append("wireguard1")
-                    else:
-                        # LAN zone
-                        from_intf.append("bridge-lan")
-
-                for zone in rule.to_zones:
-                    if zone == "wan":
-                        to_intf.append(wan_interface)
-                    elif zone == "vpn":
-                        to_intf.append("wireguard1")
-                    else:
-                        to_intf.append("bridge-lan")
-
-                # Build command
-                cmd_parts = ["/ip firewall filter add", "chain=forward"]
-
-                if from_intf:
-                    cmd_parts.append(f"in-interface={from_intf[0]}")
-
-                if to_intf:
-                    cmd_parts.append(f"out-interface={to_intf[0]}")
+        for rule in rules:
+            self._add_command(rule.command())
 
-                if rule.protocol:
-                    cmd_parts.append(f"protocol={rule.protocol}")
-
-                if rule.port:
-                    cmd_parts.append(f"dst-port={rule.port}")
-
-                cmd_parts.append(f"action={rule.action}")
-
-                if rule.comment:
-                    cmd_parts.append(f"comment=\"{rule.comment}\"")
-                else:
-                    cmd_parts.append(f"comment=\"{rule.name}\"")
-
-                self._add_command(" ".join(cmd_parts))
+        # LAN isolation, after custom rules so the policy can allow specific traffic
+        lan_names = {lan.name for lan in self.policy.lans}
+        for lan in self.policy.lans:
+            for isolated_name in lan.isolated_from:
+                if isolated_name in lan_names:
+                    self._add_command(
+                        "/ip firewall filter add "
+                        "chain=forward "
+                        f"in-interface-list={self._zone_list([lan.name])} "
+                        f"out-interface-list={self._zone_list([isolated_name])} "
+                        "action=drop "
+                        f"comment=\"Isolate {lan.name} from {isolated_name}\""
+                    )
 
         # Default drop for forward
         if not self.policy.firewall or self.policy.firewall.default_policy == "drop":
@@ -330,7 +418,7 @@ class RouterOSBackend:
                     )
 
             # Configure wireless interface (assuming wlan1 for first WiFi)
-            interface = f"wlan{len(self.commands)}"  # Simple approach
+            interface = f"wlan{self._line_count()}"  # Simple approach
             band_freq = "2ghz-b/g/n" if wifi.band == "2.4ghz" else "5ghz-a/n/ac"
 
             cmd_parts = [
@@ -380,6 +468,11 @@ class RouterOSBackend:
 
                 self._add_command(" ".join(cmd_parts))
 
+                # Join the vpn zone lists now that the interface exists
+                for list_name, zones in self._zone_lists().items():
+                    if "vpn" in zones:
+                        self._add_command(f"/interface list member add list={list_name} interface={interface_name}")
+
                 # Add IP address
                 if vpn.allowed_ips:
                     # Use first allowed IP as interface address
@@ -400,38 +493,63 @@ class RouterOSBackend:
 
                 self._add_blank()
 
-    def generate(self) -> str:
+    def _generate_footer(self) -> None:
+        """Generate script footer."""
+        self._add_comment("=" * 60)
+        self._add_comment("Configuration complete")
+        self._add_comment("Apply with: /import file=thisfile.rsc")
+        self._add_comment("=" * 60)
+
+    def iter_lines(self) -> Iterator[str]:
         """
-        Generate complete RouterOS configuration.
+        Generate RouterOS configuration line by line.
 
-        Returns:
-            RouterOS .rsc script as string
+        Only the section currently being generated is held in memory,
+        so very large policies can be streamed straight to a file.
+
+        Yields:
+            Script lines without trailing newlines
         """
         self.commands = []
+        self._flushed = 0
+
+        sections = [
+            self._generate_header,
+            self._generate_wan,
+            self._generate_lans,
+            self._generate_interface_lists,
+            self._generate_nat,
+            self._generate_firewall,
+            self._generate_wifi,
+            self._generate_vpn,
+            self._generate_footer,
+        ]
+
+        for generate_section in sections:
+            generate_section()
+            lines, self.commands = self.commands, []
+            self._flushed += len(lines)
+            yield from lines
+
+    def write(self, fp: TextIO) -> None:
+        """
+        Stream RouterOS configuration to a file object.
 
-        # Header
-        self._add_comment("=" * 60)
-        self._add_comment(f"RouterOS Configuration for: {self.policy.meta.name}")
-        self._add_comment(f"Generated by router-policy-to-config")
-        self._add_comment(f"Target: RouterOS {self.version}")
-        self._add_comment("=" * 60)
-        self._add_blank()
-        self._add_comment("WARNING: Review this configuration before applying!")
-        self._add_comment("Make sure to back up your current configuration first.")
-        self._add_blank()
+        Output is identical to generate().
 
-        # Generate sections
-        self._generate_wan()
-        self._generate_lans()
-        self._generate_nat()
-        self._generate_firewall()
-        self._generate_wifi()
-        self._generate_vpn()
+        Args:
+            fp: Text file object to write to
+        """
+        for index, line in enumerate(self.iter_lines()):
+            if index:
+                fp.write("\n")
+            fp.write(line)
 
-        # Footer
-        self._add_comment("=" * 60)
-        self._add_comment("Configuration complete")
-        self._add_comment("Apply with: /import file=thisfile.rsc")
-        self._add_comment("=" * 60)
+    def generate(self) -> str:
+        """
+        Generate complete RouterOS configuration.
 
-        return "\n".join(self.commands)
+        Returns:
+            RouterOS .rsc script as string
+        """
+        return "\n".join(self.iter_lines())
@@ -0,0 +1,211 @@
+"""
+Batch rendering module.
+
+Renders many policy files in one run. Each worker process keeps a single
+PolicyLoader (and its parsed schema) for all files it handles, and every
+file is rendered in isolation so one broken policy does not stop the fleet.
+"""
+
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from router_policy_to_config.backends import render_policy, render_to_path
+from router_policy_to_config.policy_loader import PolicyLoader
+from router_policy_to_config.policy_validator import PolicyValidator
+from router_policy_to_config.render_cache import RenderCache
+
+POLICY_SUFFIXES = (".yaml", ".yml")
+
+
+@dataclass
+class BatchItemResult:
+    """Result of rendering a single policy file."""
+
+    path: str
+    ok: bool
+    vendor: Optional[str] = None
+    outputs: List[str] = field(default_factory=list)  # Written file paths
+    error: Optional[str] = None
+    duration: float = 0.0
+
+
+@dataclass
+class BatchResult:
+    """Aggregated result of a batch render."""
+
+    items: List[BatchItemResult] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def succeeded(self) -> List[BatchItemResult]:
+        """Items rendered successfully."""
+        return [item for item in self.items if item.ok]
+
+    @property
+    def failed(self) -> List[BatchItemResult]:
+        """Items that failed to load, validate or render."""
+        return [item for item in self.items if not item.ok]
+
+    def get_summary(self) -> str:
+        """
+        Get human-readable summary of the batch run.
+
+        Returns:
+            Formatted string with counts and failed files
+        """
+        summary_lines = [
+            f"Rendered {len(self.succeeded)}/{len(self.items)} policies in {self.elapsed:.2f}s",
+        ]
+
+        if self.failed:
+            summary_lines.append(f"Failed: {len(self.failed)}")
+            for item in self.failed:
+                summary_lines.append(f"  ✗ {item.path}: {item.error}")
+
+        return "\n".join(summary_lines)
+
+
+def collect_policy_files(sources: Iterable[str]) -> List[Tuple[Path, Path]]:
+    """
+    Expand directories, files and glob patterns into policy files.
+
+    Args:
+        sources: Directories (searched recursively), files or glob patterns
+
+    Returns:
+        Sorted list of (policy_path, base_dir) tuples. base_dir is used to
+        mirror the source layout in the output directory.
+    """
+    found: Dict[Path, Path] = {}
+
+    for source in sources:
+        source_path = Path(source)
+
+        if source_path.is_dir():
+            for path in source_path.rglob("*"):
+                if path.suffix in POLICY_SUFFIXES and path.is_file():
+                    found.setdefault(path, source_path)
+        elif source_path.is_file():
+            found.setdefault(source_path, source_path.parent)
+        else:
+            matches = [Path(p) for p in glob.glob(source, recursive=True)]
+            files = [p for p in matches if p.suffix in POLICY_SUFFIXES and p.is_file()]
+            if files:
+                base = Path(os.path.commonpath([str(p.parent) for p in files]))
+                for path in files:
+                    found.setdefault(path, base)
+
+    return sorted(found.items())
+
+
+# Loader and render cache owned by the current worker process (set by _init_worker)
+_worker_loader: Optional[PolicyLoader] = None
+_worker_cache: Optional[RenderCache] = None
+
+
+def _init_worker(schema_path: Optional[str], use_cache: bool = False, cache_dir: Optional[str] = None) -> None:
+    """Create the per-process policy loader and render cache."""
+    global _worker_loader, _worker_cache
+    _worker_loader = PolicyLoader(schema_path=schema_path)
+    _worker_cache = RenderCache(cache_dir) if use_cache else None
+
+
+def _render_one(
+    path: str,
+    relative: str,
+    target: Optional[str],
+    output_dir: Optional[str],
+    semantic: bool,
+) -> BatchItemResult:
+    """Load, validate and render one policy file, capturing any error."""
+    start = time.perf_counter()
+    result = BatchItemResult(path=path, ok=False)
+
+    try:
+        policy = _worker_loader.load(path)
+
+        if semantic:
+            PolicyValidator(policy).validate()
+
+        if target:
+            policy.meta.target.vendor = target
+        result.vendor = policy.meta.target.vendor
+
+        if output_dir:
+            # RouterOS: <out>/<relative>.rsc, OpenWrt: <out>/<relative>/<config files>
+            suffix = ".rsc" if result.vendor == "routeros" else ""
+            destination = Path(output_dir) / Path(relative).with_suffix(suffix)
+            result.outputs = render_to_path(policy, destination, cache=_worker_cache)
+        else:
+            render_policy(policy, cache=_worker_cache)
+
+        result.ok = True
+    except Exception as e:
+        result.error = " ".join(str(e).split()) or type(e).__name__
+
+    result.duration = time.perf_counter() - start
+    return result
+
+
+def render_batch(
+    sources: Iterable[str],
+    target: Optional[str] = None,
+    output_dir: Optional[str] = None,
+    workers: Optional[int] = None,
+    schema_path: Optional[str] = None,
+    semantic: bool = True,
+    use_cache: bool = False,
+    cache_dir: Optional[str] = None,
+) -> BatchResult:
+    """
+    Render many policy files across a process pool.
+
+    Args:
+        sources: Directories, files or glob patterns of policy YAMLs
+        target: Optional vendor override for every policy
+        output_dir: Directory for rendered configs. If None, only render.
+        workers: Number of worker processes (default: CPU count, 1 = in-process)
+        schema_path: Optional path to policy schema file
+        semantic: Whether to run semantic validation before rendering
+        use_cache: Whether to reuse outputs from the on-disk render cache
+        cache_dir: Optional render cache directory
+
+    Returns:
+        BatchResult with per-file results in input order
+    """
+    start = time.perf_counter()
+    files = collect_policy_files(sources)
+    jobs = [(str(path), str(path.relative_to(base))) for path, base in files]
+
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, max(len(jobs), 1))
+
+    items: List[BatchItemResult] = []
+
+    if workers == 1:
+        _init_worker(schema_path, use_cache, cache_dir)
+        for path, relative in jobs:
+            items.append(_render_one(path, relative, target, output_dir, semantic))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(schema_path, use_cache, cache_dir),
+        ) as executor:
+            futures = [
+                executor.submit(_render_one, path, relative, target, output_dir, semantic)
+                for path, relative in jobs
+            ]
+            for (path, _), future in zip(jobs, futures):
+                try:
+                    items.append(future.result())
+                except Exception as e:
+                    # Worker process died - isolate the failure to this file
+                    items.append(BatchItemResult(path=path, ok=False, error=f"Worker failed: {e}"))
+
+    return BatchResult(items=items, elapsed=time.perf_counter() - start)
@@ -1,30 +1,39 @@
 """
 Command-line interface for router-policy-to-config.
 
-Provides subcommands for init, validate, render, diff, ai-suggest, and lab-test.
+Provides subcommands for init, validate, render, render-batch, watch, diff, plan, cache, ai-suggest, and lab-test.
+
+The CLI is invoked in tight loops (e.g. from Ansible), so only typer is
+imported at startup. Each subcommand imports the loader, backends, diff
+engines, AI helpers and rich renderables it needs in its own body.
 """
 
-import sys
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 import typer
-from rich.console import Console
-from rich.syntax import Syntax
-from rich.table import Table
 
 from router_policy_to_config import __version__
-from router_policy_to_config.ai.policy_nl_to_yaml import PolicyGenerator
-from router_policy_to_config.ai.test_case_generator import TestCaseGenerator
-from router_policy_to_config.backends.openwrt_backend import OpenWrtBackend
-from router_policy_to_config.backends.routeros_backend import RouterOSBackend
-from router_policy_to_config.diff.openwrt_diff import OpenWrtDiff
-from router_policy_to_config.diff.routeros_diff import RouterOSDiff
-from router_policy_to_config.policy_loader import PolicyLoader, PolicyLoadError
-from router_policy_to_config.policy_validator import PolicyValidator, ValidationError
 
 app = typer.Typer(help="AI-assisted copilot for router configuration")
-console = Console()
+cache_app = typer.Typer(help="Manage the on-disk render cache")
+app.add_typer(cache_app, name="cache")
+
+
+class _LazyConsole:
+    """Proxy that creates the rich Console on first use."""
+
+    _console = None
+
+    def __getattr__(self, name):
+        if _LazyConsole._console is None:
+            from rich.console import Console
+
+            _LazyConsole._console = Console()
+        return getattr(_LazyConsole._console, name)
+
+
+console = _LazyConsole()
 
 
 @app.command()
@@ -83,14 +92,58 @@ firewall:
     console.print(f"  export SECRET_PPPOE_PASSWORD='your_password'")
 
 
+@app.command()
+def watch(
+    directory: str = typer.Argument(..., help="Directory with policy YAML files"),
+    target: Optional[str] = typer.Option(None, "--target", "-t", help="Override target vendor (routeros/openwrt)"),
+    output: Optional[str] = typer.Option(None, "--out", "-o", help="Output directory"),
+    interval: float = typer.Option(0.5, "--interval", help="Polling interval in seconds"),
+):
+    """Re-validate and re-render policies as they change."""
+    from router_policy_to_config.backends import SUPPORTED_VENDORS
+    from router_policy_to_config.watch import PolicyWatcher
+
+    if target and target not in SUPPORTED_VENDORS:
+        console.print(f"[red]Unknown vendor: {target}[/red]")
+        raise typer.Exit(1)
+
+    if not Path(directory).is_dir():
+        console.print(f"[red]Not a directory: {directory}[/red]")
+        raise typer.Exit(1)
+
+    def report(event):
+        elapsed = f"{event.duration * 1000:.0f} ms"
+        if event.removed:
+            console.print(f"[yellow]-[/yellow] {event.path} removed")
+        elif event.ok:
+            written = f", wrote {len(event.outputs)} file(s)" if event.outputs else ""
+            console.print(f"[green]✓[/green] {event.path} ({event.vendor}) {elapsed}{written}")
+            for warning in event.warnings:
+                console.print(f"  ⚠ {warning}")
+        else:
+            console.print(f"[red]✗[/red] {event.path}: {event.error}")
+
+    watcher = PolicyWatcher(directory, target=target, output_dir=output, interval=interval)
+    console.print(f"Watching {directory} (Ctrl+C to stop)")
+
+    try:
+        watcher.run(report)
+    except KeyboardInterrupt:
+        console.print("Stopped.")
+
+
 @app.command()
 def validate(
     policy_file: str = typer.Argument(..., help="Path to policy YAML file"),
     show_warnings: bool = typer.Option(True, "--warnings/--no-warnings", help="Show warnings"),
+    all_errors: bool = typer.Option(False, "--all-errors", help="Report every schema error, not just the first"),
 ):
     """Validate a policy file."""
+    from router_policy_to_config.policy_loader import PolicyLoader, PolicyLoadError
+    from router_policy_to_config.policy_validator import PolicyValidator, ValidationError
+
     try:
-        loader = PolicyLoader()
+        loader = PolicyLoader(collect_all_errors=all_errors)
         console.print(f"Loading policy from: {policy_file}")
         policy = loader.load(policy_file)
 
@@ -124,8 +177,23 @@ def render(
     policy_file: str = typer.Argument(..., help="Path to policy YAML file"),
     target: str = typer.Option(..., "--target", "-t", help="Target vendor (routeros/openwrt)"),
     output: Optional[str] = typer.Option(None, "--out", "-o", help="Output file or directory"),
+    use_cache: bool = typer.Option(
+        False, "--cache/--no-cache", help="Reuse previously rendered output (cached files hold resolved secrets)"
+    ),
+    optimize: bool = typer.Option(
+        False, "--optimize", help="Merge compatible RouterOS firewall rules into port lists and address-lists"
+    ),
 ):
     """Render policy to vendor-specific configuration."""
+    from rich.syntax import Syntax
+
+    from router_policy_to_config.backends import render_policy, render_to_path
+    from router_policy_to_config.policy_loader import PolicyLoader
+    from router_policy_to_config.render_cache import RenderCache
+
+    def report_compaction(compaction):
+        console.print(compaction.get_summary())
+
     try:
         loader = PolicyLoader()
         policy = loader.load(policy_file)
@@ -135,33 +203,24 @@ def render(
             policy.meta.target.vendor = target
 
         console.print(f"Rendering policy for: {policy.meta.target.vendor}")
+        cache = RenderCache() if use_cache else None
 
         if policy.meta.target.vendor == "routeros":
-            backend = RouterOSBackend(policy)
-            config = backend.generate()
-
             if output:
-                with open(output, "w") as f:
-                    f.write(config)
+                # Streamed straight to the file
+                render_to_path(policy, output, cache=cache, optimize=optimize, on_compaction=report_compaction)
                 console.print(f"[green]✓[/green] Configuration written to: {output}")
             else:
+                config = render_policy(policy, cache=cache, optimize=optimize, on_compaction=report_compaction)
                 syntax = Syntax(config, "routeros", theme="monokai", line_numbers=False)
                 console.print(syntax)
 
         elif policy.meta.target.vendor == "openwrt":
-            backend = OpenWrtBackend(policy)
-            configs = backend.generate()
-
             if output:
-                output_dir = Path(output)
-                output_dir.mkdir(parents=True, exist_ok=True)
-
-                for filename, content in configs.items():
-                    file_path = output_dir / filename
-                    with open(file_path, "w") as f:
-                        f.write(content)
+                for file_path in render_to_path(policy, output, cache=cache):
                     console.print(f"[green]✓[/green] Written: {file_path}")
             else:
+                configs = render_policy(policy, cache=cache)
                 for filename, content in configs.items():
                     console.print(f"\n[bold]--- {filename} ---[/bold]")
                     syntax = Syntax(content, "ini", theme="monokai", line_numbers=False)
@@ -176,41 +235,93 @@ def render(
         raise typer.Exit(1)
 
 
+@app.command()
+def render_batch(
+    sources: List[str] = typer.Argument(..., help="Policy directories, files or glob patterns"),
+    target: Optional[str] = typer.Option(None, "--target", "-t", help="Override target vendor (routeros/openwrt)"),
+    output: Optional[str] = typer.Option(None, "--out", "-o", help="Output directory"),
+    workers: Optional[int] = typer.Option(None, "--workers", "-j", help="Worker processes (default: CPU count)"),
+    semantic: bool = typer.Option(True, "--validate/--no-validate", help="Run semantic validation"),
+    use_cache: bool = typer.Option(
+        False, "--cache/--no-cache", help="Reuse previously rendered output (cached files hold resolved secrets)"
+    ),
+):
+    """Render many policies in one run using a process pool."""
+    from rich.table import Table
+
+    from router_policy_to_config.backends import SUPPORTED_VENDORS
+    from router_policy_to_config.batch import render_batch as render_batch_policies
+
+    if target and target not in SUPPORTED_VENDORS:
+        console.print(f"[red]Unknown vendor: {target}[/red]")
+        raise typer.Exit(1)
+
+    result = render_batch_policies(
+        sources,
+        target=target,
+        output_dir=output,
+        workers=workers,
+        semantic=semantic,
+        use_cache=use_cache,
+    )
+
+    if not result.items:
+        console.print("[yellow]No policy files found.[/yellow]")
+        raise typer.Exit(1)
+
+    table = Table(title="Batch render")
+    table.add_column("Policy")
+    table.add_column("Vendor")
+    table.add_column("Status")
+    table.add_column("Time", justify="right")
+
+    for item in result.items:
+        status = "[green]✓[/green]" if item.ok else f"[red]✗ {item.error}[/red]"
+        table.add_row(item.path, item.vendor or "-", status, f"{item.duration * 1000:.0f} ms")
+
+    console.print(table)
+    console.print(result.get_summary().splitlines()[0])
+
+    if result.failed:
+        console.print(f"[red]✗ {len(result.failed)} policies failed[/red]")
+        raise typer.Exit(1)
+
+
 @app.command()
 def diff(
     policy_file: str = typer.Argument(..., help="Path to policy YAML file"),
     target: str = typer.Option(..., "--target", "-t", help="Target vendor"),
     current: str = typer.Option(..., "--current", "-c", help="Current config file/directory"),
     output_json: Optional[str] = typer.Option(None, "--json", help="Export diff as JSON"),
+    use_cache: bool = typer.Option(
+        False, "--cache/--no-cache", help="Reuse previously rendered output (cached files hold resolved secrets)"
+    ),
 ):
     """Compare generated config with current configuration."""
+    from router_policy_to_config.backends import render_policy
+    from router_policy_to_config.diff.openwrt_diff import OpenWrtDiff
+    from router_policy_to_config.diff.routeros_diff import RouterOSDiff
+    from router_policy_to_config.policy_loader import PolicyLoader
+    from router_policy_to_config.render_cache import RenderCache
+
     try:
         loader = PolicyLoader()
         policy = loader.load(policy_file)
         policy.meta.target.vendor = target
 
         console.print(f"Computing diff for: {target}")
+        cache = RenderCache() if use_cache else None
 
         if target == "routeros":
-            backend = RouterOSBackend(policy)
-            generated_config = backend.generate()
+            generated_config = render_policy(policy, cache=cache)
 
             with open(current, "r") as f:
                 current_config = f.read()
 
             diff_engine = RouterOSDiff(current_config, generated_config)
 
-            if output_json:
-                with open(output_json, "w") as f:
-                    f.write(diff_engine.to_json())
-                console.print(f"[green]✓[/green] Diff exported to: {output_json}")
-            else:
-                summary = diff_engine.get_summary()
-                console.print(summary)
-
         elif target == "openwrt":
-            backend = OpenWrtBackend(policy)
-            generated_configs = backend.generate()
+            generated_configs = render_policy(policy, cache=cache)
 
             # Load current configs
             current_dir = Path(current)
@@ -225,30 +336,129 @@ def diff(
 
             diff_engine = OpenWrtDiff(current_configs, generated_configs)
 
-            if output_json:
-                with open(output_json, "w") as f:
-                    f.write(diff_engine.to_json())
-                console.print(f"[green]✓[/green] Diff exported to: {output_json}")
-            else:
-                summary = diff_engine.get_summary()
-                console.print(summary)
-
         else:
             console.print(f"[red]Unknown vendor: {target}[/red]")
             raise typer.Exit(1)
 
+        # Summary and JSON are rendered from the same computed diff
+        result = diff_engine.result()
+        console.print(result.summary)
+
+        if output_json:
+            with open(output_json, "w") as f:
+                f.write(result.to_json())
+            console.print(f"[green]✓[/green] Diff exported to: {output_json}")
+
+    except typer.Exit:
+        raise
     except Exception as e:
         console.print(f"[red]✗ Diff failed:[/red] {e}")
         raise typer.Exit(1)
 
 
+@app.command()
+def plan(
+    policy_file: str = typer.Argument(..., help="Path to policy YAML file"),
+    current: str = typer.Option(
+        ..., "--current", "-c", help="Current config: RouterOS /export file or OpenWrt /etc/config directory"
+    ),
+    target: Optional[str] = typer.Option(None, "--target", "-t", help="Override target vendor"),
+    output: Optional[str] = typer.Option(None, "--out", "-o", help="Write change script to file"),
+    prune: bool = typer.Option(True, "--prune/--no-prune", help="Remove device items not in the policy"),
+    use_cache: bool = typer.Option(
+        False, "--cache/--no-cache", help="Reuse previously rendered output (cached files hold resolved secrets)"
+    ),
+    optimize: bool = typer.Option(
+        False, "--optimize", help="Merge compatible RouterOS firewall rules into port lists and address-lists"
+    ),
+):
+    """Generate a minimal change script instead of a full re-import."""
+    from rich.syntax import Syntax
+
+    from router_policy_to_config.backends import render_policy
+    from router_policy_to_config.diff.openwrt_plan import OpenWrtPlanner
+    from router_policy_to_config.diff.routeros_plan import RouterOSPlanner
+    from router_policy_to_config.policy_loader import PolicyLoader
+    from router_policy_to_config.render_cache import RenderCache
+
+    try:
+        policy = PolicyLoader().load(policy_file)
+        target = target or policy.meta.target.vendor
+        cache = RenderCache() if use_cache else None
+
+        if target == "routeros":
+            generated_config = render_policy(policy, vendor="routeros", cache=cache, optimize=optimize)
+
+            with open(current, "r") as f:
+                current_config = f.read()
+
+            change_plan = RouterOSPlanner(current_config, generated_config, prune=prune).plan()
+            lexer = "routeros"
+
+        elif target == "openwrt":
+            generated_configs = render_policy(policy, vendor="openwrt", cache=cache)
+
+            current_dir = Path(current)
+            if not current_dir.is_dir():
+                console.print(f"[red]Not a directory: {current}[/red]")
+                raise typer.Exit(1)
+
+            current_configs = {}
+            for filename in ["network", "wireless", "firewall", "dhcp"]:
+                config_file = current_dir / filename
+                if config_file.exists():
+                    with open(config_file, "r") as f:
+                        current_configs[filename] = f.read()
+
+            change_plan = OpenWrtPlanner(current_configs, generated_configs, prune=prune).plan()
+            lexer = "bash"
+
+        else:
+            console.print(f"[red]Unknown vendor: {target}[/red]")
+            raise typer.Exit(1)
+
+        console.print(change_plan.get_summary())
+
+        if output:
+            with open(output, "w") as f:
+                f.write(change_plan.to_script())
+            console.print(f"[green]✓[/green] Change script written to: {output}")
+        elif change_plan.has_changes:
+            console.print(Syntax(change_plan.to_script(), lexer, theme="monokai", line_numbers=False))
+
+    except typer.Exit:
+        raise
+    except Exception as e:
+        console.print(f"[red]✗ Plan failed:[/red] {e}")
+        raise typer.Exit(1)
+
+
 @app.command()
 def ai_suggest(
     from_text: Optional[str] = typer.Option(None, "--from-text", help="Text file with description"),
     description: Optional[str] = typer.Option(None, "--desc", "-d", help="Direct description"),
     output: str = typer.Option("policy.yaml", "--out", "-o", help="Output file"),
+    stream: bool = typer.Option(
+        True, "--stream/--no-stream", help="Show the policy as it is generated and stop early on broken YAML"
+    ),
+    fast_path: bool = typer.Option(
+        True, "--fast-path/--no-fast-path", help="Assemble common setups locally without calling the AI provider"
+    ),
+    repair: bool = typer.Option(
+        False, "--repair", help="Validate the policy and let the AI fix reported errors (disables --stream)"
+    ),
+    max_attempts: int = typer.Option(3, "--max-attempts", min=1, help="Generation plus repair attempts with --repair"),
+    budget: Optional[float] = typer.Option(
+        None,
+        "--budget",
+        help="Seconds after which no repair is started with --repair (a running AI call is not interrupted)",
+    ),
 ):
     """Generate policy from natural language description using AI."""
+    import os
+
+    from router_policy_to_config.ai.policy_nl_to_yaml import PolicyGenerator
+
     if not from_text and not description:
         console.print("[red]Error: Provide either --from-text or --desc[/red]")
         raise typer.Exit(1)
@@ -258,22 +468,88 @@ def ai_suggest(
             with open(from_text, "r") as f:
                 description = f.read()
 
-        console.print("[yellow]Generating policy with AI...[/yellow]")
-        generator = PolicyGenerator()
-        policy_yaml = generator.generate_from_text(description)
+        generator = PolicyGenerator(fast_path=fast_path)
+        console.print("[yellow]Generating policy...[/yellow]")
+
+        if repair:
+            report = generator.generate_validated(description, max_attempts=max_attempts, latency_budget=budget)
+            # An invalid result goes to a side file so it never replaces a previous policy
+            partial = f"{output}.partial"
+            with open(output if report.valid else partial, "w") as f:
+                f.write(report.yaml)
+            console.print(report.get_summary())
+            for error in report.errors:
+                console.print(f"  [red]✗[/red] {error}")
+            for warning in report.warnings:
+                console.print(f"  [yellow]⚠[/yellow] {warning}")
+            if not report.valid:
+                console.print(f"[yellow]Invalid policy kept in {partial}[/yellow]")
+                raise typer.Exit(1)
+            if os.path.exists(partial):
+                os.remove(partial)
+        elif stream:
+            # Written to a side file so a broken stream never replaces a previous policy
+            partial = f"{output}.partial"
+            with open(partial, "w") as f:
+                try:
+                    for chunk in generator.stream_from_text(description):
+                        f.write(chunk)
+                        f.flush()
+                        console.print(chunk, end="", markup=False, highlight=False)
+                except ValueError:
+                    console.print(f"\n[yellow]Partial output kept in {partial}[/yellow]")
+                    raise
+            console.print()
+            os.replace(partial, output)
+        else:
+            policy_yaml = generator.generate_from_text(description)
 
-        with open(output, "w") as f:
-            f.write(policy_yaml)
+            with open(output, "w") as f:
+                f.write(policy_yaml)
 
+        if generator.last_match:
+            console.print(f"[green]Assembled locally:[/green] {', '.join(generator.last_match.intents)}")
+        if generator.intent_matcher:
+            console.print(generator.intent_matcher.stats.get_summary())
         console.print(f"[green]✓[/green] Generated policy: {output}")
         console.print(f"\n[yellow]Please review and validate before using![/yellow]")
         console.print(f"  router-policy validate {output}")
 
+    except typer.Exit:
+        raise
     except Exception as e:
         console.print(f"[red]✗ Generation failed:[/red] {e}")
         raise typer.Exit(1)
 
 
+@cache_app.command("stats")
+def cache_stats():
+    """Show render cache statistics."""
+    from rich.table import Table
+
+    from router_policy_to_config.render_cache import RenderCache
+
+    stats = RenderCache().stats()
+
+    table = Table(title="Render cache")
+    table.add_column("Property")
+    table.add_column("Value", justify="right")
+    table.add_row("Directory", stats["directory"])
+    table.add_row("Entries", str(stats["entries"]))
+    table.add_row("Size", f"{stats['total_bytes'] / 1024:.1f} KiB")
+    table.add_row("Limit", f"{stats['max_bytes'] / 1024 / 1024:.0f} MiB")
+    console.print(table)
+
+
+@cache_app.command("clear")
+def cache_clear():
+    """Remove all render cache entries."""
+    from router_policy_to_config.render_cache import RenderCache
+
+    removed = RenderCache().clear()
+    console.print(f"[green]✓[/green] Removed {removed} cache entries")
+
+
 @app.command()
 def lab_test(
     policy_file: str = typer.Argument(..., help="Path to policy YAML file"),
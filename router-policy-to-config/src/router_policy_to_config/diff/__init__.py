@@ -2,5 +2,9 @@
 
 from router_policy_to_config.diff.routeros_diff import RouterOSDiff
 from router_policy_to_config.diff.openwrt_diff import OpenWrtDiff
+from router_policy_to_config.diff.result import DiffResult
+from router_policy_to_config.diff.routeros_plan import RouterOSPlan, RouterOSPlanner
+from router_policy_to_config.diff.openwrt_plan import OpenWrtPlan, OpenWrtPlanner
 
-__all__ = ["RouterOSDiff", "OpenWrtDiff"]
+__all__ = ["RouterOSDiff", "OpenWrtDiff", "DiffResult", "RouterOSPlanner", "RouterOSPlan",
+           "OpenWrtPlanner", "OpenWrtPlan"]
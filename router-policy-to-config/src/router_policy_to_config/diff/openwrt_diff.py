@@ -5,8 +5,9 @@ Compare generated UCI configuration with existing configs.
 """
 
 import difflib
-import json
-from typing import Dict, List
+from typing import Any, Dict, List, Optional, Tuple
+
+from router_policy_to_config.diff.result import DiffResult
 
 
 class OpenWrtDiff:
@@ -20,17 +21,40 @@ class OpenWrtDiff:
             current_configs: Dict of filename -> current UCI config content
             generated_configs: Dict of filename -> generated UCI config content
         """
+        self._result: Optional[DiffResult] = None
         self.current = current_configs
         self.generated = generated_configs
 
+    @property
+    def current(self) -> Dict[str, str]:
+        """Current configuration files."""
+        return self._current
+
+    @current.setter
+    def current(self, value: Dict[str, str]) -> None:
+        self._current = dict(value)
+        self._result = None
+
+    @property
+    def generated(self) -> Dict[str, str]:
+        """Generated configuration files."""
+        return self._generated
+
+    @generated.setter
+    def generated(self, value: Dict[str, str]) -> None:
+        self._generated = dict(value)
+        self._result = None
+
     def _parse_uci_config(self, content: str) -> List[Dict]:
         """
         Parse UCI config into structured sections.
 
-        Returns list of config sections as dicts.
+        Returns list of config sections as dicts. "index" is the position
+        among sections of the same type, as in UCI's @type[index] syntax.
         """
         sections = []
         current_section = None
+        type_counts: Dict[str, int] = {}
 
         for line in content.split("\n"):
             line = line.strip()
@@ -51,8 +75,10 @@ class OpenWrtDiff:
                 current_section = {
                     "type": section_type,
                     "name": section_name,
+                    "index": type_counts.get(section_type, 0),
                     "options": []
                 }
+                type_counts[section_type] = current_section["index"] + 1
             elif line.startswith("option ") or line.startswith("list "):
                 # Option in current section
                 if current_section:
@@ -64,6 +90,124 @@ class OpenWrtDiff:
 
         return sections
 
+    @staticmethod
+    def _section_ref(section: Dict) -> str:
+        """Get the display name of a section (@type[index] for anonymous ones)."""
+        return section["name"] or f"@{section['type']}[{section['index']}]"
+
+    @staticmethod
+    def _option_name(section: Dict) -> str:
+        """Get the value of "option name" of a section, if any."""
+        for option in section["options"]:
+            if option.startswith("option name "):
+                return option[len("option name "):].strip("'\"")
+        return ""
+
+    def pair_sections(
+        self, current_sections: List[Dict], generated_sections: List[Dict]
+    ) -> Tuple[List[Tuple[Dict, Dict]], List[Dict], List[Dict]]:
+        """
+        Pair current and generated sections.
+
+        Named sections are matched through a (type, name) index. Anonymous
+        sections ("config rule" without a name) of the same type are paired
+        by identical content first, then by their "option name", then by
+        position among the remaining ones.
+
+        Args:
+            current_sections: Sections parsed from the current config
+            generated_sections: Sections parsed from the generated config
+
+        Returns:
+            Tuple of ((current, generated) pairs, added sections, removed sections)
+        """
+        current_named: Dict[Tuple[str, str], Dict] = {}
+        current_anonymous: Dict[str, List[Dict]] = {}
+        for section in current_sections:
+            if section["name"]:
+                current_named.setdefault((section["type"], section["name"]), section)
+            else:
+                current_anonymous.setdefault(section["type"], []).append(section)
+
+        pairs = []
+        added = []
+        generated_named = set()
+        generated_anonymous: Dict[str, List[Dict]] = {}
+
+        for section in generated_sections:
+            if not section["name"]:
+                generated_anonymous.setdefault(section["type"], []).append(section)
+                continue
+
+            key = (section["type"], section["name"])
+            if key in generated_named:
+                continue
+            generated_named.add(key)
+
+            if key in current_named:
+                pairs.append((current_named[key], section))
+            else:
+                added.append(section)
+
+        removed = [section for key, section in current_named.items() if key not in generated_named]
+
+        for section_type in list(dict.fromkeys(list(generated_anonymous) + list(current_anonymous))):
+            unmatched_current = current_anonymous.get(section_type, [])
+            unmatched_generated = generated_anonymous.get(section_type, [])
+
+            for identity in (lambda s: tuple(s["options"]), self._option_name):
+                by_identity: Dict[Any, List[Dict]] = {}
+                for section in unmatched_current:
+                    by_identity.setdefault(identity(section), []).append(section)
+
+                matched = set()
+                remaining = []
+                for section in unmatched_generated:
+                    candidates = by_identity.get(identity(section))
+                    if candidates and identity(section):
+                        current_section = candidates.pop(0)
+                        matched.add(id(current_section))
+                        pairs.append((current_section, section))
+                    else:
+                        remaining.append(section)
+
+                unmatched_current = [s for s in unmatched_current if id(s) not in matched]
+                unmatched_generated = remaining
+
+            # Whatever is left is paired in order of appearance
+            pairs.extend(zip(unmatched_current, unmatched_generated))
+            common = min(len(unmatched_current), len(unmatched_generated))
+            added.extend(unmatched_generated[common:])
+            removed.extend(unmatched_current[common:])
+
+        return pairs, added, removed
+
+    def _match_sections(self, current_sections: List[Dict], generated_sections: List[Dict]) -> Tuple[List, List, List]:
+        """
+        Match sections and summarize the differences.
+
+        Returns:
+            Tuple of (added, removed, modified) section lists
+        """
+        pairs, added, removed = self.pair_sections(current_sections, generated_sections)
+
+        modified = [
+            {
+                "type": generated_section["type"],
+                "name": self._section_ref(generated_section),
+                "current_options": current_section["options"],
+                "generated_options": generated_section["options"]
+            }
+            for current_section, generated_section in pairs
+            if current_section["options"] != generated_section["options"]
+        ]
+
+        return (
+            [{"type": s["type"], "name": self._section_ref(s)} for s in added],
+            [{"type": s["type"], "name": self._section_ref(s)} for s in removed],
+            modified,
+        )
+
     def _compare_configs(self, current: str, generated: str) -> Dict:
         """
         Compare two UCI config files.
@@ -95,38 +239,21 @@ class OpenWrtDiff:
         current_sections = self._parse_uci_config(current)
         generated_sections = self._parse_uci_config(generated)
 
-        # Find section differences
-        current_section_keys = {(s["type"], s["name"]) for s in current_sections}
-        generated_section_keys = {(s["type"], s["name"]) for s in generated_sections}
-
-        added_sections = generated_section_keys - current_section_keys
-        removed_sections = current_section_keys - generated_section_keys
-        common_sections = current_section_keys & generated_section_keys
-
-        modified_sections = []
-        for section_key in common_sections:
-            current_section = next(s for s in current_sections if (s["type"], s["name"]) == section_key)
-            generated_section = next(s for s in generated_sections if (s["type"], s["name"]) == section_key)
-
-            if current_section["options"] != generated_section["options"]:
-                modified_sections.append({
-                    "type": section_key[0],
-                    "name": section_key[1],
-                    "current_options": current_section["options"],
-                    "generated_options": generated_section["options"]
-                })
+        added_sections, removed_sections, modified_sections = self._match_sections(
+            current_sections, generated_sections
+        )
 
         return {
             "has_changes": len(added) > 0 or len(removed) > 0,
             "added_lines": added,
             "removed_lines": removed,
-            "added_sections": [{"type": t, "name": n} for t, n in added_sections],
-            "removed_sections": [{"type": t, "name": n} for t, n in removed_sections],
+            "added_sections": added_sections,
+            "removed_sections": removed_sections,
             "modified_sections": modified_sections,
             "unified_diff": diff
         }
 
-    def compute_diff(self) -> Dict:
+    def _compute(self) -> Dict:
         """
         Compute differences across all config files.
 
@@ -151,15 +278,9 @@ class OpenWrtDiff:
             "files": file_diffs
         }
 
-    def get_summary(self) -> str:
-        """
-        Get human-readable summary of changes.
-
-        Returns:
-            Formatted string describing changes
-        """
-        diff_result = self.compute_diff()
-
+    @staticmethod
+    def _render_summary(diff_result: Dict) -> str:
+        """Render the human-readable summary of a computed diff."""
         if not diff_result["has_changes"]:
             return "No changes detected between current and generated configuration."
 
@@ -199,6 +320,37 @@ class OpenWrtDiff:
 
         return "\n".join(summary_lines)
 
+    def result(self) -> DiffResult:
+        """
+        Get the diff result, computing it on first use.
+
+        The result is cached until current or generated is reassigned.
+
+        Returns:
+            DiffResult with summary, JSON and unified views
+        """
+        if self._result is None:
+            self._result = DiffResult(self._compute(), self._render_summary)
+        return self._result
+
+    def compute_diff(self) -> Dict:
+        """
+        Compute difference between configurations.
+
+        Returns:
+            Dict with diff information (cached, treat as read-only)
+        """
+        return self.result().data
+
+    def get_summary(self) -> str:
+        """
+        Get human-readable summary of changes.
+
+        Returns:
+            Formatted string describing changes
+        """
+        return self.result().summary
+
     def to_json(self) -> str:
         """Export diff as JSON."""
-        return json.dumps(self.compute_diff(), indent=2)
+        return self.result().to_json()
@@ -0,0 +1,273 @@
+"""
+OpenWrt change planning module.
+
+Builds a ``uci batch`` script containing only the section, option and list
+changes between the current /etc/config files and the generated configs,
+and reloads only the services whose packages changed.
+"""
+
+import shlex
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from router_policy_to_config.diff.openwrt_diff import OpenWrtDiff
+
+# Package -> command reloading the service that reads it
+SERVICE_RELOADS = {
+    "network": "/etc/init.d/network reload",
+    "wireless": "wifi reload",
+    "firewall": "/etc/init.d/firewall reload",
+    "dhcp": "/etc/init.d/dnsmasq reload",
+}
+
+# Sections: {"type", "name", "index", "options"} as parsed by OpenWrtDiff
+Section = Dict
+
+
+@dataclass
+class OpenWrtPlan:
+    """Minimal uci batch turning the current configuration into the generated one."""
+
+    batch: List[str] = field(default_factory=list)  # uci batch commands
+    packages: List[str] = field(default_factory=list)  # Changed packages, in commit order
+    new_packages: List[str] = field(default_factory=list)  # Packages missing on the device
+    added: int = 0
+    changed: int = 0
+    removed: int = 0
+    moved: int = 0
+
+    @property
+    def has_changes(self) -> bool:
+        """Whether any command needs to be applied."""
+        return bool(self.batch)
+
+    @property
+    def reload_commands(self) -> List[str]:
+        """Service reloads required by the changed packages."""
+        return [SERVICE_RELOADS[package] for package in self.packages if package in SERVICE_RELOADS]
+
+    def get_summary(self) -> str:
+        """
+        Get human-readable summary of the plan.
+
+        Returns:
+            One-line summary of planned operations
+        """
+        if not self.has_changes:
+            return "No changes to apply."
+        return (
+            f"Plan: {self.added} to add, {self.changed} to change, "
+            f"{self.removed} to remove, {self.moved} to move "
+            f"(packages: {', '.join(self.packages)})"
+        )
+
+    def to_commands(self) -> List[str]:
+        """
+        Render the plan as shell commands.
+
+        Returns:
+            List of shell lines applying the batch and reloading services
+        """
+        commands = [
+            "# UCI delta generated by router-policy-to-config",
+            f"# {self.get_summary()}",
+            "# Review carefully before applying!",
+            "",
+        ]
+        if not self.has_changes:
+            return commands
+
+        for package in self.new_packages:
+            commands.append(f"touch /etc/config/{package}")
+
+        commands.append("uci batch << 'EOF'")
+        commands.extend(self.batch)
+        commands.extend(f"commit {package}" for package in self.packages)
+        commands.append("EOF")
+        commands.append("")
+        commands.append("# Reload only the affected services")
+        commands.extend(self.reload_commands)
+        return commands
+
+    def to_script(self) -> str:
+        """Render the plan as a shell script."""
+        return "\n".join(self.to_commands())
+
+
+def _uci_quote(value: str) -> str:
+    """Quote a value for uci batch."""
+    return "'" + value.replace("'", "'\\''") + "'"
+
+
+def _parse_options(section: Section) -> Tuple[Dict[str, str], Dict[str, List[str]]]:
+    """Split raw "option"/"list" lines of a section into options and lists."""
+    options: Dict[str, str] = {}
+    lists: Dict[str, List[str]] = {}
+
+    for line in section["options"]:
+        try:
+            tokens = shlex.split(line)
+        except ValueError:
+            tokens = line.split()
+        if len(tokens) < 2:
+            continue
+        kind, key = tokens[0], tokens[1]
+        value = " ".join(tokens[2:])
+        if kind == "list":
+            lists.setdefault(key, []).append(value)
+        else:
+            options[key] = value
+
+    return options, lists
+
+
+class OpenWrtPlanner:
+    """Plan minimal OpenWrt UCI changes from current and generated configurations."""
+
+    def __init__(self, current_configs: Dict[str, str], generated_configs: Dict[str, str], prune: bool = True):
+        """
+        Initialize planner.
+
+        Args:
+            current_configs: Dict of package name -> current /etc/config content
+            generated_configs: Dict of package name -> generated UCI content
+            prune: Delete sections the device has that the policy does not generate
+        """
+        self.current = current_configs
+        self.generated = generated_configs
+        self.prune = prune
+        self._diff = OpenWrtDiff({}, {})
+
+    def _set_options(self, ref: str, current: Optional[Section], generated: Section) -> List[str]:
+        """Commands updating the options and lists of a section."""
+        current_options, current_lists = _parse_options(current) if current else ({}, {})
+        options, lists = _parse_options(generated)
+        commands = []
+
+        for key, value in options.items():
+            if current_options.get(key) != value:
+                commands.append(f"set {ref}.{key}={_uci_quote(value)}")
+        for key in current_options:
+            if key not in options and key not in lists:
+                commands.append(f"delete {ref}.{key}")
+
+        for key, values in lists.items():
+            if current_lists.get(key) != values:
+                if key in current_lists or key in current_options:
+                    commands.append(f"delete {ref}.{key}")
+                commands.extend(f"add_list {ref}.{key}={_uci_quote(value)}" for value in values)
+        for key in current_lists:
+            if key not in lists and key not in options:
+                commands.append(f"delete {ref}.{key}")
+
+        return commands
+
+    def _plan_package(self, package: str, plan: OpenWrtPlan) -> List[str]:
+        """Plan the uci commands for one package."""
+        current_sections = self._diff._parse_uci_config(self.current.get(package, ""))
+        generated_sections = self._diff._parse_uci_config(self.generated.get(package, ""))
+        pairs, added, removed = self._diff.pair_sections(current_sections, generated_sections)
+
+        # Positional fallback may pair rules with different "option name"; those are distinct rules
+        option_name = self._diff._option_name
+        for current, generated in [p for p in pairs if option_name(p[0]) and option_name(p[1])]:
+            if option_name(current) != option_name(generated):
+                pairs.remove((current, generated))
+                removed.append(current)
+                added.append(generated)
+
+        def ref(section: Section, index: Optional[int] = None) -> str:
+            if section["name"]:
+                return f"{package}.{section['name']}"
+            return f"{package}.@{section['type']}[{section['index'] if index is None else index}]"
+
+        commands: List[str] = []
+
+        # 1. Modify existing sections while device indexes are still valid
+        for current, generated in pairs:
+            changes = self._set_options(ref(current), current, generated)
+            if changes:
+                commands.extend(changes)
+                plan.changed += 1
+
+        # 2. Append new sections; "@type[-1]" is the one just added
+        added_ids = {id(section) for section in added}
+        for section in generated_sections:
+            if id(section) not in added_ids:
+                continue
+            if section["name"]:
+                commands.append(f"set {ref(section)}={section['type']}")
+                commands.extend(self._set_options(ref(section), None, section))
+            else:
+                commands.append(f"add {package} {section['type']}")
+                commands.extend(self._set_options(ref(section, -1), None, section))
+            plan.added += 1
+
+        # 3. Delete from the highest anonymous index down so lower indexes stay valid
+        kept = list(current_sections) + [s for s in generated_sections if id(s) in added_ids]
+        if self.prune:
+            for section in sorted(removed, key=lambda s: (bool(s["name"]), -s["index"])):
+                commands.append(f"delete {ref(section)}")
+                plan.removed += 1
+            removed_ids = {id(section) for section in removed}
+            kept = [s for s in kept if id(s) not in removed_ids]
+
+        commands.extend(self._reorder(package, kept, pairs, generated_sections, plan))
+        return commands
+
+    def _reorder(
+        self,
+        package: str,
+        state: List[Section],
+        pairs: List[Tuple[Section, Section]],
+        generated_sections: List[Section],
+        plan: OpenWrtPlan,
+    ) -> List[str]:
+        """Reorder sections (first-match firewall rules) to follow the generated order."""
+        # Map sections in the device state to their generated counterpart
+        generated_of = {id(current): generated for current, generated in pairs}
+        state = [generated_of.get(id(section), section) for section in state]
+        present = {id(section) for section in state}
+        managed = [section for section in generated_sections if id(section) in present]
+        managed_ids = {id(section) for section in managed}
+
+        # Sections not generated by the policy keep their positions
+        slots = [i for i, section in enumerate(state) if id(section) in managed_ids]
+        desired = list(state)
+        for slot, section in zip(slots, managed):
+            desired[slot] = section
+
+        commands = []
+        for position, section in enumerate(desired):
+            if state[position] is section:
+                continue
+            current_position = next(i for i in range(position, len(state)) if state[i] is section)
+            if section["name"]:
+                section_ref = f"{package}.{section['name']}"
+            else:
+                index = sum(1 for s in state[:current_position] if s["type"] == section["type"])
+                section_ref = f"{package}.@{section['type']}[{index}]"
+            commands.append(f"reorder {section_ref}={position}")
+            state.insert(position, state.pop(current_position))
+            plan.moved += 1
+
+        return commands
+
+    def plan(self) -> OpenWrtPlan:
+        """
+        Compute the change plan.
+
+        Returns:
+            OpenWrtPlan with the uci batch and the services to reload
+        """
+        plan = OpenWrtPlan()
+
+        for package in self.generated:
+            commands = self._plan_package(package, plan)
+            if commands:
+                plan.batch.extend(commands)
+                plan.packages.append(package)
+                if package not in self.current:
+                    plan.new_packages.append(package)
+
+        return plan
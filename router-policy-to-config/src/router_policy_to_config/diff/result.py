@@ -0,0 +1,58 @@
+"""
+Diff result module.
+
+Structured diff result shared by the diff engines, with summary, JSON
+and unified-diff views rendered from the same computed data.
+"""
+
+import json
+from typing import Any, Callable, Dict, List, Optional
+
+
+class DiffResult:
+    """Computed configuration diff with lazily rendered views."""
+
+    def __init__(self, data: Dict[str, Any], render_summary: Callable[[Dict[str, Any]], str]):
+        """
+        Initialize diff result.
+
+        Args:
+            data: Structured diff as returned by the engine's compute_diff()
+            render_summary: Function rendering the human-readable summary from data
+        """
+        self.data = data
+        self._render_summary = render_summary
+        self._summary: Optional[str] = None
+
+    @property
+    def has_changes(self) -> bool:
+        """Whether the configurations differ."""
+        return bool(self.data["has_changes"])
+
+    @property
+    def summary(self) -> str:
+        """Human-readable summary of changes."""
+        if self._summary is None:
+            self._summary = self._render_summary(self.data)
+        return self._summary
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        """Export diff as JSON."""
+        return json.dumps(self.data, indent=indent)
+
+    def unified_lines(self) -> List[str]:
+        """Get unified diff lines (per file for multi-file configs)."""
+        if "files" not in self.data:
+            return list(self.data["unified_diff"])
+
+        lines: List[str] = []
+        for file_diff in self.data["files"].values():
+            lines.extend(file_diff["unified_diff"])
+        return lines
+
+    def unified(self) -> str:
+        """Get unified diff as text."""
+        return "\n".join(self.unified_lines())
+
+    def __getitem__(self, key: str) -> Any:
+        return self.data[key]
@@ -2,12 +2,42 @@
 RouterOS configuration diff module.
 
 Compare generated configuration with existing RouterOS exports.
+
+Both configs are normalized once and split into menu blocks
+(``/ip firewall filter``, ``/interface bridge port``...). Blocks whose
+content is identical are skipped, so on large ``/export`` dumps the line
+diff only runs over the menus that actually changed.
 """
 
 import difflib
-import json
 import re
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+from router_policy_to_config.diff.result import DiffResult
+
+_COMMENT_RE = re.compile(r"#.*$")
+
+# Tokens that end the menu path of a one-line command ("/ip address add ...")
+_COMMAND_VERBS = frozenset({"add", "set", "remove", "enable", "disable", "print", "export", "unset", "move"})
+
+Blocks = Dict[str, Tuple[str, ...]]
+
+
+def _menu_path(line: str) -> str:
+    """Get the menu path of a line starting with '/'."""
+    path = []
+    for token in line.split():
+        if "=" in token or token.startswith("[") or token in _COMMAND_VERBS:
+            break
+        path.append(token)
+    return " ".join(path)
+
+
+def _section_name(menu: str) -> str:
+    """Get the top-level section name of a menu path ('/ip firewall' -> 'ip')."""
+    if not menu:
+        return "general"
+    return menu.split()[0].split("/")[1]
 
 
 class RouterOSDiff:
@@ -21,9 +51,30 @@ class RouterOSDiff:
             current_config: Current RouterOS configuration (export)
             generated_config: Generated configuration from policy
         """
+        self._result: Optional[DiffResult] = None
         self.current = current_config
         self.generated = generated_config
 
+    @property
+    def current(self) -> str:
+        """Current configuration."""
+        return self._current
+
+    @current.setter
+    def current(self, value: str) -> None:
+        self._current = value
+        self._result = None
+
+    @property
+    def generated(self) -> str:
+        """Generated configuration."""
+        return self._generated
+
+    @generated.setter
+    def generated(self, value: str) -> None:
+        self._generated = value
+        self._result = None
+
     def _normalize_config(self, config: str) -> List[str]:
         """
         Normalize configuration for comparison.
@@ -33,7 +84,8 @@ class RouterOSDiff:
         lines = []
         for line in config.split("\n"):
             # Remove inline comments
-            line = re.sub(r"#.*$", "", line)
+            if "#" in line:
+                line = _COMMENT_RE.sub("", line)
             # Strip whitespace
             line = line.strip()
             # Skip empty lines
@@ -41,81 +93,93 @@ class RouterOSDiff:
                 lines.append(line)
         return lines
 
+    def _split_blocks(self, lines: List[str]) -> Blocks:
+        """
+        Group normalized lines by menu path.
+
+        Lines before the first menu go to the '' block. A menu that appears
+        several times in the export is merged into one block.
+        """
+        blocks: Dict[str, List[str]] = {}
+        block = blocks.setdefault("", [])
+
+        for line in lines:
+            if line.startswith("/"):
+                block = blocks.setdefault(_menu_path(line), [])
+            block.append(line)
+
+        return {menu: tuple(block_lines) for menu, block_lines in blocks.items() if block_lines}
+
     def _extract_commands(self, config: str) -> Dict[str, List[str]]:
         """
         Extract commands grouped by section.
 
         Returns dict of section -> list of commands.
         """
-        sections = {}
-        current_section = "general"
-        
-        for line in self._normalize_config(config):
-            # Detect section starts
-            if line.startswith("/"):
-                # Extract section from command path
-                parts = line.split()
-                if parts:
-                    section = parts[0].split("/")[1] if "/" in parts[0] else "general"
-                    if section not in sections:
-                        sections[section] = []
-                    sections[section].append(line)
-                    current_section = section
-            else:
-                if current_section not in sections:
-                    sections[current_section] = []
-                sections[current_section].append(line)
-        
+        sections: Dict[str, List[str]] = {}
+        for menu, block in self._split_blocks(self._normalize_config(config)).items():
+            sections.setdefault(_section_name(menu), []).extend(block)
         return sections
 
-    def compute_diff(self) -> Dict[str, any]:
+    def _compute(self) -> Dict[str, Any]:
         """
         Compute difference between configurations.
 
         Returns:
             Dict with diff information including added, removed, and modified sections
         """
-        current_lines = self._normalize_config(self.current)
-        generated_lines = self._normalize_config(self.generated)
-
-        # Compute unified diff
-        diff = list(difflib.unified_diff(
-            current_lines,
-            generated_lines,
-            fromfile="current",
-            tofile="generated",
-            lineterm=""
-        ))
-
-        # Analyze differences
-        added = []
-        removed = []
-        modified = []
-
-        for line in diff:
-            if line.startswith("+") and not line.startswith("+++"):
-                added.append(line[1:].strip())
-            elif line.startswith("-") and not line.startswith("---"):
-                removed.append(line[1:].strip())
-
-        # Extract sections
-        current_sections = self._extract_commands(self.current)
-        generated_sections = self._extract_commands(self.generated)
+        current_blocks = self._split_blocks(self._normalize_config(self.current))
+        generated_blocks = self._split_blocks(self._normalize_config(self.generated))
 
-        section_changes = {}
-        all_sections = set(current_sections.keys()) | set(generated_sections.keys())
+        diff: List[str] = []
+        added: List[str] = []
+        removed: List[str] = []
+        changed_sections: Dict[str, None] = {}
+
+        # Generated order first, then menus that only exist on the device
+        menus = list(dict.fromkeys(list(generated_blocks) + list(current_blocks)))
+
+        for menu in menus:
+            current_block = current_blocks.get(menu, ())
+            generated_block = generated_blocks.get(menu, ())
+
+            # Unchanged menus are skipped with one tuple comparison instead of a diff
+            if current_block == generated_block:
+                continue
+
+            changed_sections[_section_name(menu)] = None
+            label = menu or "(preamble)"
+            block_diff = list(difflib.unified_diff(
+                current_block,
+                generated_block,
+                fromfile=f"current {label}",
+                tofile=f"generated {label}",
+                lineterm=""
+            ))
+
+            # Skip the ---/+++ file header of each block
+            for line in block_diff[2:]:
+                if line.startswith("+"):
+                    added.append(line[1:].strip())
+                elif line.startswith("-"):
+                    removed.append(line[1:].strip())
+
+            diff.extend(block_diff)
 
-        for section in all_sections:
-            current_cmds = set(current_sections.get(section, []))
-            generated_cmds = set(generated_sections.get(section, []))
+        section_changes = {}
+        for section in changed_sections:
+            current_cmds = self._section_lines(current_blocks, section)
+            generated_cmds = self._section_lines(generated_blocks, section)
 
-            section_added = generated_cmds - current_cmds
-            section_removed = current_cmds - generated_cmds
+            current_set = set(current_cmds)
+            generated_set = set(generated_cmds)
+            section_added = [cmd for cmd in generated_cmds if cmd not in current_set]
+            section_removed = [cmd for cmd in current_cmds if cmd not in generated_set]
 
             if section_added or section_removed:
                 section_changes[section] = {
-                    "added": list(section_added),
-                    "removed": list(section_removed)
+                    "added": section_added,
+                    "removed": section_removed
                 }
 
         return {
@@ -126,15 +190,17 @@ class RouterOSDiff:
             "unified_diff": diff
         }
 
-    def get_summary(self) -> str:
-        """
-        Get human-readable summary of changes.
-
-        Returns:
-            Formatted string describing changes
-        """
-        diff_result = self.compute_diff()
+    def _section_lines(self, blocks: Blocks, section: str) -> List[str]:
+        """Get the unique lines of all menu blocks in a top-level section."""
+        lines: Dict[str, None] = {}
+        for menu, block in blocks.items():
+            if _section_name(menu) == section:
+                lines.update(dict.fromkeys(block))
+        return list(lines)
 
+    @staticmethod
+    def _render_summary(diff_result: Dict) -> str:
+        """Render the human-readable summary of a computed diff."""
         if not diff_result["has_changes"]:
             return "No changes detected between current and generated configuration."
 
@@ -178,6 +244,37 @@ class RouterOSDiff:
 
         return "\n".join(summary_lines)
 
+    def result(self) -> DiffResult:
+        """
+        Get the diff result, computing it on first use.
+
+        The result is cached until current or generated is reassigned.
+
+        Returns:
+            DiffResult with summary, JSON and unified views
+        """
+        if self._result is None:
+            self._result = DiffResult(self._compute(), self._render_summary)
+        return self._result
+
+    def compute_diff(self) -> Dict[str, Any]:
+        """
+        Compute difference between configurations.
+
+        Returns:
+            Dict with diff information (cached, treat as read-only)
+        """
+        return self.result().data
+
+    def get_summary(self) -> str:
+        """
+        Get human-readable summary of changes.
+
+        Returns:
+            Formatted string describing changes
+        """
+        return self.result().summary
+
     def to_json(self) -> str:
         """Export diff as JSON."""
-        return json.dumps(self.compute_diff(), indent=2)
+        return self.result().to_json()
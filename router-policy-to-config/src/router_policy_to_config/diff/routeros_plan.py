@@ -0,0 +1,451 @@
+"""
+RouterOS change planning module.
+
+Builds a minimal change script from the current RouterOS export and the
+generated configuration. Items are matched by a stable identity (comment,
+name or a per-menu key) instead of by line, so applying a one-rule change
+emits one command rather than re-importing the whole script.
+"""
+
+import shlex
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional, Tuple
+
+from router_policy_to_config.diff.routeros_diff import _menu_path
+
+# Menus where item order matters (first match wins)
+ORDERED_MENUS = frozenset({
+    "/ip firewall filter",
+    "/ip firewall nat",
+    "/ip firewall mangle",
+    "/ip firewall raw",
+    "/ipv6 firewall filter",
+    "/ipv6 firewall nat",
+    "/ipv6 firewall mangle",
+    "/ipv6 firewall raw",
+})
+
+# Identity keys for items without a comment or name
+IDENTITY_KEYS = {
+    "/ip address": ("address", "interface"),
+    "/ip firewall address-list": ("list", "address"),
+    "/ip dhcp-client": ("interface",),
+    "/ip dhcp-server network": ("address",),
+    "/ip route": ("dst-address", "gateway"),
+    "/interface wireguard peers": ("interface", "public-key"),
+    "/interface bridge port": ("bridge", "interface"),
+    "/interface list member": ("list", "interface"),
+}
+
+# Properties that describe placement rather than the item itself
+_PLACEMENT_KEYS = frozenset({"place-before"})
+
+Identity = Tuple[Tuple[str, Optional[str]], ...]
+
+
+@dataclass(eq=False)
+class _Item:
+    """Parsed RouterOS command (compared by identity, as duplicates are distinct items)."""
+
+    menu: str
+    verb: str
+    target: Optional[str]  # Positional target of set commands (e.g. "pppoe-out1")
+    props: Dict[str, str]
+    line: str
+
+
+@dataclass
+class RouterOSPlan:
+    """Minimal set of commands turning the current configuration into the generated one."""
+
+    commands: List[str] = field(default_factory=list)
+    added: int = 0
+    changed: int = 0
+    removed: int = 0
+    moved: int = 0
+
+    @property
+    def has_changes(self) -> bool:
+        """Whether any command needs to be applied."""
+        return bool(self.commands)
+
+    def get_summary(self) -> str:
+        """
+        Get human-readable summary of the plan.
+
+        Returns:
+            One-line summary of planned operations
+        """
+        if not self.has_changes:
+            return "No changes to apply."
+        return (
+            f"Plan: {self.added} to add, {self.changed} to change, "
+            f"{self.removed} to remove, {self.moved} to move"
+        )
+
+    def to_script(self) -> str:
+        """
+        Render the plan as a RouterOS script.
+
+        Returns:
+            .rsc script applying the changes
+        """
+        lines = [
+            "# Change plan generated by router-policy-to-config",
+            f"# {self.get_summary()}",
+            "# Review carefully before applying!",
+            "",
+        ]
+        lines.extend(self.commands)
+        return "\n".join(lines)
+
+
+def _join_continuations(config: str) -> List[str]:
+    """Split an export into logical lines, joining backslash continuations."""
+    lines: List[str] = []
+    pending = ""
+
+    for raw in config.split("\n"):
+        line = raw.strip()
+        if line.endswith("\\"):
+            pending += line[:-1]
+            continue
+        line = pending + line
+        pending = ""
+        if line and not line.startswith("#"):
+            lines.append(line)
+
+    if pending:
+        lines.append(pending)
+    return lines
+
+
+def _quote(value: str) -> str:
+    """Quote a property value if RouterOS requires it."""
+    if value and not any(c in value for c in ' "\\;$[]{}=\t'):
+        return value
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def _parse_command(menu: str, text: str, line: str) -> Optional[_Item]:
+    """Parse 'add k=v ...' / 'set target k=v ...' into an item."""
+    try:
+        tokens = shlex.split(text, posix=True)
+    except ValueError:
+        tokens = text.split()
+    if not tokens:
+        return None
+
+    verb, rest = tokens[0], tokens[1:]
+    props: Dict[str, str] = {}
+    positional: List[str] = []
+
+    depth = 0  # Inside a [ find ... ] target expression
+    for token in rest:
+        key, sep, value = token.partition("=")
+        if sep and key and not depth and not key.startswith("["):
+            props[key] = value
+        else:
+            positional.append(token)
+            depth += token.count("[") - token.count("]")
+
+    target = " ".join(positional) or None
+    return _Item(menu=menu, verb=verb, target=target, props=props, line=line)
+
+
+def parse_routeros_config(config: str) -> List[_Item]:
+    """
+    Parse a RouterOS export or generated script into commands.
+
+    Both the block form ("/ip address" followed by "add ..." lines) and
+    the one-line form ("/ip address add ...") are accepted.
+
+    Args:
+        config: RouterOS configuration text
+
+    Returns:
+        List of parsed commands in file order
+    """
+    items: List[_Item] = []
+    menu = ""
+
+    for line in _join_continuations(config):
+        if line.startswith("/"):
+            menu = _menu_path(line)
+            text = line[len(menu):].strip()
+            if not text:
+                continue
+        else:
+            text = line
+
+        item = _parse_command(menu, text, line)
+        if item:
+            items.append(item)
+
+    return items
+
+
+def _identity_keys(item: _Item) -> Tuple[str, ...]:
+    """Get the property names identifying an item within its menu."""
+    if item.props.get("comment"):
+        return ("chain", "comment") if item.menu in ORDERED_MENUS else ("comment",)
+    if item.props.get("name"):
+        return ("name",)
+    return IDENTITY_KEYS.get(item.menu, ())
+
+
+def _identity(item: _Item) -> Identity:
+    """Get the stable identity of an item (all properties when no key applies)."""
+    keys = _identity_keys(item)
+    if keys:
+        identity = tuple((key, item.props.get(key)) for key in keys)
+    else:
+        identity = tuple(sorted(
+            (k, v) for k, v in item.props.items() if k not in _PLACEMENT_KEYS and k != "comment"
+        ))
+    # An uncommented item must not select a commented one sharing its keys
+    if not item.props.get("comment") and keys != ("name",):
+        identity += (("comment", ""),)
+    return identity
+
+
+def _find(item: _Item) -> str:
+    """Build a [find ...] expression selecting an item by its identity."""
+    conditions = " ".join(f"{key}={_quote(value)}" for key, value in _identity(item) if value is not None)
+    return f"[find {conditions}]" if conditions else "[find]"
+
+
+def _matches(item: _Item, identity: Identity) -> bool:
+    """Check whether [find] with the given identity would select an item."""
+    return all(item.props.get(key, "") == value for key, value in identity if value is not None)
+
+
+def _select(item: _Item, device: List[_Item]) -> str:
+    """
+    Build an expression selecting exactly one item on the device.
+
+    When the identity matches several items, the item is picked by its
+    position among them, e.g. ([find comment=dup]->1).
+    """
+    identity = _identity(item)
+    same = [other for other in device if _matches(other, identity)]
+    if len(same) > 1:
+        position = next(i for i, other in enumerate(same) if other is item)
+        return f"({_find(item)}->{position})"
+    return _find(item)
+
+
+def _without(props: Dict[str, str], *keys: str) -> Dict[str, str]:
+    """Get properties except placement and the given keys."""
+    return {k: v for k, v in props.items() if k not in _PLACEMENT_KEYS and k not in keys}
+
+
+def _format_props(props: Dict[str, str]) -> str:
+    """Format properties as k=v pairs."""
+    return " ".join(f"{key}={_quote(value)}" for key, value in props.items())
+
+
+def _stable_positions(sequence: List[int]) -> set:
+    """Get indexes of a longest increasing subsequence (items that need no move)."""
+    tails: List[int] = []  # Index into sequence of the smallest tail for each length
+    previous: List[Optional[int]] = [None] * len(sequence)
+
+    for i, value in enumerate(sequence):
+        lo, hi = 0, len(tails)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if sequence[tails[mid]] < value:
+                lo = mid + 1
+            else:
+                hi = mid
+        previous[i] = tails[lo - 1] if lo else None
+        if lo == len(tails):
+            tails.append(i)
+        else:
+            tails[lo] = i
+
+    stable = set()
+    index = tails[-1] if tails else None
+    while index is not None:
+        stable.add(index)
+        index = previous[index]
+    return stable
+
+
+class RouterOSPlanner:
+    """Plan minimal RouterOS changes from current and generated configurations."""
+
+    def __init__(self, current_config: str, generated_config: str, prune: bool = True):
+        """
+        Initialize planner.
+
+        Args:
+            current_config: Current RouterOS configuration (export)
+            generated_config: Generated configuration from policy
+            prune: Remove items the device has in menus managed by the policy
+        """
+        self.current = current_config
+        self.generated = generated_config
+        self.prune = prune
+
+    def _group(self, items: List[_Item]) -> Dict[str, List[Tuple[Identity, _Item]]]:
+        """Group add commands by menu, making duplicate identities unique by occurrence."""
+        menus: Dict[str, List[Tuple[Identity, _Item]]] = {}
+        seen: Dict[Tuple[str, Identity], int] = {}
+
+        for item in items:
+            if item.verb != "add":
+                continue
+            identity = _identity(item)
+            occurrence = seen.get((item.menu, identity), 0)
+            seen[(item.menu, identity)] = occurrence + 1
+            if occurrence:
+                identity = identity + (("#", str(occurrence)),)
+            menus.setdefault(item.menu, []).append((identity, item))
+
+        return menus
+
+    def _plan_menu(
+        self,
+        menu: str,
+        current: List[Tuple[Identity, _Item]],
+        generated: List[Tuple[Identity, _Item]],
+        plan: RouterOSPlan,
+        removals: List[str],
+    ) -> None:
+        """
+        Plan add/set/move commands for one menu and collect its removals.
+
+        Only properties the generated configuration specifies are set;
+        properties present solely on the device are left untouched. The
+        device item list is simulated while planning so every command
+        selects exactly one item, even when identities are duplicated.
+        """
+        ordered = menu in ORDERED_MENUS
+        commands: List[str] = []
+
+        # Simulated device state: copies updated as commands are planned
+        device = [replace(item, props=dict(item.props)) for _, item in current]
+        current_by_id = {identity: device[i] for i, (identity, _) in enumerate(current)}
+        on_device: Dict[Identity, _Item] = {
+            identity: current_by_id[identity] for identity, _ in generated if identity in current_by_id
+        }
+
+        # Changed properties of matched items
+        for identity, item in generated:
+            existing = on_device.get(identity)
+            if existing is None:
+                continue
+            changes = {
+                key: value for key, value in _without(item.props).items()
+                if existing.props.get(key) != value
+            }
+            if changes:
+                commands.append(f"{menu} set {_select(existing, device)} {_format_props(changes)}")
+                existing.props.update(changes)
+                plan.changed += 1
+
+        # Uncommented device items that only lack the generated comment
+        unmatched = [existing for existing in device if existing not in on_device.values()]
+        for identity, item in generated:
+            if identity in on_device or not item.props.get("comment"):
+                continue
+            wanted = _without(item.props, "comment")
+            existing = next(
+                (other for other in unmatched
+                 if not other.props.get("comment") and _without(other.props, "comment") == wanted),
+                None,
+            )
+            if existing is None:
+                continue
+            commands.append(f"{menu} set {_select(existing, device)} comment={_quote(item.props['comment'])}")
+            existing.props["comment"] = item.props["comment"]
+            unmatched.remove(existing)
+            on_device[identity] = existing
+            plan.changed += 1
+
+        # New items, placed before the next rule that already exists on the device
+        for index, (identity, item) in enumerate(generated):
+            if identity in on_device:
+                continue
+            added = replace(item, props=_without(item.props))
+            command = f"{menu} add {_format_props(added.props)}"
+            following = None
+            if ordered:
+                following = next(
+                    (on_device[other_id] for other_id, _ in generated[index + 1:] if other_id in on_device),
+                    None,
+                )
+                if following is not None:
+                    command += f" place-before={_select(following, device)}"
+            commands.append(command)
+            device.insert(device.index(following) if following is not None else len(device), added)
+            plan.added += 1
+
+        # Reorder matched rules whose relative order differs
+        if ordered:
+            matched = [on_device[identity] for identity, _ in generated if identity in on_device]
+            stable = _stable_positions([device.index(existing) for existing in matched])
+            # Last to first, so every destination is already in its final place
+            for i in reversed(range(len(matched))):
+                if i in stable:
+                    continue
+                following = matched[i + 1] if i + 1 < len(matched) else None
+                destination = f" destination={_select(following, device)}" if following is not None else ""
+                commands.append(f"{menu} move {_select(matched[i], device)}{destination}")
+                device.remove(matched[i])
+                device.insert(device.index(following) if following is not None else len(device), matched[i])
+                plan.moved += 1
+
+        if self.prune:
+            for existing in unmatched:
+                removals.append(f"{menu} remove {_select(existing, device)}")
+                device.remove(existing)
+                plan.removed += 1
+
+        plan.commands.extend(commands)
+
+    def plan(self) -> RouterOSPlan:
+        """
+        Compute the change plan.
+
+        Commands are ordered so the device never loses connectivity
+        unnecessarily: changes and additions come first (menus in
+        generated order, so interfaces exist before their addresses),
+        removals last and in reverse menu order.
+
+        Returns:
+            RouterOSPlan with the commands to apply
+        """
+        current_items = parse_routeros_config(self.current)
+        generated_items = parse_routeros_config(self.generated)
+
+        current_menus = self._group(current_items)
+        generated_menus = self._group(generated_items)
+
+        plan = RouterOSPlan()
+        removals_by_menu: List[List[str]] = []
+
+        for item in generated_items:
+            # Singleton settings and positional sets ("set pppoe-out1 mtu=1492")
+            if item.verb == "set" and not any(
+                existing.verb == "set"
+                and existing.menu == item.menu
+                and existing.target == item.target
+                and all(existing.props.get(k) == v for k, v in item.props.items())
+                for existing in current_items
+            ):
+                target = f" {item.target}" if item.target else ""
+                plan.commands.append(f"{item.menu} set{target} {_format_props(item.props)}")
+                plan.changed += 1
+
+        for menu, generated in generated_menus.items():
+            removals: List[str] = []
+            self._plan_menu(menu, current_menus.get(menu, []), generated, plan, removals)
+            removals_by_menu.append(removals)
+
+        for removals in reversed(removals_by_menu):
+            plan.commands.extend(removals)
+
+        return plan
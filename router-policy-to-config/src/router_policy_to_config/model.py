@@ -3,13 +3,18 @@ Data models for router policy configuration.
 
 This module defines the core data structures representing a vendor-agnostic
 router policy that can be compiled into RouterOS and OpenWrt configurations.
+
+All models are slotted dataclasses (no per-instance __dict__). For
+fleet-sized in-memory analysis, compact_policy() additionally interns
+repeated strings and converts list fields to tuples.
 """
 
-from dataclasses import dataclass, field
-from typing import List, Optional
+import sys
+from dataclasses import dataclass, field, fields, is_dataclass
+from typing import Dict, List, Optional, Tuple
 
 
-@dataclass
+@dataclass(slots=True)
 class Target:
     """Target platform configuration."""
 
@@ -17,7 +22,7 @@ class Target:
     version: Optional[str] = None  # e.g., v6, v7 for RouterOS
 
 
-@dataclass
+@dataclass(slots=True)
 class Meta:
     """Policy metadata."""
 
@@ -26,7 +31,7 @@ class Meta:
     target: Target = field(default_factory=lambda: Target(vendor="routeros"))
 
 
-@dataclass
+@dataclass(slots=True)
 class WANConfig:
     """WAN (Wide Area Network) configuration."""
 
@@ -41,7 +46,7 @@ class WANConfig:
     mtu: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class DHCPConfig:
     """DHCP server configuration."""
 
@@ -51,7 +56,7 @@ class DHCPConfig:
     dns_servers: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class LANConfig:
     """LAN (Local Area Network) configuration."""
 
@@ -64,7 +69,7 @@ class LANConfig:
     isolated_from: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class SecurityConfig:
     """WiFi security configuration."""
 
@@ -74,7 +79,7 @@ class SecurityConfig:
     radius_secret_ref: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class WiFiConfig:
     """WiFi access point configuration."""
 
@@ -89,7 +94,7 @@ class WiFiConfig:
     security: Optional[SecurityConfig] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class VPNPeer:
     """VPN peer configuration."""
 
@@ -98,7 +103,7 @@ class VPNPeer:
     allowed_ips: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class VPNConfig:
     """VPN configuration."""
 
@@ -113,7 +118,7 @@ class VPNConfig:
     peers: List[VPNPeer] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class FirewallRule:
     """Firewall rule definition."""
 
@@ -123,12 +128,14 @@ class FirewallRule:
     to_zones: List[str] = field(default_factory=list)
     protocol: Optional[str] = None  # tcp, udp, icmp, all
     port: Optional[str] = None  # Port number or range
+    src_ip: Optional[str] = None  # Source host or network (CIDR)
+    dest_ip: Optional[str] = None  # Destination host or network (CIDR)
     state: List[str] = field(default_factory=list)
     log: bool = False
     comment: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Firewall:
     """Firewall configuration."""
 
@@ -136,7 +143,7 @@ class Firewall:
     rules: List[FirewallRule] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class DNSConfig:
     """DNS configuration."""
 
@@ -145,7 +152,7 @@ class DNSConfig:
     forwarders: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class PortForward:
     """Port forwarding rule."""
 
@@ -156,7 +163,7 @@ class PortForward:
     internal_port: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class NATConfig:
     """NAT configuration."""
 
@@ -164,7 +171,15 @@ class NATConfig:
     port_forwards: List[PortForward] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
+class PerformanceConfig:
+    """Connection fast-path settings."""
+
+    fasttrack: bool = False  # RouterOS FastTrack / OpenWrt software flow offloading
+    hw_offload: bool = False  # RouterOS v7 hw-offload / OpenWrt flow_offloading_hw (requires fasttrack)
+
+
+@dataclass(slots=True)
 class Policy:
     """
     Complete router policy.
@@ -181,3 +196,63 @@ class Policy:
     firewall: Optional[Firewall] = None
     dns: Optional[DNSConfig] = None
     nat: Optional[NATConfig] = None
+    performance: Optional[PerformanceConfig] = None
+
+
+# Fields whose values repeat across rules and peers (zones, protocols,
+# actions, ports). Secrets and free-form names are never interned.
+_INTERNED_FIELDS = {
+    FirewallRule: frozenset({"action", "from_zones", "to_zones", "protocol", "port", "state"}),
+    PortForward: frozenset({"protocol"}),
+    LANConfig: frozenset({"isolated_from"}),
+    WiFiConfig: frozenset({"lan", "mode", "band"}),
+    VPNConfig: frozenset({"type", "role"}),
+}
+
+
+# Per-class (field name, intern) pairs, computed on first use
+_COMPACT_SPECS: Dict[type, Tuple[Tuple[str, bool], ...]] = {}
+
+
+def _compact_value(value, intern: bool):
+    """Compact a field value: recurse into models, freeze lists, intern strings."""
+    if isinstance(value, str):
+        return sys.intern(value) if intern else value
+    if isinstance(value, list):
+        return tuple([_compact_value(item, intern) for item in value])
+    if is_dataclass(value):
+        _compact_model(value)
+    return value
+
+
+def _compact_model(obj) -> None:
+    """Compact a model instance in place."""
+    spec = _COMPACT_SPECS.get(type(obj))
+    if spec is None:
+        interned = _INTERNED_FIELDS.get(type(obj), frozenset())
+        spec = tuple((f.name, f.name in interned) for f in fields(obj))
+        _COMPACT_SPECS[type(obj)] = spec
+
+    for name, intern in spec:
+        value = getattr(obj, name)
+        if value is not None:
+            setattr(obj, name, _compact_value(value, intern))
+
+
+def compact_policy(policy: Policy) -> Policy:
+    """
+    Reduce the memory footprint of a policy for read-only workloads.
+
+    Converts every list field to a tuple and interns zone, protocol,
+    action, port and state strings so identical values are shared
+    across rules. The policy is modified in place; afterwards its
+    collections can no longer be appended to.
+
+    Args:
+        policy: Policy instance
+
+    Returns:
+        The same policy instance
+    """
+    _compact_model(policy)
+    return policy
@@ -0,0 +1,154 @@
+"""
+Network index module.
+
+Sorted interval index over IP networks. CIDR networks are either disjoint
+or nested, so after sorting by (start, -end) every network's enclosing
+networks form a stack. That gives overlap detection in O(n log n + k)
+and longest-prefix "which network contains this IP" lookups in O(log n).
+"""
+
+import ipaddress
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+IPNetwork = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+IPAddress = Union[str, ipaddress.IPv4Address, ipaddress.IPv6Address]
+
+
+@dataclass
+class _Entry:
+    """Indexed network with its integer address range."""
+
+    start: int
+    end: int
+    order: int  # Insertion order, used for stable reporting
+    name: str
+    network: IPNetwork
+    parent: Optional[int] = None  # Index of the smallest enclosing network
+
+
+class NetworkIndex:
+    """Index of named IP networks for overlap and containment queries."""
+
+    def __init__(self, networks: Iterable[Tuple[str, IPNetwork]]):
+        """
+        Build the index.
+
+        Args:
+            networks: Iterable of (name, network) tuples
+        """
+        by_version: Dict[int, List[_Entry]] = {}
+
+        for order, (name, network) in enumerate(networks):
+            entry = _Entry(
+                start=int(network.network_address),
+                end=int(network.broadcast_address),
+                order=order,
+                name=name,
+                network=network,
+            )
+            by_version.setdefault(network.version, []).append(entry)
+
+        self._entries: Dict[int, List[_Entry]] = {}
+        self._starts: Dict[int, List[int]] = {}
+        self._overlaps: List[Tuple[_Entry, _Entry]] = []
+
+        for version, entries in by_version.items():
+            entries.sort(key=lambda e: (e.start, -e.end, e.order))
+            self._entries[version] = entries
+            self._starts[version] = [e.start for e in entries]
+            self._link_parents(entries)
+
+        self._overlaps.sort(key=lambda pair: (pair[0].order, pair[1].order))
+
+    @classmethod
+    def from_lans(cls, lans) -> "NetworkIndex":
+        """
+        Build an index from LAN configurations, skipping invalid subnets.
+
+        Args:
+            lans: Iterable of LANConfig
+
+        Returns:
+            NetworkIndex keyed by LAN name
+        """
+        networks = []
+        for lan in lans:
+            try:
+                networks.append((lan.name, ipaddress.ip_network(lan.subnet, strict=False)))
+            except ValueError:
+                continue
+        return cls(networks)
+
+    def _link_parents(self, entries: List[_Entry]) -> None:
+        """Sweep sorted entries, recording parents and overlapping pairs."""
+        stack: List[int] = []
+
+        for i, entry in enumerate(entries):
+            while stack and entries[stack[-1]].end < entry.start:
+                stack.pop()
+
+            # Every network left on the stack encloses the current one
+            if stack:
+                entry.parent = stack[-1]
+            for j in stack:
+                first, second = sorted((entries[j], entry), key=lambda e: e.order)
+                self._overlaps.append((first, second))
+
+            stack.append(i)
+
+    def overlaps(self) -> List[Tuple[str, IPNetwork, str, IPNetwork]]:
+        """
+        Get all pairs of overlapping networks.
+
+        Returns:
+            List of (name1, network1, name2, network2) in insertion order
+        """
+        return [(a.name, a.network, b.name, b.network) for a, b in self._overlaps]
+
+    def lookup_network(self, ip: IPAddress) -> Optional[Tuple[str, IPNetwork]]:
+        """
+        Find the most specific network containing an IP address.
+
+        Args:
+            ip: IP address
+
+        Returns:
+            (name, network) tuple, or None if no network contains the address
+
+        Raises:
+            ValueError: If ip is not a valid IP address
+        """
+        address = ipaddress.ip_address(ip)
+        entries = self._entries.get(address.version)
+        if not entries:
+            return None
+
+        value = int(address)
+        index: Optional[int] = bisect_right(self._starts[address.version], value) - 1
+
+        # Walk up enclosing networks - depth is bounded by the prefix length
+        while index is not None and index >= 0:
+            entry = entries[index]
+            if value <= entry.end:
+                return entry.name, entry.network
+            index = entry.parent
+
+        return None
+
+    def lookup(self, ip: IPAddress) -> Optional[str]:
+        """
+        Find the name of the most specific network containing an IP address.
+
+        Args:
+            ip: IP address
+
+        Returns:
+            Network name, or None if no network contains the address
+        """
+        found = self.lookup_network(ip)
+        return found[0] if found else None
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
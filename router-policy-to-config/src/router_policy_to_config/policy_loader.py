@@ -2,15 +2,24 @@
 Policy loader module.
 
 Loads and validates YAML policy files against the JSON schema.
+
+Policies can inherit from base policies (``extends:``) and pull in shared
+fragments (``include:``). Referenced files are parsed once per process and
+cached by path and content hash, so a fleet of branch policies sharing one
+baseline parses it a single time.
 """
 
+import hashlib
 import os
+import threading
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import jsonschema
-import yaml
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
 
+from router_policy_to_config import yaml_utils
 from router_policy_to_config.model import (
     DHCPConfig,
     DNSConfig,
@@ -19,6 +28,7 @@ from router_policy_to_config.model import (
     LANConfig,
     Meta,
     NATConfig,
+    PerformanceConfig,
     Policy,
     PortForward,
     SecurityConfig,
@@ -36,15 +46,94 @@ class PolicyLoadError(Exception):
     pass
 
 
+# Compiled schema validators shared by all loaders in the process,
+# keyed by (resolved schema path, schema file mtime)
+_VALIDATOR_CACHE: Dict[Tuple[str, float], Any] = {}
+_VALIDATOR_LOCK = threading.Lock()
+
+
+# Parsed extends/include fragments shared by all loaders in the process,
+# keyed by (resolved path, sha256 of file content)
+_FRAGMENT_CACHE: Dict[Tuple[str, str], Dict[str, Any]] = {}
+_FRAGMENT_LOCK = threading.Lock()
+
+# Top-level keys that reference other policy files
+INHERITANCE_KEYS = ("extends", "include")
+
+# Lists merged item-by-item on "name" instead of being replaced
+_MERGE_BY_NAME = {("lans",), ("firewall", "rules"), ("nat", "port_forwards")}
+
+
+def _clone(value: Any) -> Any:
+    """Copy nested dicts and lists so cached fragments are never shared."""
+    if isinstance(value, dict):
+        return {k: _clone(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_clone(item) for item in value]
+    return value
+
+
+def merge_policy_data(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Deep-merge policy data, with override taking precedence.
+
+    Mappings are merged recursively. Items of lans, firewall.rules and
+    nat.port_forwards are matched by name: a matching item is merged, a
+    new one is appended. Any other list is replaced.
+
+    Args:
+        base: Base policy data
+        override: Policy data applied on top of base
+
+    Returns:
+        New merged dictionary (inputs are not modified)
+    """
+    return _merge(base, override, ())
+
+
+def _merge(base: Any, override: Any, path: Tuple[str, ...]) -> Any:
+    """Merge override into base at the given key path."""
+    if isinstance(base, dict) and isinstance(override, dict):
+        merged = {k: _clone(v) for k, v in base.items()}
+        for key, value in override.items():
+            merged[key] = _merge(merged[key], value, path + (key,)) if key in merged else _clone(value)
+        return merged
+
+    if isinstance(base, list) and isinstance(override, list) and path in _MERGE_BY_NAME:
+        merged = [_clone(item) for item in base]
+        positions = {
+            item["name"]: i for i, item in enumerate(merged) if isinstance(item, dict) and item.get("name")
+        }
+        for item in override:
+            name = item.get("name") if isinstance(item, dict) else None
+            if name in positions:
+                # Item path: nested lists inside items are replaced, not name-merged
+                merged[positions[name]] = _merge(merged[positions[name]], item, path + ("[]",))
+            else:
+                if name:
+                    positions[name] = len(merged)
+                merged.append(_clone(item))
+        return merged
+
+    return _clone(override)
+
+
+def _format_schema_error(error: jsonschema.ValidationError) -> str:
+    """Format a schema error with the path of the offending field."""
+    location = ".".join(str(part) for part in error.absolute_path)
+    return f"{location}: {error.message}" if location else error.message
+
+
 class PolicyLoader:
     """Load and validate YAML policy files."""
 
-    def __init__(self, schema_path: Optional[str] = None):
+    def __init__(self, schema_path: Optional[str] = None, collect_all_errors: bool = False):
         """
         Initialize policy loader.
 
         Args:
             schema_path: Path to policy schema YAML file. If None, uses default.
+            collect_all_errors: Report every schema error instead of the most relevant one
         """
         if schema_path is None:
             # Default to schema in the package
@@ -52,7 +141,11 @@ class PolicyLoader:
             schema_path = pkg_dir / "schema" / "policy-schema.yaml"
 
         self.schema_path = Path(schema_path)
-        self.schema = self._load_schema()
+        self.collect_all_errors = collect_all_errors
+        self.validator = self._get_validator()
+        self.schema = self.validator.schema
+        # Files referenced via extends/include by the last load_yaml() call
+        self.last_references: List[Path] = []
 
     def _load_schema(self) -> Dict[str, Any]:
         """Load JSON schema from YAML file."""
@@ -60,7 +153,39 @@ class PolicyLoader:
             raise PolicyLoadError(f"Schema file not found: {self.schema_path}")
 
         with open(self.schema_path, "r") as f:
-            return yaml.safe_load(f)
+            return yaml_utils.safe_load(f)
+
+    def _get_validator(self) -> Any:
+        """
+        Get the compiled validator for the schema file.
+
+        The schema is checked and compiled once per path and mtime, and the
+        validator is shared process-wide, so creating many loaders is cheap.
+        """
+        if not self.schema_path.exists():
+            raise PolicyLoadError(f"Schema file not found: {self.schema_path}")
+
+        resolved = str(self.schema_path.resolve())
+        key = (resolved, self.schema_path.stat().st_mtime)
+
+        with _VALIDATOR_LOCK:
+            validator = _VALIDATOR_CACHE.get(key)
+            if validator is None:
+                schema = self._load_schema()
+                validator_cls = validator_for(schema)
+                try:
+                    validator_cls.check_schema(schema)
+                except jsonschema.SchemaError as e:
+                    raise PolicyLoadError(f"Invalid schema: {e.message}")
+
+                # Drop validators compiled from older versions of this file
+                for stale_key in [k for k in _VALIDATOR_CACHE if k[0] == resolved]:
+                    del _VALIDATOR_CACHE[stale_key]
+
+                validator = validator_cls(schema)
+                _VALIDATOR_CACHE[key] = validator
+
+        return validator
 
     def _resolve_secrets(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -93,10 +218,81 @@ class PolicyLoader:
 
         return resolve_value(data)
 
+    def _parse_file(self, path: Path) -> Any:
+        """Parse a YAML file, raising PolicyLoadError on syntax errors."""
+        try:
+            with open(path, "r") as f:
+                return yaml_utils.safe_load(f)
+        except yaml_utils.YAMLError as e:
+            raise PolicyLoadError(f"Failed to parse YAML: {e}")
+
+    def _load_fragment(self, path: Path) -> Dict[str, Any]:
+        """Load a referenced policy file through the process-wide fragment cache."""
+        content = path.read_bytes()
+        resolved = str(path.resolve())
+        key = (resolved, hashlib.sha256(content).hexdigest())
+
+        with _FRAGMENT_LOCK:
+            data = _FRAGMENT_CACHE.get(key)
+        if data is not None:
+            return data
+
+        try:
+            data = yaml_utils.safe_load(content)
+        except yaml_utils.YAMLError as e:
+            raise PolicyLoadError(f"Failed to parse YAML in {path}: {e}")
+
+        if data is None:
+            data = {}
+        if not isinstance(data, dict):
+            raise PolicyLoadError(f"Referenced policy file must be a mapping: {path}")
+
+        with _FRAGMENT_LOCK:
+            # Drop entries parsed from older versions of this file
+            for stale_key in [k for k in _FRAGMENT_CACHE if k[0] == resolved]:
+                del _FRAGMENT_CACHE[stale_key]
+            _FRAGMENT_CACHE[key] = data
+
+        return data
+
+    def _resolve_inheritance(self, data: Dict[str, Any], path: Path, chain: Tuple[str, ...]) -> Dict[str, Any]:
+        """Merge files referenced by extends/include under the policy data."""
+        references: List[str] = []
+        for key in INHERITANCE_KEYS:
+            value = data.get(key) or []
+            if isinstance(value, str):
+                value = [value]
+            if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+                raise PolicyLoadError(f"'{key}' must be a file path or a list of file paths in {path}")
+            references.extend(value)
+
+        chain = chain + (str(path.resolve()),)
+        merged: Dict[str, Any] = {}
+
+        for reference in references:
+            ref_path = path.parent / reference
+            if not ref_path.is_file():
+                raise PolicyLoadError(f"Referenced policy file not found: {reference} (from {path})")
+            if str(ref_path.resolve()) in chain:
+                cycle = " -> ".join([*chain, str(ref_path.resolve())])
+                raise PolicyLoadError(f"Circular extends/include: {cycle}")
+
+            self.last_references.append(ref_path)
+            fragment = self._load_fragment(ref_path)
+            merged = merge_policy_data(merged, self._resolve_inheritance(fragment, ref_path, chain))
+
+        own = {k: v for k, v in data.items() if k not in INHERITANCE_KEYS}
+        if not references:
+            return own
+        return merge_policy_data(merged, own)
+
     def load_yaml(self, path: str) -> Dict[str, Any]:
         """
         Load YAML policy file.
 
+        Files listed in extends/include (relative to the referencing file)
+        are merged first, in order, and the policy's own content on top.
+
         Args:
             path: Path to YAML policy file
 
@@ -104,20 +300,33 @@ class PolicyLoader:
             Policy data as dictionary
 
         Raises:
-            PolicyLoadError: If file cannot be loaded or parsed
+            PolicyLoadError: If a file cannot be loaded or parsed, or references are circular
         """
         policy_path = Path(path)
         if not policy_path.exists():
             raise PolicyLoadError(f"Policy file not found: {path}")
 
-        try:
-            with open(policy_path, "r") as f:
-                data = yaml.safe_load(f)
-        except yaml.YAMLError as e:
-            raise PolicyLoadError(f"Failed to parse YAML: {e}")
+        self.last_references = []
+        data = self._parse_file(policy_path)
+
+        if isinstance(data, dict) and any(key in data for key in INHERITANCE_KEYS):
+            data = self._resolve_inheritance(data, policy_path, ())
 
         return data
 
+    def schema_errors(self, data: Dict[str, Any]) -> List[str]:
+        """
+        Collect all schema errors for policy data.
+
+        Args:
+            data: Policy data dictionary
+
+        Returns:
+            List of error messages prefixed with the field path, sorted by path
+        """
+        errors = sorted(self.validator.iter_errors(data), key=lambda e: [str(p) for p in e.absolute_path])
+        return [_format_schema_error(e) for e in errors]
+
     def validate_schema(self, data: Dict[str, Any]) -> None:
         """
         Validate policy data against JSON schema.
@@ -128,12 +337,16 @@ class PolicyLoader:
         Raises:
             PolicyLoadError: If validation fails
         """
-        try:
-            jsonschema.validate(instance=data, schema=self.schema)
-        except jsonschema.ValidationError as e:
-            raise PolicyLoadError(f"Schema validation failed: {e.message}")
-        except jsonschema.SchemaError as e:
-            raise PolicyLoadError(f"Invalid schema: {e.message}")
+        # Fast path: stops at the first error, valid policies pay nothing extra
+        if self.validator.is_valid(data):
+            return
+
+        if self.collect_all_errors:
+            errors = self.schema_errors(data)
+            raise PolicyLoadError("Schema validation failed:\n" + "\n".join(f"  - {e}" for e in errors))
+
+        error = best_match(self.validator.iter_errors(data))
+        raise PolicyLoadError(f"Schema validation failed: {error.message}")
 
     def _parse_dhcp(self, data: Dict[str, Any]) -> DHCPConfig:
         """Parse DHCP configuration."""
@@ -269,6 +482,8 @@ class PolicyLoader:
                     to_zones=rule_data.get("to", []),
                     protocol=rule_data.get("protocol"),
                     port=rule_data.get("port"),
+                    src_ip=rule_data.get("src_ip"),
+                    dest_ip=rule_data.get("dest_ip"),
                     state=rule_data.get("state", []),
                     log=rule_data.get("log", False),
                     comment=rule_data.get("comment"),
@@ -310,6 +525,15 @@ class PolicyLoader:
                 port_forwards=port_forwards,
             )
 
+        # Parse performance
+        performance = None
+        if "performance" in data:
+            perf_data = data["performance"]
+            performance = PerformanceConfig(
+                fasttrack=perf_data.get("fasttrack", False),
+                hw_offload=perf_data.get("hw_offload", False),
+            )
+
         return Policy(
             meta=meta,
             wan=wan,
@@ -319,6 +543,7 @@ class PolicyLoader:
             firewall=firewall,
             dns=dns,
             nat=nat,
+            performance=performance,
         )
 
     def load(self, path: str, validate: bool = True) -> Policy:
@@ -6,9 +6,10 @@ such as checking for subnet overlaps, referential integrity, etc.
 """
 
 import ipaddress
-from typing import List, Set
+from typing import List, Optional, Set
 
 from router_policy_to_config.model import Policy
+from router_policy_to_config.network_index import NetworkIndex
 
 
 class ValidationError(Exception):
@@ -30,9 +31,10 @@ class PolicyValidator:
         self.policy = policy
         self.errors: List[str] = []
         self.warnings: List[str] = []
+        self.lan_index: Optional[NetworkIndex] = None
 
-    def _check_subnet_overlaps(self) -> None:
-        """Check for overlapping subnets in LANs."""
+    def _build_lan_index(self) -> NetworkIndex:
+        """Parse LAN subnets into a network index, reporting invalid ones."""
         networks = []
         for lan in self.policy.lans:
             try:
@@ -41,11 +43,12 @@ class PolicyValidator:
             except ValueError as e:
                 self.errors.append(f"Invalid subnet for LAN '{lan.name}': {e}")
 
-        # Check for overlaps
-        for i, (name1, net1) in enumerate(networks):
-            for name2, net2 in networks[i + 1 :]:
-                if net1.overlaps(net2):
-                    self.errors.append(f"Subnets overlap: '{name1}' ({net1}) and '{name2}' ({net2})")
+        return NetworkIndex(networks)
+
+    def _check_subnet_overlaps(self) -> None:
+        """Check for overlapping subnets in LANs."""
+        for name1, net1, name2, net2 in self.lan_index.overlaps():
+            self.errors.append(f"Subnets overlap: '{name1}' ({net1}) and '{name2}' ({net2})")
 
     def _check_gateway_in_subnet(self) -> None:
         """Verify gateway IPs are within their respective subnets."""
@@ -119,14 +122,24 @@ class PolicyValidator:
 
     def _check_isolation_references(self) -> None:
         """Verify isolation references point to existing LANs."""
-        lan_names = {lan.name for lan in self.policy.lans}
+        lans_by_name = {lan.name: lan for lan in self.policy.lans}
 
         for lan in self.policy.lans:
             for isolated_name in lan.isolated_from:
-                if isolated_name not in lan_names:
+                if isolated_name not in lans_by_name:
                     self.errors.append(
                         f"LAN '{lan.name}' isolation references non-existent LAN '{isolated_name}'"
                     )
+                elif (
+                    self.policy.meta.target.vendor == "routeros"
+                    and not lan.vlan_id
+                    and not lans_by_name[isolated_name].vlan_id
+                ):
+                    # Both LANs sit directly on bridge-lan, so their interface lists are identical
+                    self.warnings.append(
+                        f"LAN '{lan.name}' isolation from '{isolated_name}' has no effect on RouterOS "
+                        f"without a vlan_id on either LAN"
+                    )
 
     def _check_firewall_zone_references(self) -> None:
         """Verify firewall rules reference valid zones."""
@@ -171,25 +184,9 @@ class PolicyValidator:
             return
 
         # Check internal IPs are in LAN subnets
-        lan_networks = []
-        for lan in self.policy.lans:
-            try:
-                network = ipaddress.ip_network(lan.subnet, strict=False)
-                lan_networks.append((lan.name, network))
-            except ValueError:
-                pass  # Already reported in subnet check
-
         for pf in self.policy.nat.port_forwards:
             try:
-                internal_ip = ipaddress.ip_address(pf.internal_ip)
-                found = False
-
-                for lan_name, network in lan_networks:
-                    if internal_ip in network:
-                        found = True
-                        break
-
-                if not found:
+                if self.lan_index.lookup(pf.internal_ip) is None:
                     self.warnings.append(
                         f"Port forward to {pf.internal_ip} is not in any defined LAN subnet"
                     )
@@ -197,6 +194,31 @@ class PolicyValidator:
             except ValueError:
                 self.errors.append(f"Invalid internal IP in port forward: {pf.internal_ip}")
 
+    def _check_performance(self) -> None:
+        """Check fast-path settings against features that FastTrack bypasses."""
+        performance = self.policy.performance
+        if not performance:
+            return
+
+        if performance.hw_offload and not performance.fasttrack:
+            self.errors.append("performance.hw_offload requires performance.fasttrack")
+
+        if not performance.fasttrack:
+            return
+
+        # Fast-pathed packets skip IPsec policy matching and would leave the tunnel unencrypted
+        if any(vpn.type == "ipsec" for vpn in self.policy.vpn):
+            self.errors.append(
+                "performance.fasttrack is incompatible with IPsec VPN: fast-tracked packets bypass IPsec policies"
+            )
+
+        target = self.policy.meta.target
+        if performance.hw_offload and target.vendor == "routeros" and target.version == "v6":
+            self.warnings.append("performance.hw_offload requires RouterOS v7, ignored for v6")
+
+        if self.policy.firewall and any(rule.log for rule in self.policy.firewall.rules):
+            self.warnings.append("Logging firewall rules only see the first packets of fast-tracked connections")
+
     def validate(self) -> None:
         """
         Run all semantic validations.
@@ -206,6 +228,7 @@ class PolicyValidator:
         """
         self.errors = []
         self.warnings = []
+        self.lan_index = self._build_lan_index()
 
         # Run all validation checks
         self._check_subnet_overlaps()
@@ -217,6 +240,7 @@ class PolicyValidator:
         self._check_firewall_zone_references()
         self._check_vpn_conflicts()
         self._check_nat_port_forwards()
+        self._check_performance()
 
         if self.errors:
             error_msg = "Policy validation failed:\n" + "\n".join(f"  - {e}" for e in self.errors)
@@ -0,0 +1,278 @@
+"""
+Render cache module.
+
+On-disk cache of rendered configurations keyed by a content hash of the
+policy model, so re-rendering an unchanged policy skips backend generation.
+
+Rendered configs contain resolved secrets, so the cache is opt-in in the
+CLI, its directory is kept at mode 0700 (also when it already existed)
+and entry files are created readable by the current user only.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from router_policy_to_config import __version__
+from router_policy_to_config.model import Policy
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # 256 MiB
+
+# Text outputs (RouterOS scripts) are stored raw so they can be streamed,
+# multi-file outputs (OpenWrt configs) as JSON
+TEXT_SUFFIX = ".txt"
+JSON_SUFFIX = ".json"
+
+RenderOutput = Union[str, Dict[str, str]]
+
+
+def default_cache_dir() -> Path:
+    """
+    Get the default cache directory.
+
+    Uses ROUTER_POLICY_CACHE_DIR if set, otherwise
+    $XDG_CACHE_HOME/router-policy-to-config (~/.cache by default).
+    """
+    override = os.environ.get("ROUTER_POLICY_CACHE_DIR")
+    if override:
+        return Path(override)
+
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(cache_home) / "router-policy-to-config"
+
+
+def compute_cache_key(policy: Policy, vendor: Optional[str] = None, options: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Compute the cache key for rendering a policy.
+
+    The key covers the normalized policy model (which holds resolved secret
+    values, so rotating a secret invalidates the entry), the target vendor
+    and version, backend options and the package version.
+
+    Args:
+        policy: Policy instance to render
+        vendor: Optional vendor override
+        options: Optional backend options affecting the output
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    payload = {
+        "policy": asdict(policy),
+        "vendor": vendor or policy.meta.target.vendor,
+        "version": policy.meta.target.version,
+        "options": options or {},
+        "package_version": __version__,
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class RenderCache:
+    """Size-bounded LRU cache of rendered configurations on disk."""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize render cache.
+
+        Args:
+            cache_dir: Cache directory. If None, uses default_cache_dir().
+            max_bytes: Maximum total size of cache entries
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size: Optional[int] = None  # Lazily computed total size
+        self._dir_ready = False
+
+    def _entry_path(self, key: str, suffix: str) -> Path:
+        """Get path of the entry file for a key."""
+        return self.cache_dir / f"{key}{suffix}"
+
+    def _entries(self):
+        """Iterate over cache entry files."""
+        if not self.cache_dir.is_dir():
+            return
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith((TEXT_SUFFIX, JSON_SUFFIX)):
+                    yield entry
+
+    def _touch(self, path: Path) -> None:
+        """Refresh mtime - used as the LRU timestamp."""
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def get(self, key: str) -> Optional[RenderOutput]:
+        """
+        Get cached output for a key.
+
+        Args:
+            key: Cache key from compute_cache_key()
+
+        Returns:
+            Cached output, or None on a miss
+        """
+        text_path = self._entry_path(key, TEXT_SUFFIX)
+        json_path = self._entry_path(key, JSON_SUFFIX)
+
+        try:
+            if text_path.exists():
+                output = text_path.read_text(encoding="utf-8")
+                self._touch(text_path)
+            else:
+                with open(json_path, "r") as f:
+                    output = json.load(f)["output"]
+                self._touch(json_path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, KeyError, TypeError):
+            # Corrupted entry - drop the file that was read and treat as a miss
+            (text_path if text_path.exists() else json_path).unlink(missing_ok=True)
+            self._size = None
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return output
+
+    def copy_to(self, key: str, dest: Path) -> bool:
+        """
+        Copy a cached text output to a file without loading it into memory.
+
+        Args:
+            key: Cache key from compute_cache_key()
+            dest: Destination file path
+
+        Returns:
+            True on a hit, False on a miss
+        """
+        path = self._entry_path(key, TEXT_SUFFIX)
+
+        try:
+            shutil.copyfile(path, dest)
+        except FileNotFoundError:
+            self.misses += 1
+            return False
+
+        self._touch(path)
+        self.hits += 1
+        return True
+
+    def _store(self, key: str, suffix: str, write) -> None:
+        """Atomically write an entry with the given writer and enforce the size limit."""
+        if not self._dir_ready:
+            self.cache_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+            # mkdir() leaves the mode of an existing directory unchanged
+            os.chmod(self.cache_dir, 0o700)
+            self._dir_ready = True
+        path = self._entry_path(key, suffix)
+
+        # Concurrent batch workers may store the same key
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+                size = f.tell()
+            try:
+                size -= path.stat().st_size  # Overwritten entry
+            except FileNotFoundError:
+                pass
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        if self._size is None:
+            self._size = sum(entry.stat().st_size for entry in self._entries())
+        else:
+            self._size += size
+
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def put(self, key: str, output: RenderOutput) -> None:
+        """
+        Store rendered output and evict least recently used entries if needed.
+
+        Args:
+            key: Cache key from compute_cache_key()
+            output: Rendered output (string or dict of file name -> content)
+        """
+        if isinstance(output, str):
+            self._store(key, TEXT_SUFFIX, lambda f: f.write(output.encode("utf-8")))
+        else:
+            data = json.dumps({"output": output}).encode("utf-8")
+            self._store(key, JSON_SUFFIX, lambda f: f.write(data))
+
+    def put_file(self, key: str, src: Path) -> None:
+        """
+        Store a rendered text file without loading it into memory.
+
+        Args:
+            key: Cache key from compute_cache_key()
+            src: Path of the rendered file
+        """
+
+        def copy(f):
+            with open(src, "rb") as source:
+                shutil.copyfileobj(source, f)
+
+        self._store(key, TEXT_SUFFIX, copy)
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache fits max_bytes."""
+        entries = sorted(self._entries(), key=lambda e: e.stat().st_mtime)
+        total = sum(entry.stat().st_size for entry in entries)
+
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            size = entry.stat().st_size
+            try:
+                os.unlink(entry.path)
+                total -= size
+            except FileNotFoundError:
+                pass  # Removed by another process
+
+        self._size = total
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict with directory, entry count, sizes and this session's hits/misses
+        """
+        entries = list(self._entries())
+        return {
+            "directory": str(self.cache_dir),
+            "entries": len(entries),
+            "total_bytes": sum(entry.stat().st_size for entry in entries),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def clear(self) -> int:
+        """
+        Remove all cache entries.
+
+        Returns:
+            Number of removed entries
+        """
+        removed = 0
+        for entry in list(self._entries()):
+            os.unlink(entry.path)
+            removed += 1
+        self._size = 0
+        return removed
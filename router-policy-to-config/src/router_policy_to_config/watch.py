@@ -0,0 +1,241 @@
+"""
+Watch mode module.
+
+Polls a directory of policy files and re-validates and re-renders only the
+files that changed since the last scan. The PolicyLoader (with its compiled
+schema), parsed policies and rendered outputs stay in memory between edits,
+so a save costs one load, one validation and one backend run.
+"""
+
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from router_policy_to_config.backends import render_policy
+from router_policy_to_config.batch import POLICY_SUFFIXES
+from router_policy_to_config.model import Policy
+from router_policy_to_config.policy_loader import PolicyLoader
+from router_policy_to_config.policy_validator import PolicyValidator
+from router_policy_to_config.render_cache import RenderOutput
+
+# (mtime_ns, size) of a policy file, compared between scans
+FileSignature = Tuple[int, int]
+
+
+@dataclass
+class WatchEvent:
+    """Result of processing one changed or removed policy file."""
+
+    path: str
+    ok: bool
+    vendor: Optional[str] = None
+    outputs: List[str] = field(default_factory=list)  # Files written (unchanged outputs are skipped)
+    warnings: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+    removed: bool = False
+    duration: float = 0.0
+
+
+def atomic_write(path: Path, content: str) -> None:
+    """
+    Write a file atomically via a temporary file and rename.
+
+    Readers (e.g. a deploy job picking up outputs) never see a partial file.
+
+    Args:
+        path: Destination file path
+        content: Text content
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class PolicyWatcher:
+    """Incrementally validate and render a directory of policies."""
+
+    def __init__(
+        self,
+        directory: str,
+        target: Optional[str] = None,
+        output_dir: Optional[str] = None,
+        schema_path: Optional[str] = None,
+        interval: float = 0.5,
+    ):
+        """
+        Initialize watcher.
+
+        Args:
+            directory: Directory with policy YAML files (searched recursively)
+            target: Optional vendor override for every policy
+            output_dir: Directory for rendered configs. If None, only validate and render.
+            schema_path: Optional path to policy schema file
+            interval: Polling interval in seconds
+        """
+        self.directory = Path(directory)
+        self.target = target
+        self.output_dir = Path(output_dir) if output_dir else None
+        self.interval = interval
+        self.loader = PolicyLoader(schema_path=schema_path)
+
+        self._signatures: Dict[Path, FileSignature] = {}
+        # Policy -> files it pulls in via extends/include
+        self._references: Dict[Path, Set[Path]] = {}
+        self.policies: Dict[Path, Policy] = {}
+        self.outputs: Dict[Path, RenderOutput] = {}
+
+    def _scan(self) -> Dict[Path, FileSignature]:
+        """Get signatures of all policy files under the directory."""
+        signatures = {}
+        for path in self.directory.rglob("*"):
+            if path.suffix not in POLICY_SUFFIXES:
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # Removed mid-scan (e.g. editor swap files)
+            if os.path.isfile(path):
+                signatures[path] = (stat.st_mtime_ns, stat.st_size)
+        return signatures
+
+    def _destination(self, path: Path, vendor: str) -> Path:
+        """Get output path, mirroring the layout used by render-batch."""
+        suffix = ".rsc" if vendor == "routeros" else ""
+        return self.output_dir / path.relative_to(self.directory).with_suffix(suffix)
+
+    def _write_outputs(self, path: Path, vendor: str, output: RenderOutput) -> List[str]:
+        """Atomically write rendered output, skipping files whose content is unchanged."""
+        previous = self.outputs.get(path)
+        destination = self._destination(path, vendor)
+        written = []
+
+        if isinstance(output, str):
+            if output != previous or not destination.exists():
+                atomic_write(destination, output)
+                written.append(str(destination))
+            return written
+
+        previous = previous if isinstance(previous, dict) else {}
+        for filename, content in output.items():
+            file_path = destination / filename
+            if content != previous.get(filename) or not file_path.exists():
+                atomic_write(file_path, content)
+                written.append(str(file_path))
+        return written
+
+    def process(self, path: Path) -> WatchEvent:
+        """
+        Load, validate and render a single policy file.
+
+        Args:
+            path: Policy file path
+
+        Returns:
+            WatchEvent describing the outcome
+        """
+        start = time.perf_counter()
+        event = WatchEvent(path=str(path), ok=False)
+
+        try:
+            try:
+                policy = self.loader.load(str(path))
+            finally:
+                self._references[path] = {p.resolve() for p in self.loader.last_references}
+
+            validator = PolicyValidator(policy)
+            validator.validate()
+            event.warnings = validator.warnings
+
+            if self.target:
+                policy.meta.target.vendor = self.target
+            event.vendor = policy.meta.target.vendor
+
+            output = render_policy(policy)
+            if self.output_dir:
+                event.outputs = self._write_outputs(path, event.vendor, output)
+
+            self.policies[path] = policy
+            self.outputs[path] = output
+            event.ok = True
+        except Exception as e:
+            # Keep the last good outputs on disk and in memory
+            event.error = " ".join(str(e).split()) or type(e).__name__
+
+        event.duration = time.perf_counter() - start
+        return event
+
+    def _forget(self, path: Path) -> None:
+        """Drop in-memory state of a policy."""
+        self.policies.pop(path, None)
+        self.outputs.pop(path, None)
+        self._references.pop(path, None)
+
+    def _fragments(self) -> Set[Path]:
+        """Get all files referenced by watched policies."""
+        return set().union(*self._references.values()) if self._references else set()
+
+    def poll(self) -> List[WatchEvent]:
+        """
+        Scan once and process every added, modified or removed policy.
+
+        The first call processes all policies. Files referenced through
+        extends/include are treated as fragments: a change to one re-renders
+        every policy that uses it instead of the fragment itself.
+
+        Returns:
+            List of events, in path order
+        """
+        signatures = self._scan()
+        changed = {path for path in signatures if self._signatures.get(path) != signatures[path]}
+        removed = set(self._signatures) - set(signatures)
+        touched = {path.resolve() for path in changed | removed}
+
+        # Policies whose bases or includes changed
+        for path, references in self._references.items():
+            if path in signatures and references & touched:
+                changed.add(path)
+
+        fragments = self._fragments()
+        events = [self.process(path) for path in sorted(changed) if path.resolve() not in fragments]
+
+        # New policies may reveal fragments that were just processed on their own
+        fragments = self._fragments()
+        for event in [e for e in events if Path(e.path).resolve() in fragments]:
+            events.remove(event)
+            self._forget(Path(event.path))
+
+        for path in sorted(removed):
+            # Rendered outputs are left in place; only in-memory state is dropped
+            self._forget(path)
+            events.append(WatchEvent(path=str(path), ok=True, removed=True))
+
+        self._signatures = signatures
+        return events
+
+    def run(
+        self,
+        on_event: Callable[[WatchEvent], None],
+        should_stop: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        """
+        Poll until stopped.
+
+        Args:
+            on_event: Callback invoked for every event
+            should_stop: Optional callable checked after each poll; stops the loop when it returns True
+        """
+        while True:
+            for event in self.poll():
+                on_event(event)
+            if should_stop and should_stop():
+                return
+            time.sleep(self.interval)
@@ -0,0 +1,51 @@
+"""
+YAML utilities module.
+
+Safe YAML loading and dumping that use the LibYAML C implementation when
+PyYAML was built with it, falling back to the pure-Python classes otherwise.
+"""
+
+from typing import IO, Any, Union
+
+import yaml
+
+try:
+    SafeLoader = yaml.CSafeLoader
+    SafeDumper = yaml.CSafeDumper
+except AttributeError:  # PyYAML built without LibYAML
+    SafeLoader = yaml.SafeLoader
+    SafeDumper = yaml.SafeDumper
+
+YAMLError = yaml.YAMLError
+
+
+def safe_load(stream: Union[str, bytes, IO]) -> Any:
+    """
+    Parse a YAML document with the fastest available safe loader.
+
+    Args:
+        stream: YAML string, bytes or open file
+
+    Returns:
+        Parsed Python object
+
+    Raises:
+        yaml.YAMLError: If the document cannot be parsed
+    """
+    return yaml.load(stream, Loader=SafeLoader)  # nosec B506 - SafeLoader/CSafeLoader only
+
+
+def safe_dump(data: Any) -> str:
+    """
+    Serialize data to block-style YAML, keeping key order and non-ASCII text.
+
+    Args:
+        data: Plain Python data (dicts, lists, scalars)
+
+    Returns:
+        YAML document as string
+    """
+    return yaml.dump(data, Dumper=SafeDumper, sort_keys=False, allow_unicode=True, default_flow_style=False)
+
+
+__all__ = ["SafeDumper", "SafeLoader", "YAMLError", "safe_dump", "safe_load"]
@@ -0,0 +1,122 @@
+"""Benchmarks for the diff engines.
+
+Run with ``pytest tests/perf -s`` to print timings. Tests comparing
+wall-clock times are marked ``perf`` and only run with ``-m perf``.
+"""
+
+import difflib
+import re
+import time
+
+import pytest
+
+from router_policy_to_config.diff.routeros_diff import RouterOSDiff
+
+
+def _legacy_routeros_diff(current: str, generated: str):
+    """Whole-export diff as implemented before section-aware diffing (added/removed only)."""
+
+    def normalize(config):
+        lines = []
+        for line in config.split("\n"):
+            line = re.sub(r"#.*$", "", line).strip()
+            if line:
+                lines.append(line)
+        return lines
+
+    diff = list(difflib.unified_diff(normalize(current), normalize(generated), lineterm=""))
+    added = [line[1:].strip() for line in diff if line.startswith("+") and not line.startswith("+++")]
+    removed = [line[1:].strip() for line in diff if line.startswith("-") and not line.startswith("---")]
+
+    # The legacy engine then re-normalized both configs to group commands by section
+    normalize(current)
+    normalize(generated)
+    return added, removed
+
+
+def _export(rules: int, changed: int = 0) -> str:
+    """Build a large /export-style dump with `changed` modified filter rules."""
+    lines = ["# jan/01/2025 by RouterOS 7.12", "/interface bridge", "add name=bridge-main"]
+    lines.append("/ip address")
+    lines.extend(f"add address=10.{i // 256}.{i % 256}.1/24 interface=vlan{i} # site {i}" for i in range(rules // 4))
+    lines.append("/interface vlan")
+    lines.extend(f"add interface=bridge-main name=vlan{i} vlan-id={i % 4094 + 1}" for i in range(rules // 4))
+    lines.append("/ip firewall filter")
+    for i in range(rules // 2):
+        port = 20000 + i + (1 if i < changed else 0)
+        lines.append(f"add action=accept chain=forward dst-port={port} protocol=tcp comment=rule{i}")
+    return "\n".join(lines)
+
+
+def test_routeros_diff_benchmark():
+    """Compare section-aware diff with the whole-export diff on a 20k-line dump."""
+    current = _export(20000)
+    generated = _export(20000, changed=25)
+
+    start = time.perf_counter()
+    legacy_added, legacy_removed = _legacy_routeros_diff(current, generated)
+    legacy_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = RouterOSDiff(current, generated).compute_diff()
+    elapsed = time.perf_counter() - start
+
+    print(f"\nRouterOS 20k lines: legacy {legacy_elapsed * 1000:.1f} ms, section-aware {elapsed * 1000:.1f} ms")
+
+    assert sorted(result["added_lines"]) == sorted(legacy_added)
+    assert sorted(result["removed_lines"]) == sorted(legacy_removed)
+    assert list(result["section_changes"]) == ["ip"]
+
+
+def _legacy_uci_section_compare(current_sections, generated_sections):
+    """Section comparison as implemented before the section indexes (linear scan per key)."""
+    current_keys = {(s["type"], s["name"]) for s in current_sections}
+    generated_keys = {(s["type"], s["name"]) for s in generated_sections}
+
+    modified = []
+    for key in current_keys & generated_keys:
+        current_section = next(s for s in current_sections if (s["type"], s["name"]) == key)
+        generated_section = next(s for s in generated_sections if (s["type"], s["name"]) == key)
+        if current_section["options"] != generated_section["options"]:
+            modified.append(key)
+    return modified
+
+
+def _firewall(sections: int, changed: int = 0) -> str:
+    """Build a firewall config with named redirects and anonymous rules."""
+    blocks = []
+    for i in range(sections // 2):
+        port = 10000 + i + (1 if i < changed else 0)
+        blocks.append(
+            f"config redirect 'fwd{i}'\n\toption src 'wan'\n\toption src_dport '{port}'\n"
+            f"\toption dest_ip '192.168.{i // 250}.{i % 250 + 2}'"
+        )
+        blocks.append(f"config rule\n\toption name 'rule{i}'\n\toption dest_port '{port}'\n\toption target 'ACCEPT'")
+    return "\n\n".join(blocks)
+
+
+@pytest.mark.perf
+def test_openwrt_section_match_benchmark():
+    """Compare indexed section matching with the linear scan on a 5k-section firewall."""
+    from router_policy_to_config.diff.openwrt_diff import OpenWrtDiff
+
+    current = _firewall(5000)
+    generated = _firewall(5000, changed=10)
+    engine = OpenWrtDiff({"firewall": current}, {"firewall": generated})
+    current_sections = engine._parse_uci_config(current)
+    generated_sections = engine._parse_uci_config(generated)
+
+    start = time.perf_counter()
+    legacy_modified = _legacy_uci_section_compare(current_sections, generated_sections)
+    legacy_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    _, _, modified = engine._match_sections(current_sections, generated_sections)
+    elapsed = time.perf_counter() - start
+
+    print(f"\nOpenWrt 5k sections: legacy {legacy_elapsed * 1000:.1f} ms, indexed {elapsed * 1000:.1f} ms")
+
+    # The legacy scan collapsed all anonymous rules into one key, comparing only the first
+    assert len(legacy_modified) == 11
+    assert len(modified) == 20
+    assert elapsed < legacy_elapsed
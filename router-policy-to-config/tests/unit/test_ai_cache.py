@@ -0,0 +1,67 @@
+"""Test the caching AI provider."""
+
+import time
+
+from router_policy_to_config.ai.policy_nl_to_yaml import PolicyGenerator
+from router_policy_to_config.ai_providers import CachingProvider, MemoryCache, MockProvider, SQLiteCache
+
+
+def test_repeated_prompts_are_served_from_memory():
+    """Identical requests reach the provider once; changed parameters miss."""
+    mock = MockProvider()
+    provider = CachingProvider(mock)
+    generator = PolicyGenerator(provider, fast_path=False)  # Exercise the provider, not the local fast path
+
+    first = generator.generate_from_text("Home network with guest Wi-Fi")
+    second = generator.generate_from_text("Home network with guest Wi-Fi")
+
+    assert first == second
+    assert mock.call_count == 1
+    assert provider.stats.memory_hits == 1
+    assert provider.stats.misses == 1
+
+    provider.generate_completion("hello", temperature=0.1)
+    provider.generate_completion("hello", temperature=0.2)
+    provider.generate_completion("hello", system_prompt="be brief", temperature=0.2)
+    assert mock.call_count == 4
+    assert provider.stats.hit_rate == 0.2
+
+
+def test_memory_lru_and_ttl():
+    """The LRU evicts the least recently used entry and drops expired ones."""
+    cache = MemoryCache(max_entries=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    cache.get("a")
+    cache.put("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+
+    expiring = MemoryCache(ttl=0.01)
+    expiring.put("a", "1")
+    time.sleep(0.02)
+    assert expiring.get("a") is None
+
+
+def test_sqlite_store_persists_between_providers(tmp_path):
+    """A new provider with an empty LRU is answered from the SQLite store."""
+    path = str(tmp_path / "ai.sqlite3")
+    first = CachingProvider(MockProvider(), store=SQLiteCache(path))
+    response = first.generate_test_cases("LAN main 192.168.10.0/24", "routeros")
+    first.close()
+
+    mock = MockProvider()
+    second = CachingProvider(mock, store=SQLiteCache(path))
+    assert second.generate_test_cases("LAN main 192.168.10.0/24", "routeros") == response
+    assert mock.call_count == 0
+    assert second.stats.store_hits == 1
+
+    # Promoted into the LRU
+    second.generate_test_cases("LAN main 192.168.10.0/24", "routeros")
+    assert second.stats.memory_hits == 1
+
+    expired = CachingProvider(mock, store=SQLiteCache(path, ttl=0))
+    time.sleep(0.01)
+    expired.generate_test_cases("LAN main 192.168.10.0/24", "routeros")
+    assert mock.call_count == 1
+    assert expired.store.clear() == 1
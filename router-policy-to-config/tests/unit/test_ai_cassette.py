@@ -0,0 +1,55 @@
+"""Test the record/replay AI provider."""
+
+import json
+
+import pytest
+
+from router_policy_to_config.ai.policy_nl_to_yaml import PolicyGenerator
+from router_policy_to_config.ai_providers import CassetteMissError, CassetteProvider, MockProvider
+
+
+class EchoProvider(MockProvider):
+    """Provider whose answers depend on the prompt, standing in for a real API."""
+
+    def generate_completion(self, prompt, system_prompt=None, temperature=0.7, max_tokens=2000):
+        self.call_count += 1
+        if "Requested changes" in prompt:
+            return "meta:\n  name: " + prompt.rsplit("Requested changes: ", 1)[1].split("\n")[0] + "\n"
+        return super().generate_completion(prompt, system_prompt, temperature, max_tokens)
+
+
+def test_record_then_replay_without_provider(tmp_path):
+    """Recorded exchanges replay offline; formatting-only prompt changes still match."""
+    path = tmp_path / "cassettes" / "policy.json"
+    recorder = CassetteProvider(str(path), provider=EchoProvider())
+    generated = PolicyGenerator(recorder, fast_path=False).generate_from_text("Office with guest Wi-Fi")
+    refined = PolicyGenerator(recorder, fast_path=False).refine_policy(generated, "office-v2")
+    assert recorder.recorded == 2
+
+    data = json.loads(path.read_text())
+    assert data["version"] == 1
+    assert len(data["interactions"]) == 2
+
+    replay = CassetteProvider(str(path))
+    assert replay.is_available()
+    assert PolicyGenerator(replay, fast_path=False).generate_from_text("Office with guest Wi-Fi") == generated
+    assert replay.generate_completion(
+        f"Current policy:\n```yaml\n{generated}\n```\n\n   Requested changes:   office-v2\n\n"
+        "Generate the updated policy YAML with these changes applied.\nReturn only the YAML, no explanations.\n",
+        system_prompt="You are a network configuration expert. Refine the router policy based on the user's request.",
+    ) == refined
+
+
+def test_replay_fails_loudly_on_unmatched_prompt(tmp_path):
+    """Unknown prompts and missing cassettes raise instead of returning canned output."""
+    path = tmp_path / "policy.json"
+    CassetteProvider(str(path), provider=EchoProvider()).generate_completion("known prompt")
+
+    replay = CassetteProvider(str(path))
+    with pytest.raises(CassetteMissError, match="unknown prompt"):
+        replay.generate_completion("unknown prompt")
+    with pytest.raises(CassetteMissError):
+        replay.generate_completion("known prompt", system_prompt="different system prompt")
+
+    with pytest.raises(FileNotFoundError):
+        CassetteProvider(str(tmp_path / "missing.json")).generate_completion("known prompt")
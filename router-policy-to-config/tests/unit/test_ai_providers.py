@@ -0,0 +1,140 @@
+"""Test AI provider async API and the OpenAI-compatible HTTP provider."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from router_policy_to_config.ai import test_case_generator
+from router_policy_to_config.ai_providers.openai_compatible import OpenAICompatibleProvider
+from router_policy_to_config.model import LANConfig, Meta, Policy, Target, WANConfig
+
+pytest.importorskip("requests")
+
+
+class _StubServer(ThreadingHTTPServer):
+    """Local chat completions endpoint that echoes the prompt."""
+
+    daemon_threads = True
+
+    def __init__(self, delay: float = 0.0):
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.connections = set()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, so pooled connections are reused
+
+    def do_POST(self):
+        server = self.server
+        if self.path != "/v1/chat/completions":
+            self.send_error(404)
+            return
+
+        with server.lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            server.connections.add(self.client_address)
+
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(server.delay)
+        prompt = body["messages"][-1]["content"]
+        content = "[]" if "test cases" in prompt else f"echo: {prompt}"
+        if body.get("stream"):
+            # Server-sent events, one word per event
+            events = [{"choices": [{"delta": {"content": word}}]} for word in content.split(" ")]
+            payload = "".join(f"data: {json.dumps(event)}\n\n" for event in events) + "data: [DONE]\n\n"
+            payload, content_type = payload.encode(), "text/event-stream"
+        else:
+            payload = json.dumps({"choices": [{"message": {"role": "assistant", "content": content}}]}).encode()
+            content_type = "application/json"
+
+        with server.lock:
+            server.in_flight -= 1
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = _StubServer(delay=0.05)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_completion_and_connection_reuse(stub_server):
+    """Test sequential calls go through one pooled keep-alive connection."""
+    with OpenAICompatibleProvider(base_url=stub_server.base_url, model="stub") as provider:
+        assert provider.is_available()
+        assert provider.generate_completion("hello", system_prompt="be brief") == "echo: hello"
+        assert provider.generate_completion("again") == "echo: again"
+
+    assert stub_server.requests == 2
+    assert len(stub_server.connections) == 1
+
+
+def test_stream_completion(stub_server):
+    """Test server-sent events are yielded as chunks over the pooled connection."""
+    with OpenAICompatibleProvider(base_url=stub_server.base_url) as provider:
+        chunks = list(provider.stream_completion("гостевая сеть"))
+        assert chunks == ["echo:", "гостевая", "сеть"]
+        assert provider.generate_completion("after stream") == "echo: after stream"
+
+    assert len(stub_server.connections) == 1
+
+
+def test_batch_is_concurrent_and_bounded(stub_server):
+    """Test batch calls overlap, keep their order and never exceed the concurrency limit."""
+    prompts = [f"prompt {i}" for i in range(12)]
+
+    with OpenAICompatibleProvider(base_url=stub_server.base_url, pool_size=4) as provider:
+        results = provider.generate_batch(prompts, concurrency=4)
+
+    assert results == [f"echo: {prompt}" for prompt in prompts]
+    assert 2 <= stub_server.max_in_flight <= 4  # Calls overlap; the exact peak depends on scheduling
+    assert len(stub_server.connections) <= 4
+
+
+def test_fleet_test_cases_and_errors(stub_server):
+    """Test fleet test case generation and failing requests."""
+    policies = [
+        Policy(
+            meta=Meta(name=f"site-{i}", target=Target(vendor="routeros")),
+            wan=WANConfig(type="dhcp", interface="ether1"),
+            lans=[LANConfig(name="main", subnet=f"10.{i}.0.0/24", gateway=f"10.{i}.0.1")],
+        )
+        for i in range(5)
+    ]
+
+    with OpenAICompatibleProvider(base_url=stub_server.base_url) as provider:
+        results = test_case_generator.TestCaseGenerator(provider).generate_fleet_test_cases(policies, concurrency=3)
+
+        assert [cases[0]["name"] for cases in results] == ["test_main_internet_connectivity"] * 5
+        assert stub_server.max_in_flight <= 3
+
+    broken = OpenAICompatibleProvider(base_url=stub_server.base_url + "/missing", timeout=5)
+    with pytest.raises(RuntimeError, match="AI request"):
+        broken.generate_completion("hello")
+    broken.close()
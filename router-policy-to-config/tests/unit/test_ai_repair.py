@@ -0,0 +1,120 @@
+"""Test the generate-validate-repair loop."""
+
+from router_policy_to_config.ai.policy_nl_to_yaml import PolicyGenerator
+from router_policy_to_config.ai.repair import error_sections
+from router_policy_to_config.ai_providers import MockProvider
+
+BROKEN_POLICY = """meta:
+  name: office
+  target:
+    vendor: routeros
+wan:
+  type: dhcp
+  interface: ether1
+lans:
+  - name: main
+    subnet: 192.168.10.0/24
+    gateway: 192.168.10.1
+wifi:
+  - name: main-wifi
+    lan: office
+    ssid: Office
+    mode: ap
+firewall:
+  rules:
+    - name: allow_iot
+      from: [iot]
+      to: [wan]
+      action: accept
+"""
+
+FIXED_SECTIONS = """wifi:
+  - name: main-wifi
+    lan: main
+    ssid: Office
+    mode: ap
+firewall:
+  rules:
+    - name: allow_main
+      from: [main]
+      to: [wan]
+      action: accept
+"""
+
+
+class ScriptedProvider(MockProvider):
+    """Provider returning canned responses in order and recording prompts."""
+
+    def __init__(self, *responses):
+        super().__init__()
+        self.responses = list(responses)
+        self.prompts = []
+
+    def generate_completion(self, prompt, system_prompt=None, temperature=0.7, max_tokens=2000):
+        self.call_count += 1
+        self.prompts.append(prompt)
+        return self.responses[min(len(self.prompts), len(self.responses)) - 1]
+
+
+def test_repair_sends_only_errors_and_offending_sections():
+    """Semantic errors are fixed by resending only the affected sections."""
+    provider = ScriptedProvider(BROKEN_POLICY, FIXED_SECTIONS)
+    report = PolicyGenerator(provider, fast_path=False).generate_validated("Office with IoT network")
+
+    assert report.valid and report.stop_reason == "valid"
+    assert report.attempts == 2 and report.calls == 2
+    assert report.repaired_sections == [["wifi", "firewall"]]
+    assert report.policy.wifi[0].lan == "main"
+    assert report.policy.lans[0].name == "main"
+
+    repair_prompt = provider.prompts[1]
+    assert "references unknown zone 'iot'" in repair_prompt
+    assert "references non-existent LAN 'office'" in repair_prompt
+    assert "subnet:" not in repair_prompt and "Office with IoT network" not in repair_prompt
+    assert 0 < report.prompt_tokens and 0 < report.completion_tokens
+    assert report.get_summary().startswith("Policy valid after 2 attempt(s)")
+
+
+def test_loop_stops_at_attempt_and_latency_limits():
+    """Unfixable output stops at max_attempts; an exhausted budget stops before repairing."""
+    provider = ScriptedProvider(BROKEN_POLICY)
+    report = PolicyGenerator(provider, fast_path=False).generate_validated("Office", max_attempts=3)
+    assert not report.valid and report.stop_reason == "max_attempts"
+    assert report.attempts == 3 and provider.call_count == 3
+    assert len(report.errors) == 2
+
+    provider = ScriptedProvider(BROKEN_POLICY)
+    report = PolicyGenerator(provider, fast_path=False).generate_validated("Office", latency_budget=0)
+    assert report.stop_reason == "latency_budget" and provider.call_count == 1
+
+    report = PolicyGenerator(ScriptedProvider("not: [valid")).generate_validated("Office", max_attempts=2)
+    assert report.errors[0].startswith("Invalid YAML") and report.repaired_sections == [[]]
+
+
+def test_schema_errors_and_fast_path():
+    """Schema errors map to their section by path; fast path runs need no AI calls."""
+    assert error_sections(["lans.0.subnet: 'x' does not match"], {"meta": {}, "lans": []}) == ["lans"]
+    assert error_sections(["'wan' is a required property"], {"meta": {}, "lans": []}) == ["meta", "lans"]
+
+    provider = MockProvider()
+    report = PolicyGenerator(provider).generate_validated("Дом, PPPoE, Wi-Fi")
+    assert report.valid and report.fast_path
+    assert (report.calls, report.total_tokens, provider.call_count) == (0, 0, 0)
+
+
+def test_cli_fails_on_unrepaired_policy(tmp_path, monkeypatch):
+    """ai-suggest --repair exits non-zero and keeps an invalid policy out of --out."""
+    from typer.testing import CliRunner
+
+    from router_policy_to_config.cli import app
+
+    monkeypatch.setattr(MockProvider, "generate_completion", lambda self, *args, **kwargs: "meta: {name: x}\n")
+    output = tmp_path / "policy.yaml"
+    output.write_text("previous")
+
+    result = CliRunner().invoke(app, ["ai-suggest", "--desc", "Office", "--repair", "--out", str(output)])
+
+    assert result.exit_code == 1, result.output
+    assert "Generated policy" not in result.output
+    assert output.read_text() == "previous"
+    assert "name: x" in (tmp_path / "policy.yaml.partial").read_text()
@@ -0,0 +1,58 @@
+"""Test streamed policy generation with incremental YAML checking."""
+
+import pytest
+from typer.testing import CliRunner
+
+from router_policy_to_config.ai.policy_nl_to_yaml import PolicyGenerator
+from router_policy_to_config.ai.streaming import IncrementalYAMLChecker, YAMLStreamError, stream_checked_yaml
+from router_policy_to_config.ai_providers import CachingProvider, MockProvider
+from router_policy_to_config.cli import app
+
+
+def _chars(text):
+    """Stream text one character at a time, counting consumed characters."""
+    _chars.consumed = 0
+    for char in text:
+        _chars.consumed += 1
+        yield char
+
+
+def test_valid_yaml_streams_without_false_aborts():
+    """Quotes and flow collections spanning top-level lines are not treated as errors."""
+    document = 'meta:\n  name: "split\nacross lines"\ndns: [1.1.1.1,\n8.8.8.8]\nlans:\n  - name: main\n'
+    checker = IncrementalYAMLChecker()
+    for char in document:
+        checker.feed(char)
+    assert checker.finish()["dns"] == ["1.1.1.1", "8.8.8.8"]
+
+    chunks = list(PolicyGenerator(MockProvider()).stream_from_text("Home network"))
+    assert len(chunks) > 10
+    assert "".join(chunks) == PolicyGenerator(MockProvider()).generate_from_text("Home network")
+
+
+def test_broken_stream_aborts_early():
+    """Output that cannot become valid YAML stops the stream after the broken block."""
+    broken = "Sure! Here is your policy\nmeta:\n  name: office\n" + "lans:\n  - name: lan\n" * 200
+    with pytest.raises(YAMLStreamError, match="line 2"):
+        list(stream_checked_yaml(_chars(broken)))
+    assert _chars.consumed < 40
+
+    bad_indent = "meta:\n  name: office\n   extra: 1\n  bad\nlans: []\n" + "x" * 1000
+    with pytest.raises(YAMLStreamError):
+        list(stream_checked_yaml(_chars(bad_indent)))
+    assert _chars.consumed < 100
+
+
+def test_cached_stream_and_cli(tmp_path):
+    """Cached streams replay at once; ai-suggest writes the streamed policy."""
+    mock = MockProvider()
+    provider = CachingProvider(mock)
+    first = "".join(provider.stream_policy_yaml("Office"))
+    assert list(provider.stream_policy_yaml("Office")) == [first]
+    assert mock.call_count == 1
+
+    output = tmp_path / "policy.yaml"
+    result = CliRunner().invoke(app, ["ai-suggest", "--desc", "Home network", "--out", str(output)])
+    assert result.exit_code == 0, result.output
+    assert output.read_text() == first
+    assert not (tmp_path / "policy.yaml.partial").exists()
@@ -0,0 +1,66 @@
+"""Test batch rendering functionality."""
+
+from router_policy_to_config.batch import collect_policy_files, render_batch
+
+POLICY_TEMPLATE = """
+meta:
+  name: {name}
+  target:
+    vendor: {vendor}
+
+wan:
+  type: dhcp
+  interface: ether1
+
+lans:
+  - name: main
+    subnet: 192.168.1.0/24
+    gateway: 192.168.1.1
+"""
+
+
+def _write_fleet(directory, count, vendor="routeros"):
+    directory.mkdir(parents=True, exist_ok=True)
+    for i in range(count):
+        (directory / f"site-{i}.yaml").write_text(POLICY_TEMPLATE.format(name=f"site-{i}", vendor=vendor))
+
+
+def test_collect_policy_files_from_dir_and_glob(tmp_path):
+    """Test directories are searched recursively and globs are expanded."""
+    _write_fleet(tmp_path / "fleet", 2)
+    _write_fleet(tmp_path / "fleet" / "branch", 1)
+    (tmp_path / "fleet" / "notes.txt").write_text("not a policy")
+
+    from_dir = collect_policy_files([str(tmp_path / "fleet")])
+    from_glob = collect_policy_files([str(tmp_path / "fleet" / "*.yaml")])
+
+    assert len(from_dir) == 3
+    assert len(from_glob) == 2
+
+
+def test_render_batch_in_process(tmp_path):
+    """Test batch rendering writes one output per policy."""
+    _write_fleet(tmp_path / "fleet", 3)
+    out_dir = tmp_path / "out"
+
+    result = render_batch([str(tmp_path / "fleet")], output_dir=str(out_dir), workers=1)
+
+    assert len(result.items) == 3
+    assert not result.failed
+    assert (out_dir / "site-0.rsc").exists()
+    assert "site-2" in (out_dir / "site-2.rsc").read_text()
+
+
+def test_render_batch_isolates_failures(tmp_path):
+    """Test one broken policy does not stop the rest of the batch."""
+    _write_fleet(tmp_path / "fleet", 2, vendor="openwrt")
+    (tmp_path / "fleet" / "broken.yaml").write_text("meta:\n  name: broken\n")
+
+    result = render_batch([str(tmp_path / "fleet")], output_dir=str(tmp_path / "out"), workers=2)
+
+    assert len(result.succeeded) == 2
+    assert len(result.failed) == 1
+    assert result.failed[0].path.endswith("broken.yaml")
+    assert "validation failed" in result.failed[0].error
+    assert (tmp_path / "out" / "site-1" / "network").exists()
+    assert "Failed: 1" in result.get_summary()
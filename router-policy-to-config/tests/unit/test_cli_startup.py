@@ -0,0 +1,54 @@
+"""Test CLI startup stays lightweight."""
+
+import os
+import subprocess
+import sys
+
+# Modules only needed by individual subcommands
+HEAVY_MODULES = [
+    "jsonschema",
+    "yaml",
+    "rich.console",
+    "rich.syntax",
+    "router_policy_to_config.policy_loader",
+    "router_policy_to_config.backends",
+    "router_policy_to_config.diff",
+    "router_policy_to_config.ai",
+]
+
+
+def _import_times():
+    """Import the CLI in a fresh interpreter and return {module: cumulative_us}."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import router_policy_to_config.cli"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_cli_import_skips_heavy_modules():
+    """Test importing the CLI does not pull in the loader, backends or rich renderables."""
+    times = _import_times()
+
+    assert "router_policy_to_config.cli" in times
+    assert [name for name in HEAVY_MODULES if name in times] == []
+
+
+def test_cli_import_time_budget():
+    """Test the CLI module imports within a generous time budget."""
+    times = _import_times()
+
+    # Typer dominates (~50ms locally); leave headroom for slow CI runners
+    assert times["router_policy_to_config.cli"] < 500_000
@@ -0,0 +1,90 @@
+"""Test firewall rule compaction."""
+
+from router_policy_to_config.backends import render_policy
+from router_policy_to_config.backends.firewall_compaction import FilterRule, compact_filter_rules
+from router_policy_to_config.backends.routeros_backend import RouterOSBackend
+from router_policy_to_config.model import Firewall, FirewallRule, LANConfig, Meta, Policy, Target, WANConfig
+
+
+def _rule(name, action="accept", **props):
+    base = {"chain": "forward", "in-interface": "bridge-lan", "out-interface": "ether1", "protocol": "tcp"}
+    base.update({key.replace("_", "-"): value for key, value in props.items()})
+    return FilterRule(props=base, action=action, comment=name, names=[name])
+
+
+def test_ports_merge_within_limit():
+    """Test rules differing only in dst-port collapse into port lists of at most 15 entries."""
+    rules = [_rule(f"port-{port}", dst_port=str(port)) for port in range(1, 21)]
+    result = compact_filter_rules(rules)
+
+    assert (result.before, result.after) == (20, 2)
+    assert result.rules[0].props["dst-port"] == ",".join(str(port) for port in range(1, 16))
+    assert result.rules[1].props["dst-port"] == "16,17,18,19,20"
+    assert result.rules[0].comment == "port-1 (+14 merged)"
+
+
+def test_hosts_merge_into_address_list_after_ports():
+    """Test host x port rules become one rule with a dst-address-list."""
+    rules = [
+        _rule(f"host{host}-{port}", dst_address=f"10.0.0.{host}", dst_port=port)
+        for host in (1, 2, 3) for port in ("22", "443")
+    ]
+    result = compact_filter_rules(rules)
+
+    assert result.after == 1
+    rule = result.rules[0]
+    assert rule.props["dst-port"] == "22,443"
+    assert rule.props["dst-address-list"] == "host1-22-dst"
+    assert "dst-address" not in rule.props
+    assert result.address_lists == {"host1-22-dst": ["10.0.0.1", "10.0.0.2", "10.0.0.3"]}
+
+
+def test_first_match_order_is_preserved():
+    """Test rules are only merged across rules with the same action."""
+    rules = [
+        _rule("allow-any"),
+        _rule("allow-22", dst_port="22"),
+        _rule("block-80", action="drop", dst_port="80"),
+        _rule("allow-443", dst_port="443"),
+        _rule("allow-8443", dst_port="8443"),
+        _rule("allow-from-guest", **{"in-interface": "bridge-guest"}, dst_port="25"),
+    ]
+    result = compact_filter_rules(rules)
+
+    assert [(r.action, r.props.get("dst-port")) for r in result.rules] == [
+        ("accept", None),
+        ("accept", "22"),
+        ("drop", "80"),
+        ("accept", "443,8443"),
+        ("accept", "25"),
+    ]
+
+
+def test_backend_optimize_emits_address_lists():
+    """Test the backend renders address-lists and reports before/after counts."""
+    rules = [
+        FirewallRule(name=f"web-{host}", action="accept", from_zones=["wan"], to_zones=["main"],
+                     protocol="tcp", port="443", dest_ip=f"192.168.1.{host}")
+        for host in (10, 11, 12)
+    ]
+    policy = Policy(
+        meta=Meta(name="optimized", target=Target(vendor="routeros")),
+        wan=WANConfig(type="dhcp", interface="ether1"),
+        lans=[LANConfig(name="main", subnet="192.168.1.0/24", gateway="192.168.1.1")],
+        firewall=Firewall(rules=rules),
+    )
+
+    plain = RouterOSBackend(policy).generate()
+    assert plain.count("dst-port=443") == 3
+    assert "dst-address=192.168.1.10" in plain
+
+    backend = RouterOSBackend(policy, optimize=True)
+    config = backend.generate()
+    assert "/ip firewall address-list add list=web-10-dst address=192.168.1.12" in config
+    assert config.count("dst-address-list=web-10-dst") == 1
+    assert (backend.compaction.before, backend.compaction.after) == (3, 1)
+    assert "# Compacted: Firewall rules: 3 -> 1 (1 address set(s))" in config
+
+    reports = []
+    assert render_policy(policy, optimize=True, on_compaction=reports.append) == config
+    assert [(report.before, report.after) for report in reports] == [(3, 1)]
@@ -0,0 +1,129 @@
+"""Test the rule-based fast path for policy generation."""
+
+import pytest
+from typer.testing import CliRunner
+
+from router_policy_to_config import yaml_utils
+from router_policy_to_config.ai.intent_matcher import IntentMatcher
+from router_policy_to_config.ai.policy_nl_to_yaml import PolicyGenerator
+from router_policy_to_config.ai_providers import MockProvider
+from router_policy_to_config.backends import render_policy
+from router_policy_to_config.cli import app
+from router_policy_to_config.policy_loader import PolicyLoader
+from router_policy_to_config.policy_validator import PolicyValidator
+
+
+@pytest.mark.parametrize("description, intents", [
+    (
+        "офис, гостевой WiFi, PPPoE, WireGuard для 5 сотрудников",
+        ["guest-isolation", "wifi", "wan-pppoe", "wireguard-road-warrior"],
+    ),
+    (
+        "ISP via PPPoE on ether2, LAN 192.168.50.0/24, guest Wi-Fi, WireGuard VPN",
+        ["wan-pppoe", "lan", "guest-isolation", "wifi", "wireguard-road-warrior"],
+    ),
+    (
+        "OpenWrt, интернет по DHCP, проброс порта 8443 на 192.168.10.10:443, гостевая сеть",
+        ["wan-dhcp", "port-forward", "guest-isolation"],
+    ),
+])
+def test_formulaic_descriptions_produce_valid_policies(description, intents):
+    """Assembled policies pass schema and semantic validation and render."""
+    match = IntentMatcher().analyze(description)
+    assert match.covered and match.intents == intents
+
+    loader = PolicyLoader()
+    data = yaml_utils.safe_load(match.to_yaml())
+    loader.validate_schema(data)
+    policy = loader.to_model(data)
+    validator = PolicyValidator(policy)
+    validator.validate()
+    assert validator.get_warnings() == []
+    assert render_policy(policy)
+
+
+def test_assembled_details():
+    """Interface, subnet, peer count and port forwards are taken from the text."""
+    policy = IntentMatcher().analyze(
+        "ISP via PPPoE on ether2, LAN 192.168.50.0/24, WireGuard для 3 сотрудников, "
+        "port forward udp 1194 to 192.168.50.20"
+    ).policy
+    assert policy["wan"]["interface"] == "ether2"
+    assert policy["lans"][0]["gateway"] == "192.168.50.1"
+    assert [peer["name"] for peer in policy["vpn"][0]["peers"]] == ["user1", "user2", "user3"]
+    assert policy["nat"]["port_forwards"] == [{
+        "name": "forward_udp_1194", "protocol": "udp", "external_port": 1194,
+        "internal_ip": "192.168.50.20", "internal_port": 1194,
+    }]
+
+
+def test_generated_subnets_avoid_the_lan():
+    """Guest and WireGuard subnets move aside when the LAN takes the default ones."""
+    match = IntentMatcher().analyze(
+        "Office, PPPoE, WireGuard for 5 users, lan 10.10.0.0/24, guest Wi-Fi, port forward 443 to 10.10.0.5"
+    )
+    assert match.policy["vpn"][0]["allowed_ips"] == ["10.20.0.1/24"]
+
+    loader = PolicyLoader()
+    policy = loader.to_model(yaml_utils.safe_load(match.to_yaml()))
+    validator = PolicyValidator(policy)
+    validator.validate()
+    assert validator.get_warnings() == []
+
+    match = IntentMatcher().analyze("PPPoE, LAN 192.168.20.0/24, гостевая сеть")
+    assert [lan["subnet"] for lan in match.policy["lans"]] == ["192.168.20.0/24", "192.168.30.0/24"]
+
+    match = IntentMatcher().analyze("PPPoE, guest wifi 10.5.0.0/24")
+    assert [lan["subnet"] for lan in match.policy["lans"]] == ["192.168.10.0/24", "10.5.0.0/24"]
+
+
+@pytest.mark.parametrize("description", [
+    "Office",  # No building block
+    "Office with guest Wi-Fi limited to 10 Mbit",  # Unsupported feature
+    "PPPoE, cameras on a separate network",  # Unrecognized clause
+    "PPPoE, интернет по DHCP",  # Contradicting WAN types
+    "Home router without VPN, PPPoE",  # Negations must not add the excluded feature
+    "офис без VPN, PPPoE",
+    "PPPoE, no wifi",
+    "гостевой WiFi без изоляции",
+    "PPPoE, port forward 443 to 8.8.8.8",  # Forward target outside the LAN
+    "home router, pppoe, forward 80 to 192.168.10.5, forward 80 to 192.168.10.6",  # Conflicting forwards
+    "PPPoE, LAN 192.168.0.0/16, guest Wi-Fi",  # No free guest subnet
+    "PPPoE, guest wifi 192.168.10.0/24",  # Guest subnet given as the LAN's
+    "guest wifi that can reach the office printer",  # Words left over after the building blocks
+    "ssh access only from vpn",
+    "vpn to the Moscow branch office",
+])
+def test_uncovered_descriptions_fall_back_to_ai(description):
+    """Descriptions the fast path cannot fully express go to the provider."""
+    provider = MockProvider()
+    generator = PolicyGenerator(provider)
+    generator.generate_from_text(description)
+    assert provider.call_count == 1
+    assert generator.last_match is None
+
+
+def test_fast_path_skips_provider_and_reports_hits():
+    """Covered descriptions never reach the provider; stats report the hit rate."""
+    provider = MockProvider()
+    generator = PolicyGenerator(provider)
+    generator.generate_from_text("Дом, PPPoE, Wi-Fi")
+    assert "".join(generator.stream_from_text("Office, guest Wi-Fi, DHCP from ISP")).startswith("meta:")
+    generator.generate_from_text("Office")
+
+    assert provider.call_count == 1
+    stats = generator.intent_matcher.stats
+    assert (stats.hits, stats.misses) == (2, 1)
+    assert stats.get_summary().startswith("Fast path: 2/3 descriptions (67%), 1 sent to AI [wifi: 2")
+
+    PolicyGenerator(provider, fast_path=False).generate_from_text("Дом, PPPoE, Wi-Fi")
+    assert provider.call_count == 2
+
+
+def test_cli_reports_fast_path(tmp_path):
+    """ai-suggest names the assembled building blocks and prints the hit report."""
+    output = tmp_path / "policy.yaml"
+    result = CliRunner().invoke(app, ["ai-suggest", "--desc", "Дом, PPPoE, Wi-Fi", "--out", str(output)])
+    assert result.exit_code == 0, result.output
+    assert "Assembled locally: wan-pppoe, wifi" in result.output
+    assert "Fast path: 1/1 descriptions (100%)" in result.output
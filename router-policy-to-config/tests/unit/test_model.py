@@ -0,0 +1,73 @@
+"""Test policy model memory layout."""
+
+import gc
+import tracemalloc
+
+import pytest
+
+from router_policy_to_config.model import Firewall, FirewallRule, Meta, Policy, WANConfig, compact_policy
+
+
+def _fresh(text):
+    """Build a new string object, as a YAML parser would for every occurrence."""
+    return "".join(list(text))
+
+
+def _build_policy(rule_count):
+    rules = [
+        FirewallRule(
+            name=f"rule-{i}",
+            action=_fresh("accept"),
+            from_zones=[_fresh("lan")],
+            to_zones=[_fresh("wan")],
+            protocol=_fresh("tcp"),
+            port=str(443 + i % 10),
+        )
+        for i in range(rule_count)
+    ]
+    return Policy(
+        meta=Meta(name="fleet"),
+        wan=WANConfig(type="dhcp", interface="ether1"),
+        firewall=Firewall(rules=rules),
+    )
+
+
+def test_models_are_slotted():
+    """Test model instances carry no per-instance __dict__."""
+    rule = FirewallRule(name="r", action="accept")
+
+    assert not hasattr(rule, "__dict__")
+    with pytest.raises(AttributeError):
+        rule.unknown_field = True
+
+
+def test_compact_policy_shares_strings_and_freezes_lists():
+    """Test compaction interns repeated values and converts lists to tuples."""
+    policy = compact_policy(_build_policy(3))
+    first, second = policy.firewall.rules[:2]
+
+    assert isinstance(policy.firewall.rules, tuple)
+    assert first.from_zones == ("lan",)
+    assert first.from_zones[0] is second.from_zones[0]
+    assert first.protocol is second.protocol
+    assert first.state == ()
+
+
+def test_compact_policy_memory_budget():
+    """Test a synthetic 100k-rule policy stays within its memory budget."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        policy = _build_policy(100_000)
+        gc.collect()
+        loaded = tracemalloc.get_traced_memory()[0]
+
+        compact_policy(policy)
+        gc.collect()
+        compacted = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    # ~27 MB measured; a __dict__-based model with lists used ~67 MB
+    assert compacted < 40 * 1024 * 1024
+    assert compacted < loaded * 0.6
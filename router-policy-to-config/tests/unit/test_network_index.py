@@ -0,0 +1,69 @@
+"""Test network index functionality."""
+
+import ipaddress
+
+from router_policy_to_config.model import LANConfig, Meta, NATConfig, Policy, PortForward, Target, WANConfig
+from router_policy_to_config.network_index import NetworkIndex
+from router_policy_to_config.policy_validator import PolicyValidator
+
+
+def _index(*pairs):
+    return NetworkIndex([(name, ipaddress.ip_network(subnet)) for name, subnet in pairs])
+
+
+def test_overlaps_reports_nested_pairs_in_declaration_order():
+    """Test every nested pair is reported, earlier-declared network first."""
+    index = _index(
+        ("small", "10.0.1.0/24"),
+        ("other", "192.168.0.0/24"),
+        ("big", "10.0.0.0/16"),
+        ("tiny", "10.0.1.128/25"),
+    )
+
+    pairs = [(a, b) for a, _, b, _ in index.overlaps()]
+
+    assert pairs == [("small", "big"), ("small", "tiny"), ("big", "tiny")]
+
+
+def test_lookup_returns_most_specific_network():
+    """Test lookup walks to the smallest enclosing network."""
+    index = _index(
+        ("hq", "10.0.0.0/16"),
+        ("voice", "10.0.1.0/24"),
+        ("servers", "10.0.2.0/24"),
+        ("v6", "fd00::/64"),
+    )
+
+    assert index.lookup("10.0.1.10") == "voice"
+    assert index.lookup("10.0.3.10") == "hq"
+    assert index.lookup("10.0.2.255") == "servers"
+    assert index.lookup("10.1.0.1") is None
+    assert index.lookup("fd00::1") == "v6"
+
+
+def test_validator_handles_hundreds_of_lans_and_forwards():
+    """Test validation of a large policy uses the index for overlaps and forwards."""
+    lans = [
+        LANConfig(name=f"vlan{i}", subnet=f"10.{i // 256}.{i % 256}.0/24", gateway=f"10.{i // 256}.{i % 256}.1")
+        for i in range(500)
+    ]
+    lans.append(LANConfig(name="dup", subnet="10.0.7.0/25", gateway="10.0.7.1"))
+    forwards = [
+        PortForward(external_port=10000 + i, internal_ip=f"10.{i // 256}.{i % 256}.10", internal_port=80)
+        for i in range(2000)
+    ]
+    policy = Policy(
+        meta=Meta(name="hq", target=Target(vendor="routeros")),
+        wan=WANConfig(type="dhcp", interface="ether1"),
+        lans=lans,
+        nat=NATConfig(port_forwards=forwards),
+    )
+
+    validator = PolicyValidator(policy)
+    validator.lan_index = validator._build_lan_index()
+    validator._check_subnet_overlaps()
+    validator._check_nat_port_forwards()
+
+    assert validator.errors == ["Subnets overlap: 'vlan7' (10.0.7.0/24) and 'dup' (10.0.7.0/25)"]
+    # Forwards to 10.1.244.10 .. 10.7.207.10 fall outside the 500 defined LANs
+    assert len(validator.warnings) == 1500
@@ -0,0 +1,95 @@
+"""Test OpenWrt backend functionality."""
+
+from router_policy_to_config.backends.openwrt_backend import OpenWrtBackend
+from router_policy_to_config.model import (
+    Firewall,
+    FirewallRule,
+    LANConfig,
+    Meta,
+    NATConfig,
+    Policy,
+    PortForward,
+    Target,
+    WANConfig,
+)
+
+
+def _policy(version=None, rules=()):
+    return Policy(
+        meta=Meta(name="fw4-router", target=Target(vendor="openwrt", version=version)),
+        wan=WANConfig(type="dhcp", interface="eth1"),
+        lans=[LANConfig(name="main", subnet="192.168.1.0/24", gateway="192.168.1.1")],
+        firewall=Firewall(rules=list(rules)),
+    )
+
+
+BLOCKED = [
+    FirewallRule(name=f"block-{host}", action="drop", from_zones=["main"], to_zones=["wan"],
+                 dest_ip=f"203.0.113.{host}")
+    for host in range(1, 51)
+] + [
+    FirewallRule(name="block-net", action="drop", from_zones=["main"], to_zones=["wan"], dest_ip="198.51.100.0/24"),
+    FirewallRule(name="allow-web", action="accept", from_zones=["main"], to_zones=["wan"], protocol="tcp", port="80"),
+    FirewallRule(name="allow-tls", action="accept", from_zones=["main"], to_zones=["wan"], protocol="tcp", port="443"),
+]
+
+
+def test_firewall4_detected_from_target_version():
+    """Test firewall4 mode is enabled for OpenWrt 22.03 and later only."""
+    assert OpenWrtBackend(_policy("22.03")).firewall4
+    assert OpenWrtBackend(_policy("v23.05.2")).firewall4
+    assert not OpenWrtBackend(_policy("21.02")).firewall4
+    assert not OpenWrtBackend(_policy()).firewall4
+
+
+def test_firewall4_collects_addresses_and_ports_into_sets():
+    """Test blocked hosts become one named set and ports one anonymous set."""
+    backend = OpenWrtBackend(_policy("23.05", BLOCKED))
+    firewall = backend.generate()["firewall"]
+
+    assert firewall.count("config ipset") == 1
+    assert "\toption name 'block-1-dest'" in firewall
+    assert "\tlist match 'dest_net'" in firewall
+    assert "\tlist entry '203.0.113.50'" in firewall
+    assert "\tlist entry '198.51.100.0/24'" in firewall
+    assert "\toption ipset 'block-1-dest'" in firewall
+    assert "\toption dest_port '80 443'" in firewall
+    assert firewall.count("config rule") == 2
+    assert (backend.compaction.before, backend.compaction.after) == (53, 2)
+
+
+def test_legacy_firewall_keeps_one_section_per_rule():
+    """Test fw3 targets keep individual rule sections."""
+    firewall = OpenWrtBackend(_policy("21.02", BLOCKED)).generate()["firewall"]
+
+    assert "config ipset" not in firewall
+    assert firewall.count("config rule") == len(BLOCKED)
+    assert "\toption dest_ip '203.0.113.7'" in firewall
+
+
+def test_flow_offloading_in_defaults():
+    """Test performance settings enable software and hardware flow offloading."""
+    from router_policy_to_config.model import PerformanceConfig
+
+    policy = _policy("23.05")
+    assert "flow_offloading" not in OpenWrtBackend(policy).generate()["firewall"]
+
+    policy.performance = PerformanceConfig(fasttrack=True, hw_offload=True)
+    defaults = OpenWrtBackend(policy).generate()["firewall"].split("config zone")[0]
+    assert "\toption flow_offloading '1'" in defaults
+    assert "\toption flow_offloading_hw '1'" in defaults
+
+
+def test_port_forward_targets_the_zone_of_the_host_lan():
+    """Test redirects use the zone named after the LAN holding the internal host."""
+    policy = _policy("23.05")
+    policy.lans.append(LANConfig(name="dmz", subnet="192.168.50.0/24", gateway="192.168.50.1"))
+    policy.nat = NATConfig(port_forwards=[
+        PortForward(name="web", protocol="tcp", external_port=443, internal_ip="192.168.50.10", internal_port=443),
+        PortForward(name="nas", protocol="tcp", external_port=5000, internal_ip="192.168.1.20", internal_port=5000),
+    ])
+    firewall = OpenWrtBackend(policy).generate()["firewall"]
+
+    redirects = firewall.split("config redirect")[1:]
+    assert "option dest 'dmz'" in redirects[0]
+    assert "option dest 'main'" in redirects[1]
@@ -0,0 +1,75 @@
+"""Test OpenWrt diff functionality."""
+
+from router_policy_to_config.diff.openwrt_diff import OpenWrtDiff
+
+CURRENT = """
+config defaults
+\toption input 'ACCEPT'
+
+config zone 'lan'
+\toption name 'lan'
+\toption input 'ACCEPT'
+
+config rule
+\toption name 'Allow-SSH'
+\toption dest_port '22'
+\toption target 'ACCEPT'
+
+config rule
+\toption name 'Allow-Ping'
+\toption proto 'icmp'
+\toption target 'ACCEPT'
+
+config rule
+\toption name 'Legacy'
+\toption dest_port '8080'
+"""
+
+GENERATED = """
+config defaults
+\toption input 'REJECT'
+
+config zone 'lan'
+\toption name 'lan'
+\toption input 'ACCEPT'
+
+config zone 'guest'
+\toption name 'guest'
+
+config rule
+\toption name 'Allow-Ping'
+\toption proto 'icmp'
+\toption target 'ACCEPT'
+
+config rule
+\toption name 'Allow-SSH'
+\toption dest_port '2222'
+\toption target 'ACCEPT'
+"""
+
+
+def test_anonymous_sections_matched_by_content_then_name():
+    """Test anonymous rules are not collapsed into one key and are paired by identity."""
+    result = OpenWrtDiff({"firewall": CURRENT}, {"firewall": GENERATED}).compute_diff()
+    firewall = result["files"]["firewall"]
+
+    assert firewall["added_sections"] == [{"type": "zone", "name": "guest"}]
+    assert firewall["removed_sections"] == [{"type": "rule", "name": "@rule[2]"}]
+
+    modified = {(s["type"], s["name"]): s for s in firewall["modified_sections"]}
+    assert set(modified) == {("defaults", "@defaults[0]"), ("rule", "@rule[1]")}
+    assert "option dest_port '22'" in modified[("rule", "@rule[1]")]["current_options"]
+    assert "option dest_port '2222'" in modified[("rule", "@rule[1]")]["generated_options"]
+
+
+def test_anonymous_sections_fall_back_to_position():
+    """Test unnamed sections without a name option are paired in order."""
+    current = "config forwarding\n\toption src 'lan'\n\toption dest 'wan'\n"
+    generated = current + "\nconfig forwarding\n\toption src 'guest'\n\toption dest 'wan'\n"
+    generated = generated.replace("'lan'", "'iot'")
+
+    firewall = OpenWrtDiff({"firewall": current}, {"firewall": generated}).compute_diff()["files"]["firewall"]
+
+    assert firewall["modified_sections"][0]["name"] == "@forwarding[0]"
+    assert firewall["added_sections"] == [{"type": "forwarding", "name": "@forwarding[1]"}]
+    assert firewall["removed_sections"] == []
@@ -0,0 +1,89 @@
+"""Test OpenWrt change planning."""
+
+from router_policy_to_config.diff.openwrt_plan import OpenWrtPlanner
+
+FIREWALL = """config defaults
+\toption input 'ACCEPT'
+\toption forward 'REJECT'
+
+config zone 'lan'
+\toption name 'lan'
+\tlist network 'lan'
+
+config rule
+\toption name 'Allow-SSH'
+\toption src 'lan'
+\toption dest_port '22'
+\toption target 'ACCEPT'
+
+config rule
+\toption name 'Allow-Web'
+\toption src 'lan'
+\toption dest_port '80'
+\toption target 'ACCEPT'
+"""
+
+NETWORK = """config interface 'lan'
+\toption proto 'static'
+\toption ipaddr '192.168.1.1'
+"""
+
+
+def test_plan_changes_one_option_and_reloads_only_firewall():
+    """Test a one-option change emits one set and reloads only its service."""
+    generated = {"network": NETWORK, "firewall": FIREWALL.replace("dest_port '80'", "dest_port '80 443'")}
+    plan = OpenWrtPlanner({"network": NETWORK, "firewall": FIREWALL}, generated).plan()
+
+    assert plan.batch == ["set firewall.@rule[1].dest_port='80 443'"]
+    assert plan.packages == ["firewall"]
+    assert plan.reload_commands == ["/etc/init.d/firewall reload"]
+
+    commands = plan.to_commands()
+    assert "uci batch << 'EOF'" in commands
+    assert "commit firewall" in commands
+    assert "/etc/init.d/network reload" not in commands
+
+
+def test_plan_adds_and_deletes_anonymous_sections():
+    """Test new rules use 'add' plus '@type[-1]' and deletions go from the highest index."""
+    current = FIREWALL + "\nconfig rule\n\toption name 'Legacy-1'\n\toption target 'DROP'\n" \
+        "\nconfig rule\n\toption name 'Legacy-2'\n\toption target 'DROP'\n"
+    generated = FIREWALL + "\nconfig rule\n\toption name 'Allow-DNS'\n\toption dest_port '53'\n" \
+        "\toption target 'ACCEPT'\n"
+    plan = OpenWrtPlanner({"firewall": current}, {"firewall": generated}).plan()
+
+    assert plan.batch == [
+        "add firewall rule",
+        "set firewall.@rule[-1].name='Allow-DNS'",
+        "set firewall.@rule[-1].dest_port='53'",
+        "set firewall.@rule[-1].target='ACCEPT'",
+        "delete firewall.@rule[3]",
+        "delete firewall.@rule[2]",
+    ]
+    assert (plan.added, plan.changed, plan.removed, plan.moved) == (1, 0, 2, 0)
+
+    kept = OpenWrtPlanner({"firewall": current}, {"firewall": generated}, prune=False).plan()
+    assert not any(line.startswith("delete") for line in kept.batch)
+
+
+def test_plan_reorders_rules_and_handles_new_packages():
+    """Test first-match rule order is restored and missing packages are created."""
+    swapped = FIREWALL.replace("Allow-SSH", "TMP").replace("Allow-Web", "Allow-SSH").replace("TMP", "Allow-Web")
+    swapped = swapped.replace("dest_port '22'", "TMP").replace("dest_port '80'", "dest_port '22'")
+    swapped = swapped.replace("TMP", "dest_port '80'")
+    plan = OpenWrtPlanner({"firewall": swapped}, {"firewall": FIREWALL, "network": NETWORK}).plan()
+
+    assert "reorder firewall.@rule[1]=2" in plan.batch
+    assert plan.moved == 1
+    assert plan.new_packages == ["network"]
+    assert "touch /etc/config/network" in plan.to_commands()
+    assert "set network.lan=interface" in plan.batch
+
+
+def test_plan_without_changes():
+    """Test identical configs produce no batch and no reloads."""
+    plan = OpenWrtPlanner({"firewall": FIREWALL}, {"firewall": FIREWALL}).plan()
+
+    assert not plan.has_changes
+    assert plan.reload_commands == []
+    assert plan.get_summary() == "No changes to apply."
@@ -141,3 +141,145 @@ def test_to_model_conversion():
     assert policy.wan.type == "dhcp"
     assert len(policy.lans) == 1
     assert policy.lans[0].dhcp.enabled is True
+
+
+def test_validator_is_compiled_once_and_shared():
+    """Test loaders share one compiled validator per schema file."""
+    first = PolicyLoader()
+    second = PolicyLoader()
+
+    assert first.validator is second.validator
+    assert first.schema == second.schema
+
+
+def test_collect_all_schema_errors(tmp_path):
+    """Test collect_all_errors reports every schema error with its path."""
+    policy_content = """
+meta:
+  name: test
+  target:
+    vendor: cisco
+
+wan:
+  type: carrier-pigeon
+  interface: ether1
+"""
+
+    policy_file = tmp_path / "policy.yaml"
+    policy_file.write_text(policy_content)
+
+    loader = PolicyLoader(collect_all_errors=True)
+
+    with pytest.raises(PolicyLoadError) as exc_info:
+        loader.load(str(policy_file))
+
+    message = str(exc_info.value)
+    assert "meta.target.vendor" in message
+    assert "wan.type" in message
+    assert len(loader.schema_errors(loader.load_yaml(str(policy_file)))) == 2
+
+
+def test_load_yaml_rejects_python_tags(tmp_path):
+    """Test the (C)SafeLoader fast path still refuses arbitrary Python objects."""
+    from router_policy_to_config import yaml_utils
+
+    policy_file = tmp_path / "policy.yaml"
+    policy_file.write_text("meta: !!python/object/apply:os.system ['true']\n")
+
+    if yaml.__with_libyaml__:
+        assert yaml_utils.SafeLoader is yaml.CSafeLoader
+
+    with pytest.raises(PolicyLoadError, match="Failed to parse YAML"):
+        PolicyLoader().load_yaml(str(policy_file))
+
+
+def test_extends_and_include_deep_merge(tmp_path):
+    """Test bases and fragments merge with name-keyed lists and child precedence."""
+    (tmp_path / "base.yaml").write_text("""
+meta:
+  name: baseline
+  target:
+    vendor: routeros
+wan:
+  type: dhcp
+  interface: ether1
+lans:
+  - name: main
+    subnet: 192.168.1.0/24
+    gateway: 192.168.1.1
+dns:
+  servers: [1.1.1.1, 8.8.8.8]
+""")
+    (tmp_path / "firewall.yaml").write_text("""
+firewall:
+  default_policy: drop
+  rules:
+    - name: allow_lan
+      from: [main]
+      to: [wan]
+      action: accept
+    - name: block_telnet
+      action: drop
+      protocol: tcp
+      port: 23
+""")
+    (tmp_path / "branch.yaml").write_text("""
+extends: base.yaml
+include: [firewall.yaml]
+meta:
+  name: branch-42
+lans:
+  - name: main
+    subnet: 10.42.0.0/24
+    gateway: 10.42.0.1
+  - name: guest
+    subnet: 10.42.1.0/24
+    gateway: 10.42.1.1
+firewall:
+  rules:
+    - name: block_telnet
+      action: reject
+dns:
+  servers: [9.9.9.9]
+""")
+
+    policy = PolicyLoader().load(str(tmp_path / "branch.yaml"))
+
+    assert policy.meta.name == "branch-42"
+    assert policy.meta.target.vendor == "routeros"
+    assert [(lan.name, lan.subnet) for lan in policy.lans] == [("main", "10.42.0.0/24"), ("guest", "10.42.1.0/24")]
+    assert [(r.name, r.action) for r in policy.firewall.rules] == [("allow_lan", "accept"), ("block_telnet", "reject")]
+    assert policy.firewall.rules[1].protocol == "tcp"
+    assert policy.dns.servers == ["9.9.9.9"]
+
+
+def test_shared_base_parsed_once_per_process(tmp_path, monkeypatch):
+    """Test a baseline shared by many policies is parsed once and re-read on change."""
+    from router_policy_to_config import yaml_utils
+
+    (tmp_path / "base.yaml").write_text("wan:\n  type: dhcp\n  interface: ether1\n")
+    for i in range(3):
+        (tmp_path / f"site{i}.yaml").write_text(
+            f"extends: base.yaml\nmeta:\n  name: site{i}\n  target:\n    vendor: openwrt\n"
+        )
+
+    parsed = []
+    original = yaml_utils.safe_load
+    monkeypatch.setattr(yaml_utils, "safe_load", lambda stream: parsed.append(1) or original(stream))
+
+    loader = PolicyLoader()
+    policies = [loader.load(str(tmp_path / f"site{i}.yaml")) for i in range(3)]
+    assert [p.wan.interface for p in policies] == ["ether1"] * 3
+    assert len(parsed) == 3 + 1
+
+    (tmp_path / "base.yaml").write_text("wan:\n  type: dhcp\n  interface: eth0\n")
+    assert PolicyLoader().load(str(tmp_path / "site0.yaml")).wan.interface == "eth0"
+
+
+def test_circular_extends_rejected(tmp_path):
+    """Test cycles between policy files are reported."""
+    (tmp_path / "a.yaml").write_text("extends: b.yaml\n")
+    (tmp_path / "b.yaml").write_text("include: [a.yaml]\n")
+
+    with pytest.raises(PolicyLoadError, match="Circular extends/include"):
+        PolicyLoader().load_yaml(str(tmp_path / "a.yaml"))
@@ -159,3 +159,48 @@ def test_firewall_zone_validation():
     
     with pytest.raises(ValidationError, match="unknown zone"):
         validator.validate()
+
+
+def test_performance_fasttrack_checks():
+    """Test FastTrack conflicts with IPsec and hw_offload requires fasttrack."""
+    from router_policy_to_config.model import PerformanceConfig, VPNConfig
+
+    policy = Policy(
+        meta=Meta(name="test", target=Target(vendor="routeros", version="v6")),
+        wan=WANConfig(type="dhcp", interface="ether1"),
+        lans=[LANConfig(name="lan1", subnet="192.168.1.0/24", gateway="192.168.1.1")],
+        vpn=[VPNConfig(type="ipsec", role="client")],
+        performance=PerformanceConfig(fasttrack=True, hw_offload=True),
+    )
+
+    with pytest.raises(ValidationError, match="incompatible with IPsec"):
+        PolicyValidator(policy).validate()
+
+    policy.vpn = []
+    validator = PolicyValidator(policy)
+    validator.validate()
+    assert any("requires RouterOS v7" in warning for warning in validator.warnings)
+
+    policy.performance = PerformanceConfig(hw_offload=True)
+    with pytest.raises(ValidationError, match="requires performance.fasttrack"):
+        PolicyValidator(policy).validate()
+
+
+def test_routeros_isolation_without_vlan_warns():
+    """Test isolating LANs that share bridge-lan produces a RouterOS warning."""
+    policy = Policy(
+        meta=Meta(name="test", target=Target(vendor="routeros")),
+        wan=WANConfig(type="dhcp", interface="ether1"),
+        lans=[
+            LANConfig(name="main", subnet="192.168.1.0/24", gateway="192.168.1.1"),
+            LANConfig(name="guest", subnet="192.168.2.0/24", gateway="192.168.2.1", isolated_from=["main"]),
+        ]
+    )
+
+    validator = PolicyValidator(policy)
+    validator.validate()
+    assert any("without a vlan_id" in warning for warning in validator.warnings)
+
+    policy.lans[1].vlan_id = 20
+    validator.validate()
+    assert not validator.warnings
@@ -0,0 +1,104 @@
+"""Test render cache functionality."""
+
+import os
+
+from router_policy_to_config.backends import render_policy
+from router_policy_to_config.model import LANConfig, Meta, Policy, Target, WANConfig
+from router_policy_to_config.render_cache import RenderCache, compute_cache_key
+
+
+def _make_policy(name="cached-router", vendor="routeros"):
+    return Policy(
+        meta=Meta(name=name, target=Target(vendor=vendor, version="v7")),
+        wan=WANConfig(type="pppoe", interface="ether1", username="user", password_ref="secret-a"),
+        lans=[LANConfig(name="main", subnet="192.168.1.0/24", gateway="192.168.1.1")],
+    )
+
+
+def test_cache_key_covers_policy_secrets_and_vendor():
+    """Test the key changes with policy content, resolved secrets and vendor."""
+    policy = _make_policy()
+    key = compute_cache_key(policy)
+
+    assert key == compute_cache_key(_make_policy())
+    assert key != compute_cache_key(policy, vendor="openwrt")
+
+    rotated = _make_policy()
+    rotated.wan.password_ref = "secret-b"
+    assert key != compute_cache_key(rotated)
+
+
+def test_render_policy_uses_cache(tmp_path):
+    """Test a cache hit returns the stored output without re-rendering."""
+    cache = RenderCache(str(tmp_path))
+    policy = _make_policy()
+
+    first = render_policy(policy, cache=cache)
+    second = render_policy(policy, cache=cache)
+    openwrt = render_policy(policy, vendor="openwrt", cache=cache)
+
+    assert first == second
+    assert isinstance(openwrt, dict) and "network" in openwrt
+    assert cache.hits == 1
+    assert cache.misses == 2
+    assert cache.stats()["entries"] == 2
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """Test entries are evicted oldest-first once max_bytes is exceeded."""
+    cache = RenderCache(str(tmp_path), max_bytes=2500)
+
+    cache.put("old", "x" * 1000)
+    cache.put("recent", "y" * 1000)
+    os.utime(tmp_path / "old.txt", (1, 1))
+    os.utime(tmp_path / "recent.txt", (2, 2))
+    cache.put("new", "z" * 1000)
+
+    assert cache.get("old") is None
+    assert cache.get("recent") == "y" * 1000
+    assert cache.get("new") == "z" * 1000
+    assert cache.clear() == 2
+
+
+def test_render_to_path_streams_through_cache(tmp_path):
+    """Test RouterOS output is written to disk and served file-to-file on a hit."""
+    from router_policy_to_config.backends import render_to_path
+
+    cache = RenderCache(str(tmp_path / "cache"))
+    policy = _make_policy()
+
+    first = render_to_path(policy, tmp_path / "first.rsc", cache=cache)
+    second = render_to_path(policy, tmp_path / "second.rsc", cache=cache)
+
+    assert (tmp_path / "first.rsc").read_text() == render_policy(policy)
+    assert (tmp_path / "second.rsc").read_text() == (tmp_path / "first.rsc").read_text()
+    assert len(first) == len(second) == 1
+    assert cache.hits == 1
+
+
+def test_overwrite_counts_size_once_and_secures_directory(tmp_path):
+    """Re-storing a key does not inflate the size; an existing directory is made owner-only."""
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir(mode=0o755)
+    os.chmod(cache_dir, 0o755)
+    cache = RenderCache(str(cache_dir), max_bytes=2500)
+
+    cache.put("other", "x" * 1000)
+    for _ in range(3):
+        cache.put("same", "y" * 1000)
+
+    assert cache._size == 2000
+    assert cache.get("other") == "x" * 1000
+    assert (cache_dir.stat().st_mode & 0o777) == 0o700
+
+
+def test_corrupt_entries_are_dropped(tmp_path):
+    """Unreadable text and JSON entries count as misses and are removed."""
+    cache = RenderCache(str(tmp_path))
+    (tmp_path / "text.txt").write_bytes(b"\xff\xfe broken")
+    (tmp_path / "multi.json").write_text("{not json")
+    (tmp_path / "array.json").write_text("[1, 2]")
+
+    assert cache.get("text") is None and cache.get("multi") is None and cache.get("array") is None
+    assert cache.misses == 3
+    assert not any((tmp_path / name).exists() for name in ("text.txt", "multi.json", "array.json"))
@@ -104,3 +104,119 @@ def test_routeros_firewall_generation():
     
     assert "firewall filter" in config
     assert "allow_lan_internet" in config or "accept" in config
+
+
+def test_routeros_streaming_matches_generate():
+    """Test iter_lines()/write() stream the same script as generate()."""
+    import io
+
+    from router_policy_to_config.model import Firewall, FirewallRule, WiFiConfig
+
+    policy = Policy(
+        meta=Meta(name="stream-router", target=Target(vendor="routeros")),
+        wan=WANConfig(type="dhcp", interface="ether1"),
+        lans=[LANConfig(name="main", subnet="192.168.1.0/24", gateway="192.168.1.1")],
+        wifi=[WiFiConfig(name="wifi1", lan="main", ssid="Office", mode="ap")],
+        firewall=Firewall(
+            rules=[
+                FirewallRule(name=f"rule{i}", from_zones=["main"], to_zones=["wan"], action="accept")
+                for i in range(100)
+            ]
+        ),
+    )
+
+    backend = RouterOSBackend(policy)
+    expected = backend.generate()
+
+    buffer = io.StringIO()
+    backend.write(buffer)
+
+    assert buffer.getvalue() == expected
+    assert list(backend.iter_lines()) == expected.split("\n")
+    # Section buffer is drained after each section
+    assert backend.commands == []
+
+
+def test_render_to_path_keeps_previous_file_on_failure(tmp_path, monkeypatch):
+    """Test a render failing mid-stream leaves the previous script and no temp file."""
+    from router_policy_to_config.backends import render_to_path
+
+    policy = Policy(
+        meta=Meta(name="atomic-router", target=Target(vendor="routeros")),
+        wan=WANConfig(type="dhcp", interface="ether1"),
+        lans=[LANConfig(name="main", subnet="192.168.1.0/24", gateway="192.168.1.1")],
+    )
+    output = tmp_path / "router.rsc"
+    output.write_text("previous")
+
+    def failing_write(self, fp):
+        fp.write("/ip address\n")
+        raise RuntimeError("render failed")
+
+    monkeypatch.setattr(RouterOSBackend, "write", failing_write)
+    with pytest.raises(RuntimeError):
+        render_to_path(policy, output)
+
+    assert output.read_text() == "previous"
+    assert [path.name for path in tmp_path.iterdir()] == ["router.rsc"]
+
+
+def test_routeros_fasttrack_generation():
+    """Test FastTrack rule is placed before the forward accept rule."""
+    from router_policy_to_config.model import PerformanceConfig
+
+    policy = Policy(
+        meta=Meta(name="fast-router", target=Target(vendor="routeros", version="v7")),
+        wan=WANConfig(type="dhcp", interface="ether1"),
+        lans=[],
+        performance=PerformanceConfig(fasttrack=True, hw_offload=True),
+    )
+
+    lines = RouterOSBackend(policy).generate().splitlines()
+    fasttrack = next(i for i, line in enumerate(lines) if "action=fasttrack-connection" in line)
+    accept = next(
+        i for i, line in enumerate(lines)
+        if "chain=forward connection-state=established,related action=accept" in line
+    )
+
+    assert fasttrack < accept
+    assert "hw-offload=yes" in lines[fasttrack]
+
+    policy.meta.target.version = "v6"
+    assert "hw-offload" not in RouterOSBackend(policy).generate()
+
+
+def test_routeros_zone_interface_lists():
+    """Test rules match per-zone interface lists, including combined multi-zone lists."""
+    from router_policy_to_config.model import Firewall, FirewallRule, VPNConfig
+
+    policy = Policy(
+        meta=Meta(name="zones", target=Target(vendor="routeros", version="v7")),
+        wan=WANConfig(type="dhcp", interface="ether1"),
+        lans=[
+            LANConfig(name="main", subnet="192.168.1.0/24", gateway="192.168.1.1"),
+            LANConfig(name="guest", subnet="192.168.20.0/24", gateway="192.168.20.1", vlan_id=20,
+                      isolated_from=["main"]),
+        ],
+        vpn=[VPNConfig(type="wireguard", role="server", listen_port=51820)],
+        firewall=Firewall(rules=[
+            FirewallRule(name="internet", action="accept", from_zones=["main", "guest"], to_zones=["wan"]),
+            FirewallRule(name="vpn_to_main", action="accept", from_zones=["vpn"], to_zones=["main"]),
+        ]),
+    )
+
+    config = RouterOSBackend(policy).generate()
+
+    assert "/interface list member add list=zone-guest interface=vlan-guest" in config
+    assert "/interface list member add list=zone-guest+main interface=vlan-guest" in config
+    assert "/interface list member add list=zone-guest+main interface=bridge-lan" in config
+    assert "in-interface-list=zone-guest+main out-interface-list=zone-wan action=accept" in config
+    assert "in-interface-list=zone-vpn out-interface-list=zone-main action=accept" in config
+    assert ('in-interface-list=zone-guest out-interface-list=zone-main action=drop '
+            'comment="Isolate guest from main"') in config
+
+    # VPN interfaces join their lists only after they are created
+    lines = config.splitlines()
+    wireguard = lines.index("/interface wireguard add name=wireguard1 private-key=\"<PRIVATE_KEY_NOT_SET>\" "
+                            "listen-port=51820")
+    assert lines[wireguard + 1] == "/interface list member add list=zone-vpn interface=wireguard1"
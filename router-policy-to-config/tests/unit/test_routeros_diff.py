@@ -0,0 +1,68 @@
+"""Test RouterOS diff functionality."""
+
+from router_policy_to_config.diff.routeros_diff import RouterOSDiff
+
+CURRENT = """# jan/01/2025 by RouterOS 7.12
+/interface bridge
+add name=bridge-main
+/ip address
+add address=192.168.1.1/24 interface=bridge-main
+/ip firewall filter
+add action=accept chain=input connection-state=established,related
+add action=drop chain=input in-interface=ether1 # legacy drop
+/system identity
+set name=office
+"""
+
+GENERATED = """/interface bridge
+add name=bridge-main
+/ip address
+add address=192.168.1.1/24 interface=bridge-main
+/ip firewall filter
+add action=accept chain=input connection-state=established,related
+add action=accept chain=input protocol=icmp
+add action=drop chain=input in-interface=ether1
+/system identity
+set name=office-gw
+"""
+
+
+def test_diff_only_reports_changed_menus():
+    """Test comments are ignored and only changed menu blocks are diffed."""
+    result = RouterOSDiff(CURRENT, GENERATED).compute_diff()
+
+    assert result["has_changes"]
+    assert result["added_lines"] == ["add action=accept chain=input protocol=icmp", "set name=office-gw"]
+    assert result["removed_lines"] == ["set name=office"]
+    assert set(result["section_changes"]) == {"ip", "system"}
+    assert result["section_changes"]["ip"] == {"added": ["add action=accept chain=input protocol=icmp"], "removed": []}
+    assert "--- current /ip firewall filter" in result["unified_diff"]
+    assert not any("bridge" in line for line in result["unified_diff"])
+
+
+def test_identical_configs_have_no_changes():
+    """Test identical exports (modulo comments and blank lines) produce no diff."""
+    result = RouterOSDiff(GENERATED + "\n# trailing\n", GENERATED).compute_diff()
+
+    assert not result["has_changes"]
+    assert result["unified_diff"] == []
+    assert result["section_changes"] == {}
+
+
+def test_diff_is_computed_once_and_invalidated_on_input_change(monkeypatch):
+    """Test summary and JSON share one computation until an input is reassigned."""
+    engine = RouterOSDiff(CURRENT, GENERATED)
+    calls = []
+    compute = engine._compute
+    monkeypatch.setattr(engine, "_compute", lambda: calls.append(1) or compute())
+
+    result = engine.result()
+    assert "Section: system" in engine.get_summary()
+    assert '"has_changes": true' in engine.to_json()
+    assert engine.compute_diff() is result.data
+    assert result.unified().startswith("--- current /ip firewall filter")
+    assert len(calls) == 1
+
+    engine.current = GENERATED
+    assert not engine.result().has_changes
+    assert len(calls) == 2
@@ -0,0 +1,93 @@
+"""Test RouterOS change planning."""
+
+from router_policy_to_config.diff.routeros_plan import RouterOSPlanner, parse_routeros_config
+
+CURRENT = """# jan/01/2025 by RouterOS 7.12
+/interface bridge
+add name=bridge-lan protocol-mode=rstp
+/ip address
+add address=192.168.1.1/24 interface=bridge-lan
+/ip firewall filter
+add action=accept chain=input comment="Accept established/related" \\
+    connection-state=established,related
+add action=accept chain=forward comment="Allow web" dst-port=80 protocol=tcp
+add action=drop chain=forward comment="Default drop"
+add action=accept chain=forward comment="Legacy rule"
+"""
+
+GENERATED = """/interface bridge add name=bridge-lan protocol-mode=rstp
+/ip address add address=192.168.1.1/24 interface=bridge-lan
+/ip firewall filter add chain=input connection-state=established,related action=accept comment="Accept established/related"
+/ip firewall filter add chain=forward protocol=tcp dst-port=80,443 action=accept comment="Allow web"
+/ip firewall filter add chain=forward protocol=tcp dst-port=22 action=accept comment="Allow SSH"
+/ip firewall filter add chain=forward action=drop comment="Default drop"
+"""
+
+
+def test_parse_joins_continuations_and_quoted_values():
+    """Test export block form, continuations and quoted comments are parsed."""
+    items = parse_routeros_config(CURRENT)
+    first_rule = items[2]
+
+    assert first_rule.menu == "/ip firewall filter"
+    assert first_rule.verb == "add"
+    assert first_rule.props["comment"] == "Accept established/related"
+    assert first_rule.props["connection-state"] == "established,related"
+
+
+def test_plan_emits_only_needed_commands():
+    """Test unchanged items are skipped and changes are matched by identity."""
+    plan = RouterOSPlanner(CURRENT, GENERATED).plan()
+
+    assert plan.commands == [
+        '/ip firewall filter set [find chain=forward comment="Allow web"] dst-port=80,443',
+        '/ip firewall filter add chain=forward protocol=tcp dst-port=22 action=accept comment="Allow SSH" '
+        'place-before=[find chain=forward comment="Default drop"]',
+        '/ip firewall filter remove [find chain=forward comment="Legacy rule"]',
+    ]
+    assert (plan.added, plan.changed, plan.removed, plan.moved) == (1, 1, 1, 0)
+    assert not RouterOSPlanner(GENERATED, GENERATED).plan().has_changes
+
+
+def test_plan_reorders_rules_and_respects_no_prune():
+    """Test out-of-order rules are moved and pruning can be disabled."""
+    current = GENERATED.replace(
+        '/ip firewall filter add chain=forward action=drop comment="Default drop"\n', ""
+    ).replace(
+        '/ip firewall filter add chain=input',
+        '/ip firewall filter add chain=forward action=drop comment="Default drop"\n/ip firewall filter add chain=input',
+    ) + '/ip firewall filter add chain=forward action=accept comment="Device only"\n'
+
+    plan = RouterOSPlanner(current, GENERATED, prune=False).plan()
+
+    assert plan.commands == ['/ip firewall filter move [find chain=forward comment="Default drop"]']
+    assert plan.removed == 0
+
+
+def test_plan_adopts_uncommented_rule_instead_of_readding():
+    """Test an uncommented rule gains the comment and removals skip commented rules."""
+    current = "/ip firewall filter\nadd action=drop chain=forward\nadd action=accept chain=input\n"
+    generated = '/ip firewall filter add chain=forward action=drop comment="Default drop"\n'
+
+    plan = RouterOSPlanner(current, generated).plan()
+
+    assert plan.commands == [
+        '/ip firewall filter set [find action=drop chain=forward comment=""] comment="Default drop"',
+        '/ip firewall filter remove [find action=accept chain=input comment=""]',
+    ]
+    assert (plan.added, plan.changed, plan.removed) == (0, 1, 1)
+
+
+def test_plan_selects_duplicate_identities_by_position():
+    """Test commands on duplicated identities touch exactly one item."""
+    current = (
+        "/ip firewall filter\n"
+        "add action=accept chain=forward comment=dup\n"
+        "add action=drop chain=forward comment=dup\n"
+    )
+    generated = "/ip firewall filter add chain=forward action=accept comment=dup\n"
+
+    plan = RouterOSPlanner(current, generated).plan()
+
+    assert plan.commands == ["/ip firewall filter remove ([find chain=forward comment=dup]->1)"]
+    assert RouterOSPlanner(current, current).plan().commands == []
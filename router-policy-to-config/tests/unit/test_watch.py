@@ -0,0 +1,94 @@
+"""Test watch mode functionality."""
+
+import os
+
+from router_policy_to_config.watch import PolicyWatcher
+
+POLICY_TEMPLATE = """
+meta:
+  name: {name}
+  target:
+    vendor: routeros
+
+wan:
+  type: dhcp
+  interface: ether1
+
+lans:
+  - name: main
+    subnet: {subnet}
+    gateway: {gateway}
+"""
+
+
+def _write(path, name, subnet="192.168.1.0/24", gateway="192.168.1.1", mtime=None):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(POLICY_TEMPLATE.format(name=name, subnet=subnet, gateway=gateway))
+    if mtime is not None:
+        os.utime(path, ns=(mtime, mtime))
+
+
+def test_watch_processes_only_changed_policies(tmp_path):
+    """Test the first poll renders everything and later polls only touched files."""
+    policies = tmp_path / "policies"
+    _write(policies / "hq.yaml", "hq", mtime=1_000_000_000)
+    _write(policies / "branch" / "b1.yaml", "b1", mtime=1_000_000_000)
+
+    watcher = PolicyWatcher(str(policies), output_dir=str(tmp_path / "out"))
+
+    first = watcher.poll()
+    assert [e.ok for e in first] == [True, True]
+    assert (tmp_path / "out" / "branch" / "b1.rsc").exists()
+    assert watcher.poll() == []
+
+    _write(policies / "hq.yaml", "hq", subnet="10.0.0.0/24", gateway="10.0.0.1", mtime=2_000_000_000)
+    events = watcher.poll()
+
+    assert [os.path.basename(e.path) for e in events] == ["hq.yaml"]
+    assert events[0].outputs == [str(tmp_path / "out" / "hq.rsc")]
+    assert "10.0.0.1/24" in (tmp_path / "out" / "hq.rsc").read_text()
+    assert not list((tmp_path / "out").glob(".*.tmp"))
+
+
+def test_watch_keeps_last_good_output_on_error(tmp_path):
+    """Test a broken edit is reported without touching the previous output."""
+    policies = tmp_path / "policies"
+    _write(policies / "hq.yaml", "hq", mtime=1_000_000_000)
+    watcher = PolicyWatcher(str(policies), output_dir=str(tmp_path / "out"))
+    watcher.poll()
+    rendered = (tmp_path / "out" / "hq.rsc").read_text()
+
+    _write(policies / "hq.yaml", "hq", gateway="10.9.9.9", mtime=2_000_000_000)
+    (event,) = watcher.poll()
+
+    assert not event.ok
+    assert "not in subnet" in event.error
+    assert (tmp_path / "out" / "hq.rsc").read_text() == rendered
+
+    (policies / "hq.yaml").unlink()
+    (removed,) = watcher.poll()
+    assert removed.removed and watcher.policies == {}
+
+
+def test_watch_rerenders_dependents_of_changed_base(tmp_path):
+    """Test editing a shared base re-renders the policies extending it, not the base itself."""
+    policies = tmp_path / "policies"
+    policies.mkdir()
+    (policies / "base.yaml").write_text("wan:\n  type: dhcp\n  interface: ether1\n")
+    os.utime(policies / "base.yaml", ns=(1_000_000_000, 1_000_000_000))
+    for name in ("site-a", "site-b"):
+        (policies / f"{name}.yaml").write_text(
+            f"extends: base.yaml\nmeta:\n  name: {name}\n  target:\n    vendor: routeros\n"
+        )
+
+    watcher = PolicyWatcher(str(policies), output_dir=str(tmp_path / "out"))
+    first = watcher.poll()
+    assert [os.path.basename(e.path) for e in first] == ["site-a.yaml", "site-b.yaml"]
+    assert all(e.ok for e in first)
+
+    (policies / "base.yaml").write_text("wan:\n  type: dhcp\n  interface: ether2\n")
+    os.utime(policies / "base.yaml", ns=(2_000_000_000, 2_000_000_000))
+    events = watcher.poll()
+
+    assert [os.path.basename(e.path) for e in events] == ["site-a.yaml", "site-b.yaml"]
+    assert "ether2" in (tmp_path / "out" / "site-a.rsc").read_text()
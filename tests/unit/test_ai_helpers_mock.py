@@ -22,3 +22,98 @@ def test_pipeline_generators_return_yaml_string() -> None:
     gh = generate_github_pipeline({"language": "python"}, provider)
     gl = generate_gitlab_pipeline({"language": "php"}, provider)
     assert gh.startswith("mock") and gl.startswith("mock")
+
+
+def test_async_batch_keeps_order_and_bounds_concurrency() -> None:
+    import threading
+    import time
+
+    from ci_security_templates.ai_pipeline_helpers.base import MockProvider as CIMockProvider
+
+    class SlowProvider(MockProvider):
+        def __init__(self) -> None:
+            self.lock = threading.Lock()
+            self.in_flight = 0
+            self.max_in_flight = 0
+
+        def complete(self, prompt: str, *, temperature: float = 0.2, max_tokens: int = 512) -> str:
+            with self.lock:
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            time.sleep(0.05)
+            with self.lock:
+                self.in_flight -= 1
+            return super().complete(prompt, temperature=temperature, max_tokens=max_tokens)
+
+    provider = SlowProvider()
+    prompts = [f"line {i}" for i in range(12)]
+    results = provider.complete_batch(prompts, concurrency=3)
+    assert [r.split("] ")[1] for r in results] == [f"{p}..." for p in prompts]
+    assert 2 <= provider.max_in_flight <= 3  # Calls overlap; the exact peak depends on scheduling
+
+    ci_results = CIMockProvider().complete_batch(["a", "b"], concurrency=2)
+    assert ci_results == ["mock-draft: a...", "mock-draft: b..."]
+
+
+def test_caching_provider_reuses_identical_prompts(tmp_path) -> None:
+    from ci_security_templates.ai_pipeline_helpers.base import MockProvider as CIMockProvider
+    from ci_security_templates.ai_pipeline_helpers.caching import CachingProvider as CICachingProvider
+    from logging_stack.ai_helpers.caching import CachingProvider, SQLiteCache
+
+    class CountingProvider(MockProvider):
+        calls = 0
+
+        def complete(self, prompt: str, *, temperature: float = 0.2, max_tokens: int = 512) -> str:
+            CountingProvider.calls += 1
+            return super().complete(prompt, temperature=temperature, max_tokens=max_tokens)
+
+    store_path = str(tmp_path / "ai.sqlite3")
+    provider = CachingProvider(CountingProvider(), store=SQLiteCache(store_path))
+    sample = "10.0.0.1 - - [date] \"GET /\" 200"
+    first = propose_parser_pipeline(sample, provider)
+    assert propose_parser_pipeline(sample, provider) == first
+    assert provider.complete("other", temperature=0.9) != first
+    assert CountingProvider.calls == 2
+    assert (provider.stats.memory_hits, provider.stats.store_hits, provider.stats.misses) == (1, 0, 2)
+
+    restarted = CachingProvider(CountingProvider(), store=SQLiteCache(store_path))
+    assert propose_parser_pipeline(sample, restarted) == first
+    assert restarted.stats.store_hits == 1 and CountingProvider.calls == 2
+
+    other_model = CountingProvider()
+    other_model.model = "large"
+    assert propose_parser_pipeline(sample, CachingProvider(other_model, store=SQLiteCache(store_path))) == first
+    assert CountingProvider.calls == 3  # The model is part of the key
+
+    ci_provider = CICachingProvider(CIMockProvider())
+    drafts = [generate_github_pipeline({"language": "python"}, ci_provider) for _ in range(3)]
+    assert len(set(drafts)) == 1
+    assert ci_provider.stats.misses == 1 and ci_provider.stats.memory_hits == 2
+    assert ci_provider.stats.hit_rate == 2 / 3
+
+
+def test_cassette_records_once_and_replays_offline(tmp_path) -> None:
+    import pytest
+
+    from ci_security_templates.ai_pipeline_helpers.base import MockProvider as CIMockProvider
+    from ci_security_templates.ai_pipeline_helpers.cassette import CassetteProvider as CICassetteProvider
+    from logging_stack.ai_helpers.cassette import CassetteMissError, CassetteProvider
+
+    path = str(tmp_path / "logging.json")
+    sample = "10.0.0.1 - - [date] \"GET /\" 200"
+    recorder = CassetteProvider(path, provider=MockProvider())
+    recorded = propose_parser_pipeline(sample, recorder)
+    recorder.chat([{"role": "system", "content": "SRE"}, {"role": "user", "content": "summary"}])
+    assert recorder.recorded == 2
+
+    replay = CassetteProvider(path)
+    assert propose_parser_pipeline(sample, replay) == recorded
+    assert replay.chat([{"role": "system", "content": "SRE"}, {"role": "user", "content": "  summary "}])
+    with pytest.raises(CassetteMissError):
+        propose_parser_pipeline("другой формат лога", replay)
+    with pytest.raises(CassetteMissError):
+        replay.chat([{"role": "system", "content": "DBA"}, {"role": "user", "content": "summary"}])
+
+    ci_path = str(tmp_path / "ci.json")
+    draft = generate_github_pipeline({"language": "python"}, CICassetteProvider(ci_path, provider=CIMockProvider()))
+    assert generate_github_pipeline({"language": "python"}, CICassetteProvider(ci_path)) == draft
@@ -4,7 +4,10 @@ import sys
 from pathlib import Path
 from typing import Any, Dict, List
 
-import yaml
+try:
+    from tools.yaml_loader import safe_load
+except ImportError:  # executed as a script from tools/
+    from yaml_loader import safe_load
 
 ROOT = Path(__file__).resolve().parents[1]
 CI_ROOT = ROOT / "ci_security_templates"
@@ -25,7 +28,7 @@ def _contains_explicit_secret(value: Any) -> bool:
 def validate_ci_file(path: Path) -> List[str]:
     issues: List[str] = []
     try:
-        data = yaml.safe_load(path.read_text())
+        data = safe_load(path.read_text())
     except Exception as exc:  # pragma: no cover - error details useful in CLI
         return [f"{path}: YAML parse error: {exc}"]
 
@@ -4,7 +4,10 @@ import sys
 from pathlib import Path
 from typing import List
 
-import yaml
+try:
+    from tools.yaml_loader import safe_load
+except ImportError:  # executed as a script from tools/
+    from yaml_loader import safe_load
 
 ROOT = Path(__file__).resolve().parents[1]
 LOGGING_ROOT = ROOT / "logging_stack"
@@ -12,7 +15,7 @@ LOGGING_ROOT = ROOT / "logging_stack"
 
 def _load_yaml(path: Path):
     try:
-        return yaml.safe_load(path.read_text())
+        return safe_load(path.read_text())
     except Exception as exc:  # pragma: no cover
         raise ValueError(f"{path}: YAML parse error: {exc}") from exc
 
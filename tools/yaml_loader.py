@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from typing import Any
+
+import yaml
+
+# LibYAML-backed loader is several times faster; fall back when unavailable
+try:
+    SafeLoader = yaml.CSafeLoader
+except AttributeError:  # pragma: no cover - PyYAML built without LibYAML
+    SafeLoader = yaml.SafeLoader
+
+
+def safe_load(text: str) -> Any:
+    return yaml.load(text, Loader=SafeLoader)  # nosec B506 - safe loaders only